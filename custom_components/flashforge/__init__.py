@@ -1,6 +1,8 @@
 """The FlashForge 3D Printer integration."""
 from __future__ import annotations
 
+import asyncio
+from functools import partial
 import logging
 
 from flashforge import (
@@ -20,11 +22,26 @@ from .const import (
     CONF_SCAN_INTERVAL,
     CONF_SERIAL_NUMBER,
     CONF_OVERRIDE_LED_AVAILABILITY,
+    CONF_TIMELAPSE_FORMAT,
+    CONF_TIMELAPSE_INTERVAL,
+    CONF_TIMELAPSE_MODE,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMELAPSE_FORMAT,
+    DEFAULT_TIMELAPSE_INTERVAL,
+    DEFAULT_TIMELAPSE_MODE,
     DOMAIN,
 )
+from .camera_feed import CameraFeed
+from .camera_stream import async_get_camera_stream_cache
 from .coordinator import FlashForgeDataUpdateCoordinator
+from .file_list import FileListCache
+from .fleet import async_get_fleet
+from .http_pool import async_get_http_pool
+from .lan_discovery import async_get_lan_discovery
+from .request_stats import RequestStats, instrument_client
 from .card import async_register_frontend
+from .thumbnails import async_get_thumbnail_store
+from .timelapse import TIMELAPSE_OFF, TimelapseRecorder, timelapse_directory
 from .util import async_close_flashforge_client
 from .websocket import async_register_websocket_commands
 
@@ -56,6 +73,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     integration = await async_get_integration(hass, DOMAIN)
     await async_register_frontend(hass, str(integration.version))
 
+    # Look for printers on the LAN in the background, so the setup dialog for
+    # the next one is usually answered from memory. Every entry asks; one scan
+    # per DISCOVERY_TTL actually runs.
+    async_get_lan_discovery(hass).async_scan()
+
     # Extract configuration
     ip_address = entry.data[CONF_IP_ADDRESS]
     serial_number = entry.data[CONF_SERIAL_NUMBER]
@@ -81,10 +103,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
     )
 
-    # Initialize the client via HTTP only
-    try:
-        machine_info = await client.info.get()
-    except FlashForgeResponseError as err:
+    # Every printer's requests share the integration's connection pool; the
+    # entry gives its hold back on unload, or when setup fails below.
+    pool = async_get_http_pool(hass)
+    pool.async_attach(client)
+    entry.async_on_unload(pool.async_release)
+
+    # Time every request from the first one on, so a printer that is slow to
+    # answer during setup shows up in its diagnostics too.
+    request_stats = RequestStats()
+    instrument_client(client, request_stats)
+
+    # Initialize the client via HTTP only. The status read and the credential
+    # check do not depend on each other, so they go out together; their results
+    # are judged in the same order as ever.
+    poll_started = hass.loop.time()
+    machine_info, product_ok = await asyncio.gather(
+        client.info.get(), client.send_product_command(), return_exceptions=True
+    )
+
+    if isinstance(machine_info, FlashForgeResponseError):
         # Still ConfigEntryNotReady - a firmware payload we cannot read may well
         # become readable after an integration update, so HA should keep
         # retrying. The distinction is in the message, which has to send the
@@ -93,17 +131,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "The printer answered, but its response could not be read. This is an "
             "integration bug, not a connection problem - please report it at "
             "https://github.com/GhostTypes/ff-5mp-hass/issues with debug logs enabled. %s",
-            err,
+            machine_info,
         )
         await async_close_flashforge_client(client)
         raise ConfigEntryNotReady(
             f"The printer's response could not be read (this is not a connectivity "
-            f"problem; please report it): {err}"
-        ) from err
-    except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
-        _LOGGER.error("Error retrieving printer status: %s", err)
+            f"problem; please report it): {machine_info}"
+        ) from machine_info
+    if isinstance(machine_info, Exception):  # upstream may raise broad exceptions
+        _LOGGER.error("Error retrieving printer status: %s", machine_info)
         await async_close_flashforge_client(client)
-        raise ConfigEntryNotReady(f"Error retrieving printer status: {err}") from err
+        raise ConfigEntryNotReady(
+            f"Error retrieving printer status: {machine_info}"
+        ) from machine_info
 
     if machine_info is None:
         await async_close_flashforge_client(client)
@@ -111,45 +151,80 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     client.cache_details(machine_info)
 
-    try:
-        if not await client.send_product_command():
-            await async_close_flashforge_client(client)
-            # Not necessarily a credential problem: the library returns False
-            # both when the printer refuses and when the response could not be
-            # parsed. It logs the two distinctly (flashforge-python-api >=
-            # 1.3.3), so point there rather than asserting the check code is
-            # wrong - that assertion is what made issue #18 unreadable.
-            raise ConfigEntryNotReady(
-                "The printer did not accept the /product request. This usually means the "
-                "serial number or check code is wrong, but an unreadable response looks "
-                "the same from here - check the log for the specific cause."
-            )
-    except Exception as err:  # noqa: BLE001
-        _LOGGER.error("Error validating printer credentials: %s", err)
+    if isinstance(product_ok, Exception):
+        _LOGGER.error("Error validating printer credentials: %s", product_ok)
+        await async_close_flashforge_client(client)
+        raise ConfigEntryNotReady(
+            f"Error validating printer credentials: {product_ok}"
+        ) from product_ok
+    if not product_ok:
         await async_close_flashforge_client(client)
-        raise ConfigEntryNotReady(f"Error validating printer credentials: {err}") from err
+        # Not necessarily a credential problem: the library returns False both
+        # when the printer refuses and when the response could not be parsed.
+        # It logs the two distinctly (flashforge-python-api >= 1.3.3), so point
+        # there rather than asserting the check code is wrong - that assertion
+        # is what made issue #18 unreadable.
+        raise ConfigEntryNotReady(
+            "The printer did not accept the /product request. This usually means the "
+            "serial number or check code is wrong, but an unreadable response looks "
+            "the same from here - check the log for the specific cause."
+        )
 
-    # Create coordinator
+    # Create coordinator. Its polls are phased against every other printer's.
+    fleet = async_get_fleet(hass)
     coordinator = FlashForgeDataUpdateCoordinator(
         hass=hass,
         client=client,
         name=name,
         scan_interval=scan_interval,
+        fleet=fleet,
+        entry_id=entry.entry_id,
+        camera_streams=async_get_camera_stream_cache(hass),
     )
+    fleet.async_register(coordinator)
+    entry.async_on_unload(partial(fleet.async_unregister, coordinator))
+
+    # The /detail read above is the first poll; asking again straight away
+    # only doubled every printer's share of a restart.
+    await coordinator.async_set_initial_data(machine_info, poll_started)
+    entry.async_on_unload(fleet.summary.async_track(entry.entry_id, coordinator))
+
+    feed = CameraFeed(hass, coordinator)
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    timelapse: TimelapseRecorder | None = None
+    timelapse_mode = entry.options.get(CONF_TIMELAPSE_MODE, DEFAULT_TIMELAPSE_MODE)
+    if timelapse_mode != TIMELAPSE_OFF:
+        timelapse = TimelapseRecorder(
+            hass,
+            coordinator,
+            feed,
+            timelapse_directory(hass, entry.entry_id),
+            mode=timelapse_mode,
+            interval=entry.options.get(
+                CONF_TIMELAPSE_INTERVAL, DEFAULT_TIMELAPSE_INTERVAL
+            ),
+            output_format=entry.options.get(
+                CONF_TIMELAPSE_FORMAT, DEFAULT_TIMELAPSE_FORMAT
+            ),
+        )
 
     # Store coordinator and client
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "client": client,
         "name": name,
+        "file_list": FileListCache(client),
+        "camera_feed": feed,
+        "timelapse": timelapse,
+        "request_stats": request_stats,
     }
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if timelapse is not None:
+        timelapse.async_start()
+
     # Register update listener for options changes
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
@@ -166,10 +241,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         data = hass.data[DOMAIN].pop(entry.entry_id)
         coordinator: FlashForgeDataUpdateCoordinator = data["coordinator"]
         await coordinator.async_shutdown()
+        timelapse: TimelapseRecorder | None = data["timelapse"]
+        if timelapse is not None:
+            await timelapse.async_stop()
+        feed: CameraFeed = data["camera_feed"]
+        await feed.async_stop()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete what the entry left on disk once it is removed for good."""
+    await async_get_thumbnail_store(hass).async_remove_entry(entry.entry_id)
+    await async_get_camera_stream_cache(hass).async_remove_entry(entry.entry_id)
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -19,7 +19,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FlashForgeDataUpdateCoordinator
-from .util import build_device_info
+from .util import WriteOnChangeMixin, build_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -100,7 +100,9 @@ async def async_setup_entry(
 
 
 class FlashForgeBinarySensor(
-    CoordinatorEntity[FlashForgeDataUpdateCoordinator], BinarySensorEntity
+    WriteOnChangeMixin,
+    CoordinatorEntity[FlashForgeDataUpdateCoordinator],
+    BinarySensorEntity,
 ):
     """Representation of a FlashForge binary sensor."""
 
@@ -145,3 +147,7 @@ class FlashForgeBinarySensor(
             return self.entity_description.availability_fn(self.coordinator.data)
 
         return True
+
+    def _state_snapshot(self) -> tuple[bool, bool | None]:
+        """Return what this binary sensor's written state is derived from."""
+        return (self.available, self.is_on)
@@ -16,7 +16,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FlashForgeDataUpdateCoordinator
-from .util import build_device_info
+from .util import WriteOnChangeMixin, build_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -76,7 +76,9 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class FlashForgeButton(CoordinatorEntity[FlashForgeDataUpdateCoordinator], ButtonEntity):
+class FlashForgeButton(
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], ButtonEntity
+):
     """Representation of a FlashForge button."""
 
     entity_description: FlashForgeButtonEntityDescription
@@ -102,6 +104,10 @@ class FlashForgeButton(CoordinatorEntity[FlashForgeDataUpdateCoordinator], Butto
         """Return if entity is available."""
         return self.coordinator.last_update_success and self.coordinator.data is not None
 
+    def _state_snapshot(self) -> bool:
+        """A button's state is its last press; only availability follows the printer."""
+        return self.available
+
     async def async_press(self) -> None:
         """Handle the button press."""
         if self.entity_description.press_fn:
@@ -1,4 +1,8 @@
-"""Camera platform for FlashForge integration."""
+"""Camera platform for FlashForge integration.
+
+Live views are served from the entry's shared :class:`CameraFeed` rather than a
+connection per viewer; see :mod:`.camera_feed`.
+"""
 from __future__ import annotations
 
 from homeassistant.components.mjpeg.camera import MjpegCamera
@@ -7,7 +11,16 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .camera_feed import CameraFeed
+from .const import (
+    CONF_SNAPSHOT_MAX_AGE,
+    CONF_STREAM_MAX_FPS,
+    CONF_STREAM_MAX_WIDTH,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DEFAULT_STREAM_MAX_FPS,
+    DEFAULT_STREAM_MAX_WIDTH,
+    DOMAIN,
+)
 from .coordinator import FlashForgeDataUpdateCoordinator
 from .util import build_device_info
 
@@ -22,8 +35,18 @@ async def async_setup_entry(
         "coordinator"
     ]
     printer_name: str = hass.data[DOMAIN][entry.entry_id]["name"]
-
-    camera = FlashForgeCamera(coordinator, printer_name, entry.entry_id)
+    feed: CameraFeed = hass.data[DOMAIN][entry.entry_id]["camera_feed"]
+    options = entry.options
+
+    camera = FlashForgeCamera(
+        coordinator,
+        printer_name,
+        entry.entry_id,
+        feed,
+        snapshot_max_age=options.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE),
+        stream_max_fps=options.get(CONF_STREAM_MAX_FPS, DEFAULT_STREAM_MAX_FPS),
+        stream_max_width=options.get(CONF_STREAM_MAX_WIDTH, DEFAULT_STREAM_MAX_WIDTH),
+    )
 
     async_add_entities([camera])
 
@@ -38,9 +61,17 @@ class FlashForgeCamera(CoordinatorEntity[FlashForgeDataUpdateCoordinator], Mjpeg
         coordinator: FlashForgeDataUpdateCoordinator,
         printer_name: str,
         entry_id: str,
+        feed: CameraFeed,
+        snapshot_max_age: float = DEFAULT_SNAPSHOT_MAX_AGE,
+        stream_max_fps: float = DEFAULT_STREAM_MAX_FPS,
+        stream_max_width: int = DEFAULT_STREAM_MAX_WIDTH,
     ) -> None:
         """Initialize the camera."""
         CoordinatorEntity.__init__(self, coordinator)
+        self._feed = feed
+        self._snapshot_max_age = snapshot_max_age
+        self._stream_max_fps = stream_max_fps
+        self._stream_max_width = stream_max_width
         self._attr_unique_id = f"{entry_id}_camera"
         self._attr_translation_key = "camera"
 
@@ -73,18 +104,21 @@ class FlashForgeCamera(CoordinatorEntity[FlashForgeDataUpdateCoordinator], Mjpeg
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
-        """Return a still image when a printer-reported stream URL is available."""
+        """Return a recent frame from the shared feed, not a new connection.
+
+        Like ``MjpegCamera``, the frame is returned at the camera's own size.
+        """
         if not self.available:
             return None
-        self._sync_stream_url()
-        return await super().async_camera_image(width, height)
+        return await self._feed.async_snapshot(self._snapshot_max_age)
 
     async def handle_async_mjpeg_stream(self, request):
-        """Proxy the active MJPEG stream when the printer reports one."""
+        """Relay the printer's stream from the shared feed, not a new connection."""
         if not self.available:
             return None
-        self._sync_stream_url()
-        return await super().handle_async_mjpeg_stream(request)
+        return await self._feed.async_handle_request(
+            request, self._stream_max_fps, self._stream_max_width
+        )
 
     def _current_stream_url(self) -> str:
         """Return the printer-reported OEM camera stream URL."""
@@ -0,0 +1,391 @@
+"""One connection to a printer's camera, shared by everyone watching it.
+
+The printer's MJPEG server on ``:8080`` is a small embedded process: two or
+three clients and its frame rate collapses, a few more and it stops answering.
+``MjpegCamera`` opens a connection per viewer, so every dashboard tab, phone and
+recorder used to count against it separately.
+
+A :class:`CameraFeed` holds the only connection. It reads the stream once,
+splits it into JPEG frames, and hands each frame to every subscriber through a
+small queue of its own. A subscriber that falls behind - a phone on a bad
+network - loses its oldest frames rather than holding the others back or
+growing a backlog: a live view wants the latest frame, not every frame.
+
+Each viewer can be sent less than the printer produces - a frame-rate cap and a
+maximum width, set per camera in the options. Capping skips frames per viewer;
+downscaling is done once per frame, shared by every viewer that needs it.
+
+The connection opens with the first subscriber and closes a little while after
+the last one leaves, so a dashboard reload does not reconnect from scratch.
+
+Still images come from the same place. The most recent frame is kept, and a
+snapshot request younger than the configured age is answered from it without
+touching the printer. While stills are being asked for and nobody is watching
+live, a grabber takes a single frame every so often to keep that copy fresh -
+a picture-entity card refreshing every few seconds in several tabs costs the
+printer one short connection per half max-age, not one per request.
+"""
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+import logging
+import re
+import time
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError, ClientTimeout, web
+from PIL import Image
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import FlashForgeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames buffered per subscriber. Two lets a viewer absorb one slow write
+# without dropping anything, and no more: older frames are worth nothing.
+CLIENT_QUEUE_SIZE = 2
+
+# Seconds the upstream connection stays open after the last subscriber leaves.
+_LINGER = 10
+
+# Seconds between reconnect attempts while the camera is unreachable; the last
+# one repeats.
+_RECONNECT_DELAYS = (1, 2, 5, 10)
+
+_TIMEOUT = ClientTimeout(total=None, sock_connect=10, sock_read=15)
+
+# Seconds a viewer waits for a frame before checking it is still connected. A
+# silent camera gives it no write to fail on when the browser goes away.
+_CLIENT_CHECK = 5
+
+# Seconds a snapshot request waits for a frame before giving up.
+_SNAPSHOT_TIMEOUT = 10
+
+# Seconds the still grabber keeps running after the last snapshot request.
+_GRABBER_IDLE = 60
+
+# A frame that has not ended after this many bytes is not a frame.
+_MAX_FRAME_BYTES = 4 * 1024 * 1024
+
+_BOUNDARY = "flashforgeframe"
+
+# JPEG quality of downscaled frames: small on the wire, fine on a phone.
+_DOWNSCALE_QUALITY = 70
+
+_SOI = b"\xff\xd8"
+_EOI = b"\xff\xd9"
+_CONTENT_LENGTH = re.compile(rb"content-length:\s*(\d+)", re.IGNORECASE)
+
+
+class MjpegParser:
+    """Split a ``multipart/x-mixed-replace`` MJPEG byte stream into JPEG frames.
+
+    Each part's ``Content-Length`` is trusted when the camera sends one - it is
+    the only reliable end marker for a JPEG that embeds an EXIF thumbnail of its
+    own. Without one, a frame runs from its start-of-image marker to the next
+    end-of-image marker.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add bytes read from the stream; return every frame they completed."""
+        self._buffer += data
+        frames: list[bytes] = []
+        while True:
+            start = self._buffer.find(_SOI)
+            if start < 0:
+                # Keep a trailing 0xFF: it may be the first half of a marker.
+                del self._buffer[: max(len(self._buffer) - 1, 0)]
+                return frames
+
+            headers = bytes(self._buffer[:start])
+            if (match := _CONTENT_LENGTH.search(headers)) is not None:
+                end = start + int(match.group(1))
+                if end > len(self._buffer):
+                    return self._check_size(frames, start)
+            else:
+                eoi = self._buffer.find(_EOI, start + len(_SOI))
+                if eoi < 0:
+                    return self._check_size(frames, start)
+                end = eoi + len(_EOI)
+
+            frames.append(bytes(self._buffer[start:end]))
+            del self._buffer[:end]
+
+    def _check_size(self, frames: list[bytes], start: int) -> list[bytes]:
+        # Drop what came before the frame, and the frame itself if it never ends.
+        del self._buffer[:start]
+        if len(self._buffer) > _MAX_FRAME_BYTES:
+            self._buffer.clear()
+        return frames
+
+
+class CameraFeed:
+    """The shared upstream connection to one printer's camera."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: FlashForgeDataUpdateCoordinator
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._subscribers: set[asyncio.Queue[bytes]] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._linger: asyncio.TimerHandle | None = None
+        self._grabber: asyncio.Task[None] | None = None
+        self._grab_age = 0.0
+        self._snapshot_requested_at = 0.0
+        self.last_frame: bytes | None = None
+        self.last_frame_at = 0.0  # time.monotonic()
+        self.frames = 0
+        self.connections = 0
+        self.snapshot_hits = 0
+        self.snapshot_misses = 0
+        # The frame most recently downscaled, its target width, and the job.
+        self._downscaled: tuple[bytes, int, asyncio.Future[bytes]] | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """Return how many subscribers are attached."""
+        return len(self._subscribers)
+
+    @property
+    def stream_url(self) -> str:
+        """Return the stream URL the printer currently reports."""
+        data = self._coordinator.data
+        if data is None:
+            return ""
+        return getattr(data, "camera_stream_url", "") or ""
+
+    @callback
+    def subscribe(self) -> asyncio.Queue[bytes]:
+        """Start receiving frames, opening the upstream connection if needed."""
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._linger is not None:
+            self._linger.cancel()
+            self._linger = None
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} camera feed"
+            )
+        return queue
+
+    @callback
+    def unsubscribe(self, queue: asyncio.Queue[bytes], linger: bool = True) -> None:
+        """Stop receiving frames; the connection closes once nobody is left.
+
+        Without ``linger`` a connection nobody else is using closes at once - a
+        one-frame grab must not hold the stream open for the next ten seconds.
+        """
+        self._subscribers.discard(queue)
+        if self._subscribers or self._linger is not None:
+            return
+        if linger:
+            self._linger = self._hass.loop.call_later(_LINGER, self._async_linger_done)
+        else:
+            self._async_cancel()
+
+    @callback
+    def _async_linger_done(self) -> None:
+        self._linger = None
+        if not self._subscribers:
+            self._async_cancel()
+
+    @callback
+    def _async_cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def async_stop(self) -> None:
+        """Close the upstream connection for good, as the entry unloads."""
+        if self._linger is not None:
+            self._linger.cancel()
+            self._linger = None
+        for task in (self._grabber, self._task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._grabber = self._task = None
+
+    def frame_age(self) -> float:
+        """Return how many seconds old the most recent frame is."""
+        if self.last_frame is None:
+            return float("inf")
+        return time.monotonic() - self.last_frame_at
+
+    async def async_snapshot(self, max_age: float) -> bytes | None:
+        """Return a frame no older than ``max_age`` seconds, or None if none comes.
+
+        Served from the most recent frame when it is young enough; otherwise the
+        next frame off the stream is waited for.
+        """
+        self._snapshot_requested_at = time.monotonic()
+        self._grab_age = max_age
+        if self._grabber is None or self._grabber.done():
+            self._grabber = self._hass.async_create_background_task(
+                self._async_grab(), f"{DOMAIN} camera still grabber"
+            )
+        if self.frame_age() <= max_age:
+            self.snapshot_hits += 1
+            return self.last_frame
+        self.snapshot_misses += 1
+        return await self._async_next_frame()
+
+    async def _async_next_frame(self) -> bytes | None:
+        queue = self.subscribe()
+        try:
+            async with asyncio.timeout(_SNAPSHOT_TIMEOUT):
+                return await queue.get()
+        except TimeoutError:
+            return None
+        finally:
+            self.unsubscribe(queue, linger=False)
+
+    async def _async_grab(self) -> None:
+        """Keep the most recent frame fresh while stills are being asked for."""
+        while time.monotonic() - self._snapshot_requested_at < _GRABBER_IDLE:
+            # Refresh at half the max age, so a request never finds it stale. A
+            # live viewer keeps the frame current on its own, and this sleeps.
+            wait = self._grab_age / 2 - self.frame_age()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif await self._async_next_frame() is None:
+                # The camera is not answering; do not hammer it.
+                await asyncio.sleep(max(self._grab_age, 1))
+
+    @callback
+    def _publish(self, frame: bytes) -> None:
+        self.last_frame = frame
+        self.last_frame_at = time.monotonic()
+        self.frames += 1
+        for queue in self._subscribers:
+            if queue.full():
+                # A slow subscriber skips ahead rather than holding a backlog.
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def _async_run(self) -> None:
+        failures = 0
+        while True:
+            url = self.stream_url
+            if url:
+                try:
+                    await self._async_read(url)
+                    failures = 0
+                except (ClientError, TimeoutError, OSError) as err:
+                    _LOGGER.debug("Camera stream %s dropped: %s", url, err)
+                    failures += 1
+                    self._coordinator.async_camera_stream_failed()
+            delay = _RECONNECT_DELAYS[min(failures, len(_RECONNECT_DELAYS) - 1)]
+            await asyncio.sleep(delay)
+
+    async def _async_read(self, url: str) -> None:
+        session = async_get_clientsession(self._hass)
+        parser = MjpegParser()
+        async with session.get(url, timeout=_TIMEOUT) as response:
+            response.raise_for_status()
+            self.connections += 1
+            async for chunk in response.content.iter_any():
+                for frame in parser.feed(chunk):
+                    self._publish(frame)
+
+    async def async_handle_request(
+        self, request: web.Request, max_fps: float = 0, max_width: int = 0
+    ) -> web.StreamResponse:
+        """Serve the shared stream to one HTTP client until it goes away.
+
+        ``max_fps`` caps the frames this client is sent, skipping the rest;
+        ``max_width`` downscales frames wider than it. Zero leaves either alone.
+        """
+        response = web.StreamResponse()
+        response.headers["Content-Type"] = (
+            f"multipart/x-mixed-replace;boundary={_BOUNDARY}"
+        )
+        await response.prepare(request)
+
+        interval = 1 / max_fps if max_fps else 0.0
+        next_due = 0.0
+        queue = self.subscribe()
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(_CLIENT_CHECK):
+                        frame = await queue.get()
+                except TimeoutError:
+                    if request.transport is None or request.transport.is_closing():
+                        # The viewer left while the camera was silent.
+                        break
+                    continue
+                if interval:
+                    now = time.monotonic()
+                    if now < next_due:
+                        continue
+                    # Due times advance by the interval rather than from each
+                    # send, so a frame arriving just late does not lower the
+                    # rate below the cap. After a gap, the cadence restarts.
+                    next_due += interval
+                    if next_due <= now:
+                        next_due = now + interval
+                if max_width:
+                    frame = await self._async_downscaled(frame, max_width)
+                await response.write(
+                    f"--{_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(frame)}\r\n\r\n".encode()
+                    + frame
+                    + b"\r\n"
+                )
+        except (ConnectionResetError, ClientError):
+            # The viewer closed the tab.
+            pass
+        finally:
+            self.unsubscribe(queue)
+        return response
+
+    async def _async_downscaled(self, frame: bytes, max_width: int) -> bytes:
+        """Return ``frame`` no wider than ``max_width``, scaling it once for everyone.
+
+        Every viewer of the camera shares its settings, so the first one to need
+        a frame scaled does it in the executor and the rest await the same job.
+        """
+        cached = self._downscaled
+        if cached is None or cached[0] is not frame or cached[1] != max_width:
+            job = self._hass.async_add_executor_job(downscale_jpeg, frame, max_width)
+            cached = self._downscaled = (frame, max_width, job)
+        try:
+            # Shielded: one viewer leaving must not cancel the others' frame.
+            return await asyncio.shield(cached[2])
+        except Exception as err:  # noqa: BLE001 - Pillow raises many types for bad frames
+            _LOGGER.debug("Could not downscale a camera frame: %s", err)
+            return frame
+
+
+def downscale_jpeg(frame: bytes, max_width: int) -> bytes:
+    """Shrink a JPEG frame to at most ``max_width`` pixels wide. Blocking — call via executor.
+
+    The decoder's draft mode scales by a power of two while decoding, which is
+    most of the saving; the remainder is an ordinary resize. A frame that is
+    already narrow enough is returned as-is.
+    """
+    with Image.open(BytesIO(frame)) as img:
+        width, height = img.size
+        if width <= max_width:
+            return frame
+        size = (max_width, max(1, round(height * max_width / width)))
+        img.draft("RGB", size)
+        scaled = img.convert("RGB").resize(size, Image.Resampling.BILINEAR)
+    buf = BytesIO()
+    scaled.save(buf, format="JPEG", quality=_DOWNSCALE_QUALITY)
+    return buf.getvalue()
@@ -0,0 +1,154 @@
+"""Remembered camera stream detection, shared by every entry.
+
+Some firmware never reports ``camera_stream_url`` in ``/detail``. For those
+printers the coordinator fell back to ``detect_camera_stream()`` - a HEAD, and
+a GET when HEAD is refused, against the OEM camera port - on every poll, so an
+extra probe every ten seconds for as long as Home Assistant ran. The answer
+almost never changes.
+
+The :class:`CameraStreamCache` keeps each entry's answer in an ordinary Home
+Assistant ``Store``, so it survives restarts. An entry is probed again only when:
+
+* its answer is older than :data:`DETECTED_TTL`, or :data:`MISSING_TTL` when
+  no camera was found - a camera can be fitted, and one that was found is
+  re-confirmed now and then;
+* the printer's address changed, since the URL is built from it;
+* the camera feed fails to read a stream at the remembered URL.
+
+Probes, cache hits and invalidations are counted per entry for diagnostics.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from flashforge import FlashForgeClient
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_DATA_KEY = f"{DOMAIN}_camera_streams"
+_STORE_KEY = f"{DOMAIN}.camera_streams"
+_STORE_VERSION = 1
+_SAVE_DELAY = 10  # seconds
+
+# How long a detected stream is trusted before it is probed again, in seconds.
+# A failing stream is re-probed long before this; see async_invalidate.
+DETECTED_TTL = 24 * 60 * 60
+
+# How long "no camera" is trusted, in seconds. Short enough that a camera fitted
+# to a printer shows up within the hour.
+MISSING_TTL = 60 * 60
+
+
+class CameraStreamCache:
+    """Each entry's detected camera stream URL, on disk."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, _STORE_VERSION, _STORE_KEY)
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        # Entry ID -> {"host", "url", "probed_at"}, probed_at in wall-clock
+        # seconds so it means something after a restart.
+        self._records: dict[str, dict[str, Any]] = {}
+        # Entry ID -> counters. Memory only.
+        self._stats: dict[str, dict[str, int]] = {}
+
+    async def _async_ensure_loaded(self) -> None:
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                stored = await self._store.async_load() or {}
+            except Exception:  # noqa: BLE001 - a broken store only costs a probe
+                _LOGGER.debug("Could not read the camera stream cache; starting empty")
+                stored = {}
+            self._records = {
+                entry_id: record
+                for entry_id, record in stored.get("entries", {}).items()
+                if isinstance(record, dict)
+            }
+            self._loaded = True
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"entries": self._records}
+
+    def _count(self, entry_id: str, counter: str) -> None:
+        stats = self._stats.setdefault(
+            entry_id, {"probes": 0, "hits": 0, "invalidations": 0}
+        )
+        stats[counter] += 1
+
+    def _fresh(self, record: dict[str, Any] | None, host: str) -> bool:
+        if record is None or record.get("host") != host:
+            return False
+        ttl = DETECTED_TTL if record.get("url") else MISSING_TTL
+        return time.time() - float(record.get("probed_at", 0)) < ttl
+
+    async def async_detect(self, entry_id: str, client: FlashForgeClient) -> str:
+        """Return the entry's camera stream URL, probing only when the answer is stale.
+
+        An empty string means the printer has no camera that answered.
+        """
+        await self._async_ensure_loaded()
+        host = client.ip_address
+        record = self._records.get(entry_id)
+        if self._fresh(record, host):
+            self._count(entry_id, "hits")
+            return record["url"]
+
+        self._count(entry_id, "probes")
+        url = await client.detect_camera_stream()
+        _LOGGER.debug("Camera stream for %s detected as %r", host, url)
+        self._records[entry_id] = {"host": host, "url": url, "probed_at": time.time()}
+        self._schedule_save()
+        return url
+
+    @callback
+    def async_invalidate(self, entry_id: str) -> None:
+        """Forget an entry's answer, so the next poll probes again."""
+        if self._records.pop(entry_id, None) is not None:
+            self._count(entry_id, "invalidations")
+            self._schedule_save()
+
+    async def async_remove_entry(self, entry_id: str) -> None:
+        """Forget an entry entirely, once it is removed for good."""
+        await self._async_ensure_loaded()
+        self._stats.pop(entry_id, None)
+        if self._records.pop(entry_id, None) is not None:
+            self._schedule_save()
+
+    def as_dict(self, entry_id: str) -> dict[str, Any]:
+        """Return an entry's detection state for diagnostics."""
+        record = self._records.get(entry_id)
+        return {
+            # What the last probe found, and how long ago it ran.
+            "found": bool(record and record.get("url")),
+            "age": (
+                round(time.time() - float(record.get("probed_at", 0)))
+                if record is not None
+                else None
+            ),
+            **self._stats.get(entry_id, {"probes": 0, "hits": 0, "invalidations": 0}),
+        }
+
+
+@callback
+def async_get_camera_stream_cache(hass: HomeAssistant) -> CameraStreamCache:
+    """Return the cache shared by every entry, creating it on first use."""
+    cache: CameraStreamCache | None = hass.data.get(_DATA_KEY)
+    if cache is None:
+        cache = hass.data[_DATA_KEY] = CameraStreamCache(hass)
+    return cache
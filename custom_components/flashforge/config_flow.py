@@ -1,15 +1,17 @@
 """Config flow for FlashForge integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 from flashforge import (
     FlashForgeClient,
     FlashForgeResponseError,
-    PrinterDiscovery,
     PrinterModel,
 )
+from flashforge.api.controls.info import MachineInfoParser
+from flashforge.models import DetailResponse, FFMachineInfo
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -26,8 +28,26 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     CONF_OVERRIDE_LED_AVAILABILITY,
+    CONF_SNAPSHOT_MAX_AGE,
+    CONF_STREAM_MAX_FPS,
+    CONF_STREAM_MAX_WIDTH,
+    CONF_SWATCH_FORMAT,
+    CONF_TIMELAPSE_FORMAT,
+    CONF_TIMELAPSE_INTERVAL,
+    CONF_TIMELAPSE_MODE,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DEFAULT_STREAM_MAX_FPS,
+    DEFAULT_STREAM_MAX_WIDTH,
+    DEFAULT_SWATCH_FORMAT,
+    DEFAULT_TIMELAPSE_FORMAT,
+    DEFAULT_TIMELAPSE_INTERVAL,
+    DEFAULT_TIMELAPSE_MODE,
     SUPPORTED_PIDS,
 )
+from .http_pool import async_get_http_pool
+from .image import SWATCH_FORMATS
+from .lan_discovery import async_get_lan_discovery
+from .timelapse import TIMELAPSE_FORMATS, TIMELAPSE_MODES
 from .util import async_close_flashforge_client
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,6 +60,10 @@ SUPPORTED_PRINTER_MODELS = {
     PrinterModel.CREATOR_5_PRO,
 }
 
+# Budget for all of validate_connection's requests together, in seconds. They
+# run at once, so this is the library's own timeout for a single request.
+VALIDATE_TIMEOUT = 15
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required("discovery_mode", default="auto"): vol.In(
@@ -106,6 +130,27 @@ def _is_supported_detail(detail: Any) -> bool:
     )
 
 
+def _parse_detail(raw_detail: dict[str, Any]) -> FFMachineInfo:
+    """Parse an already-read /detail payload the way ``client.info.get()`` would.
+
+    Raises FlashForgeResponseError, as the library does, when the payload does
+    not validate or cannot be turned into machine info.
+    """
+    try:
+        detail = DetailResponse(**raw_detail).detail
+    except Exception as err:
+        _LOGGER.warning("The printer answered /detail with a payload that failed validation: %s", err)
+        raise FlashForgeResponseError(
+            "The printer's /detail response could not be validated", cause=err
+        ) from err
+    machine_info = MachineInfoParser.from_detail(detail) if detail is not None else None
+    if machine_info is None:
+        raise FlashForgeResponseError(
+            "The /detail payload was read but could not be converted into machine info"
+        )
+    return machine_info
+
+
 def _is_supported_discovered_printer(printer: Any) -> bool:
     """Return True when a discovery result matches a supported modern printer."""
     return getattr(printer, "model", None) in SUPPORTED_PRINTER_MODELS
@@ -125,12 +170,29 @@ async def validate_connection(
         serial_number=data[CONF_SERIAL_NUMBER],
         check_code=data[CONF_CHECK_CODE],
     )
+    pool = async_get_http_pool(hass)
+    pool.async_attach(client)
 
     try:
+        # The two requests do not depend on each other, so they go out
+        # together and the flow waits one round trip, not two. The results
+        # are still judged in the order below, which is what decides the error
+        # the user sees.
+        try:
+            async with asyncio.timeout(VALIDATE_TIMEOUT):
+                raw_detail, product_ok = await asyncio.gather(
+                    client.info.get_detail_raw(),
+                    client.send_product_command(),
+                    return_exceptions=True,
+                )
+        except TimeoutError as err:
+            raise ConnectionError("Timed out waiting for the printer") from err
+
         # Identity first, from the undecoded payload. Reading `pid` here means
         # the supported-model gate cannot be defeated by an unrelated field
-        # failing validation further down (issue #18).
-        raw_detail = await client.info.get_detail_raw()
+        # failing validation in the parsed read (issue #18).
+        if isinstance(raw_detail, BaseException):
+            raise raw_detail
         if raw_detail is None or not raw_detail.get("detail"):
             raise ConnectionError("Failed to retrieve printer information")
 
@@ -139,24 +201,24 @@ async def validate_connection(
                 "Only AD5X, Adventurer 5M, Adventurer 5M Pro, Creator 5, and Creator 5 Pro printers are supported"
             )
 
-        # Now the validated read. A FlashForgeResponseError from here means the
-        # printer answered with something the library could not parse, which is
-        # a bug report, not a network problem - so it deliberately propagates
-        # instead of being flattened into ConnectionError.
-        machine_info = await client.info.get()
-        if machine_info is None:
-            raise ConnectionError("Failed to retrieve printer information")
-
+        # Now validate the same payload; /detail is not read a second time. A
+        # FlashForgeResponseError here means the printer answered with something
+        # the library could not parse, which is a bug report, not a network
+        # problem - so it deliberately propagates instead of being flattened
+        # into ConnectionError.
+        machine_info = _parse_detail(raw_detail)
         client.cache_details(machine_info)
 
         # Validate credentials using the product endpoint (HTTP only).
         #
-        # This is the only step that can genuinely mean "wrong check code", and
-        # even here the library returns False both for a refusal and for a
+        # This is the only request that can genuinely mean "wrong check code",
+        # and even here the library returns False both for a refusal and for a
         # response it could not parse. It logs the two distinctly (see
         # `flashforge-python-api` >= 1.3.3), which is why the message below
         # points at the log rather than asserting the credentials are wrong.
-        if not await client.send_product_command():
+        if isinstance(product_ok, BaseException):
+            raise product_ok
+        if not product_ok:
             raise InvalidAuthError("Printer rejected the provided credentials")
 
         return {
@@ -166,6 +228,7 @@ async def validate_connection(
 
     finally:
         await async_close_flashforge_client(client)
+        await pool.async_release()
 
 
 class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -184,6 +247,8 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the initial step - choose discovery mode."""
         if user_input is None:
+            # Listen for printers while the user reads the form.
+            async_get_lan_discovery(self.hass).async_scan()
             return self.async_show_form(
                 step_id="user",
                 data_schema=STEP_USER_DATA_SCHEMA,
@@ -199,71 +264,72 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_discovery(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle automatic discovery of printers."""
-        errors: dict[str, str] = {}
+        """Handle automatic discovery of printers.
 
-        if user_input is None:
-            # Perform discovery
-            try:
-                discovery = PrinterDiscovery()
-                printers = await discovery.discover()
-
-                if not printers:
-                    errors["base"] = "no_printers_found"
-                else:
-                    supported_printers = [
-                        printer for printer in printers if _is_supported_discovered_printer(printer)
-                    ]
-
-                    if not supported_printers:
-                        errors["base"] = "unsupported_printers_found"
-                        return self.async_show_form(
-                            step_id="discovery",
-                            data_schema=STEP_DISCOVERY_SCHEMA,
-                            errors=errors,
-                        )
-
-                    self.discovered_printers = [
-                        {
-                            CONF_NAME: printer.name,
-                            CONF_IP_ADDRESS: printer.ip_address,
-                            CONF_SERIAL_NUMBER: printer.serial_number,
-                            "model": printer.model.value,
-                            "selection_label": _build_printer_label(
-                                {
-                                    CONF_NAME: printer.name,
-                                    CONF_IP_ADDRESS: printer.ip_address,
-                                }
-                            ),
-                        }
-                        for printer in supported_printers
-                    ]
-
-                    # If only one printer found, auto-select it
-                    if len(self.discovered_printers) == 1:
-                        self._printer_data = self.discovered_printers[0]
-                        return await self.async_step_credentials()
-
-                    # Multiple printers found - let user choose
-                    return await self.async_step_select_printer()
+        Submitting the form again scans again.
+        """
+        errors: dict[str, str] = {}
+        discovery = async_get_lan_discovery(self.hass)
+
+        try:
+            printers = await discovery.async_discover(force=user_input is not None)
+        except Exception as err:
+            _LOGGER.error("Error during printer discovery: %s", err)
+            printers = []
+            errors["base"] = "discovery_failed"
+
+        if not printers:
+            if not errors:
+                errors["base"] = (
+                    "discovery_failed" if discovery.last_error else "no_printers_found"
+                )
+        else:
+            supported_printers = [
+                printer for printer in printers if _is_supported_discovered_printer(printer)
+            ]
+            configured = self._async_current_ids()
+            new_printers = [
+                printer
+                for printer in supported_printers
+                if printer.serial_number not in configured
+            ]
+
+            if not supported_printers:
+                errors["base"] = "unsupported_printers_found"
+            elif not new_printers:
+                errors["base"] = "all_printers_configured"
+            else:
+                self.discovered_printers = [
+                    {
+                        CONF_NAME: printer.name,
+                        CONF_IP_ADDRESS: printer.ip_address,
+                        CONF_SERIAL_NUMBER: printer.serial_number,
+                        "model": printer.model.value,
+                        "selection_label": _build_printer_label(
+                            {
+                                CONF_NAME: printer.name,
+                                CONF_IP_ADDRESS: printer.ip_address,
+                            }
+                        ),
+                    }
+                    for printer in new_printers
+                ]
 
-            except Exception as err:
-                _LOGGER.error("Error during printer discovery: %s", err)
-                errors["base"] = "discovery_failed"
+                # If only one printer found, auto-select it
+                if len(self.discovered_printers) == 1:
+                    self._printer_data = self.discovered_printers[0]
+                    return await self.async_step_credentials()
 
-        if errors:
-            return self.async_show_form(
-                step_id="discovery",
-                data_schema=STEP_DISCOVERY_SCHEMA,
-                errors=errors,
-                description_placeholders={
-                    "error": "Could not discover printers. Try manual entry instead."
-                },
-            )
+                # Multiple printers found - let user choose
+                return await self.async_step_select_printer()
 
         return self.async_show_form(
             step_id="discovery",
             data_schema=STEP_DISCOVERY_SCHEMA,
+            errors=errors,
+            description_placeholders={
+                "error": "Could not discover printers. Try manual entry instead."
+            },
         )
 
     async def async_step_select_printer(
@@ -596,6 +662,48 @@ class FlashForgeOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_OVERRIDE_LED_AVAILABILITY,
                         default=self.config_entry.options.get(CONF_OVERRIDE_LED_AVAILABILITY, False),
                     ): bool,
+                    vol.Optional(
+                        CONF_SNAPSHOT_MAX_AGE,
+                        default=self.config_entry.options.get(
+                            CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                    vol.Optional(
+                        CONF_STREAM_MAX_FPS,
+                        default=self.config_entry.options.get(
+                            CONF_STREAM_MAX_FPS, DEFAULT_STREAM_MAX_FPS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=30)),
+                    vol.Optional(
+                        CONF_STREAM_MAX_WIDTH,
+                        default=self.config_entry.options.get(
+                            CONF_STREAM_MAX_WIDTH, DEFAULT_STREAM_MAX_WIDTH
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3840)),
+                    vol.Optional(
+                        CONF_TIMELAPSE_MODE,
+                        default=self.config_entry.options.get(
+                            CONF_TIMELAPSE_MODE, DEFAULT_TIMELAPSE_MODE
+                        ),
+                    ): vol.In(TIMELAPSE_MODES),
+                    vol.Optional(
+                        CONF_TIMELAPSE_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_TIMELAPSE_INTERVAL, DEFAULT_TIMELAPSE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+                    vol.Optional(
+                        CONF_TIMELAPSE_FORMAT,
+                        default=self.config_entry.options.get(
+                            CONF_TIMELAPSE_FORMAT, DEFAULT_TIMELAPSE_FORMAT
+                        ),
+                    ): vol.In(TIMELAPSE_FORMATS),
+                    vol.Optional(
+                        CONF_SWATCH_FORMAT,
+                        default=self.config_entry.options.get(
+                            CONF_SWATCH_FORMAT, DEFAULT_SWATCH_FORMAT
+                        ),
+                    ): vol.In(SWATCH_FORMATS),
                 }
             ),
         )
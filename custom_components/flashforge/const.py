@@ -7,12 +7,26 @@ CONF_SERIAL_NUMBER = "serial_number"
 CONF_CHECK_CODE = "check_code"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_OVERRIDE_LED_AVAILABILITY = "override_led_availability"
+CONF_SNAPSHOT_MAX_AGE = "snapshot_max_age"
+CONF_STREAM_MAX_FPS = "stream_max_fps"
+CONF_STREAM_MAX_WIDTH = "stream_max_width"
+CONF_TIMELAPSE_MODE = "timelapse_mode"
+CONF_TIMELAPSE_INTERVAL = "timelapse_interval"
+CONF_TIMELAPSE_FORMAT = "timelapse_format"
+CONF_SWATCH_FORMAT = "swatch_format"
 
 # Default values
 DEFAULT_NAME = "FlashForge Printer"
 DEFAULT_SCAN_INTERVAL = 10  # seconds
 DEFAULT_HTTP_PORT = 8898
 DEFAULT_CAMERA_PORT = 8080
+DEFAULT_SNAPSHOT_MAX_AGE = 10  # seconds
+DEFAULT_STREAM_MAX_FPS = 0  # no cap
+DEFAULT_STREAM_MAX_WIDTH = 0  # the camera's own resolution
+DEFAULT_TIMELAPSE_MODE = "off"
+DEFAULT_TIMELAPSE_INTERVAL = 30  # seconds
+DEFAULT_TIMELAPSE_FORMAT = "video"
+DEFAULT_SWATCH_FORMAT = "png"
 
 # Entity keys
 ATTR_MACHINE_STATUS = "machine_status"
@@ -30,6 +44,8 @@ STATE_PAUSED = "PAUSED"
 STATE_ERROR = "ERROR"
 
 MANUFACTURER = "FlashForge"
+# Device identifier of the virtual device holding the fleet-wide sensors.
+FLEET_DEVICE_ID = "fleet"
 
 PRINTER_MODEL_NAMES: dict[int, str] = {
     35: "Adventurer 5M",
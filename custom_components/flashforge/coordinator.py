@@ -1,22 +1,46 @@
 """DataUpdateCoordinator for FlashForge integration."""
 from __future__ import annotations
 
-from datetime import timedelta
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime, timedelta
 import logging
+import time
+from typing import TYPE_CHECKING
 
 from flashforge import FlashForgeClient, FlashForgeResponseError
-from flashforge.models import FFMachineInfo
+from flashforge.models import FFMachineInfo, MachineState
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, PRINTER_MODEL_NAMES
-from .util import async_close_flashforge_client
+from .util import async_close_flashforge_client, percentile
+
+if TYPE_CHECKING:
+    from .camera_stream import CameraStreamCache
+    from .fleet import FleetScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 UNKNOWN_MODEL = "Unknown"
 
+# Adaptive polling. The configured scan interval is the rate a printer that is
+# doing something gets polled at, and the floor for everything else: nothing
+# here ever polls faster than the user asked for. A printer sitting idle for
+# days has nothing to report that cannot wait a minute, and one that is not
+# answering at all is not helped by being asked every ten seconds.
+IDLE_STATES = frozenset(
+    {MachineState.READY, MachineState.COMPLETED, MachineState.CANCELLED}
+)
+IDLE_INTERVAL_MULTIPLIER = 6
+MAX_IDLE_INTERVAL = 120  # seconds
+MAX_BACKOFF_INTERVAL = 300  # seconds
+
+# Polls whose duration is kept for the printer's own p95.
+POLL_DURATION_WINDOW = 100
+
 
 class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[FFMachineInfo]):
     """Class to manage fetching FlashForge printer data."""
@@ -27,6 +51,9 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[FFMachineInfo]):
         client: FlashForgeClient,
         name: str,
         scan_interval: int,
+        fleet: FleetScheduler | None = None,
+        entry_id: str | None = None,
+        camera_streams: CameraStreamCache | None = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -34,9 +61,30 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[FFMachineInfo]):
             _LOGGER,
             name=f"{DOMAIN}_{name}",
             update_interval=timedelta(seconds=scan_interval),
+            # FFMachineInfo compares by value, so a poll that returns exactly
+            # what the last one did - an idle printer, mostly - wakes no entity
+            # at all. Entities that are woken still skip their own write when
+            # what they show did not change; see WriteOnChangeMixin.
+            always_update=False,
         )
         self.client = client
         self.printer_name = name
+        self.scan_interval = scan_interval
+        self.consecutive_failures = 0
+        self.fleet = fleet
+        self.entry_id = entry_id
+        self.camera_streams = camera_streams
+        # True while the stream URL in `data` came from detection rather than
+        # from the firmware, so a feed that cannot read it knows to say so.
+        self.camera_stream_detected = False
+        self._poll_started: float | None = None
+        # How this printer's own polls are going, for its diagnostic sensors.
+        # Kept here rather than asked for: timing a poll costs no request.
+        self.last_poll_duration: float | None = None
+        self._poll_durations: deque[float] = deque(maxlen=POLL_DURATION_WINDOW)
+        self._last_success: float | None = None
+        self.last_success_time: datetime | None = None
+        self._poll_listeners: list[CALLBACK_TYPE] = []
 
     @property
     def device_model(self) -> str:
@@ -48,8 +96,159 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[FFMachineInfo]):
             return UNKNOWN_MODEL
         return PRINTER_MODEL_NAMES.get(pid, UNKNOWN_MODEL)
 
+    @property
+    def poll_duration_p95(self) -> float | None:
+        """Return the 95th percentile of the recent polls' durations, in seconds."""
+        if not self._poll_durations:
+            return None
+        return percentile(sorted(self._poll_durations), 95)
+
+    @property
+    def seconds_since_success(self) -> float | None:
+        """Return how old the last successful reading is, or None before the first."""
+        if self._last_success is None:
+            return None
+        return time.monotonic() - self._last_success
+
+    @callback
+    def async_add_poll_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call ``update_callback`` at the end of every poll, failed or not.
+
+        Coordinator listeners are not told about a poll that read the same as
+        the last one, nor about a failure after a failure; poll timing changes
+        on every one of them.
+        """
+        self._poll_listeners.append(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            self._poll_listeners.remove(update_callback)
+
+        return _async_remove
+
+    @callback
+    def _async_poll_finished(self, duration: float, succeeded: bool) -> None:
+        """Record how long a poll took, and tell the poll listeners."""
+        self.last_poll_duration = duration
+        self._poll_durations.append(duration)
+        if succeeded:
+            self._last_success = time.monotonic()
+            self.last_success_time = dt_util.utcnow()
+        for listener in list(self._poll_listeners):
+            listener()
+
+    def _idle_interval(self) -> int:
+        """Return the interval for a printer with nothing in progress."""
+        return max(
+            self.scan_interval,
+            min(self.scan_interval * IDLE_INTERVAL_MULTIPLIER, MAX_IDLE_INTERVAL),
+        )
+
+    def _backoff_interval(self) -> int:
+        """Return the interval after ``consecutive_failures`` failed polls in a row."""
+        return max(
+            self.scan_interval,
+            min(
+                self.scan_interval * 2 ** min(self.consecutive_failures, 16),
+                MAX_BACKOFF_INTERVAL,
+            ),
+        )
+
+    def _set_interval(self, seconds: int) -> None:
+        """Schedule the next poll ``seconds`` from the end of this one."""
+        interval = timedelta(seconds=seconds)
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                "Polling %s every %ss from now on", self.printer_name, seconds
+            )
+            self.update_interval = interval
+
+    def _schedule_after_success(self, machine_info: FFMachineInfo) -> None:
+        """Pick the next interval from what the printer just said it is doing.
+
+        Anything not known to be idle - including a state the library could not
+        map - polls at the configured rate, so an unexpected state errs towards
+        being noticed rather than towards saving a request.
+        """
+        self.consecutive_failures = 0
+        state = getattr(machine_info, "machine_state", None)
+        if state in IDLE_STATES:
+            self._set_interval(self._idle_interval())
+        else:
+            self._set_interval(self.scan_interval)
+
+    def _schedule_after_failure(self) -> None:
+        """Back off exponentially while the printer is not answering."""
+        self.consecutive_failures += 1
+        self._set_interval(self._backoff_interval())
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll on this printer's phase of the fleet's grid.
+
+        Home Assistant still decides whether to poll at all - no interval,
+        polling disabled for the entry. Its timer is then replaced with one for
+        the fleet's slot, so the phase does not hang on how it computes its own.
+        """
+        super()._schedule_refresh()
+        if (
+            self.fleet is None
+            or self.update_interval is None
+            or self._unsub_refresh is None
+        ):
+            return
+        target = self.fleet.next_poll(
+            self,
+            self.update_interval.total_seconds(),
+            self._poll_started,
+            self.hass.loop.time(),
+        )
+        self._unsub_refresh()
+        self._unsub_refresh = self.hass.loop.call_at(
+            target, self._async_start_scheduled_poll
+        ).cancel
+
+    @callback
+    def _async_start_scheduled_poll(self) -> None:
+        """Start a slot's poll the way Home Assistant starts its own.
+
+        As a background task, not a tracked one: with polls spread across the
+        interval a fleet nearly always has one pending, and a tracked task would
+        hold up every wait for Home Assistant to settle. Owned by the entry, so
+        unloading it cancels a poll in flight.
+        """
+        if self.config_entry is not None:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._handle_refresh_interval(),
+                name=f"{self.name} - {self.config_entry.title} - refresh",
+                eager_start=True,
+            )
+            return
+        self.hass.async_create_background_task(
+            self._handle_refresh_interval(),
+            name=f"{self.name} - refresh",
+            eager_start=True,
+        )
+
     async def _async_update_data(self) -> FFMachineInfo:
         """Fetch data from the printer."""
+        try:
+            async with self.fleet.async_poll() if self.fleet else nullcontext():
+                self._poll_started = self.hass.loop.time()
+                started = time.monotonic()
+                machine_info = await self._async_fetch_machine_info()
+        except UpdateFailed:
+            self._schedule_after_failure()
+            self._async_poll_finished(time.monotonic() - started, succeeded=False)
+            raise
+
+        self._schedule_after_success(machine_info)
+        self._async_poll_finished(time.monotonic() - started, succeeded=True)
+        return machine_info
+
+    async def _async_fetch_machine_info(self) -> FFMachineInfo:
+        """Read /detail, translating every failure into UpdateFailed."""
         try:
             # Get machine status using HTTP API
             machine_info = await self.client.info.get()
@@ -58,12 +257,7 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[FFMachineInfo]):
                 raise UpdateFailed("Failed to retrieve printer status")
 
             self.client.cache_details(machine_info)
-
-            if not getattr(machine_info, "camera_stream_url", ""):
-                detected_camera_stream = await self.client.detect_camera_stream()
-                if detected_camera_stream:
-                    machine_info.camera_stream_url = detected_camera_stream  # type: ignore[attr-defined]
-
+            await self._async_fill_camera_stream(machine_info)
             return machine_info
 
         except FlashForgeResponseError as err:
@@ -85,6 +279,54 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[FFMachineInfo]):
             _LOGGER.error("Error communicating with printer %s: %s", self.printer_name, err)
             raise UpdateFailed(f"Error communicating with printer: {err}") from err
 
+    async def _async_fill_camera_stream(self, machine_info: FFMachineInfo) -> None:
+        """Fill in the camera stream when the firmware does not report one.
+
+        The probe's answer is remembered per entry, so firmware that never
+        reports the URL costs one probe a day rather than one a poll.
+        """
+        self.camera_stream_detected = False
+        if getattr(machine_info, "camera_stream_url", ""):
+            return
+        if self.camera_streams is not None and self.entry_id is not None:
+            detected_camera_stream = await self.camera_streams.async_detect(
+                self.entry_id, self.client
+            )
+        else:
+            detected_camera_stream = await self.client.detect_camera_stream()
+        if detected_camera_stream:
+            machine_info.camera_stream_url = detected_camera_stream  # type: ignore[attr-defined]
+            self.camera_stream_detected = True
+
+    @callback
+    def async_camera_stream_failed(self) -> None:
+        """Re-probe on the next poll when a detected stream could not be read."""
+        if (
+            self.camera_stream_detected
+            and self.camera_streams is not None
+            and self.entry_id is not None
+        ):
+            self.camera_streams.async_invalidate(self.entry_id)
+
+    async def async_set_initial_data(
+        self, machine_info: FFMachineInfo, poll_started: float
+    ) -> None:
+        """Start from a /detail read made during setup instead of polling again.
+
+        Takes the place of the first refresh: the reading is completed the way a
+        poll's would be, timed from ``poll_started`` (loop time) as one, and the
+        next poll is scheduled from when it was made. A camera probe that fails
+        here is left to the next poll to retry.
+        """
+        self._poll_started = poll_started
+        try:
+            await self._async_fill_camera_stream(machine_info)
+        except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
+            _LOGGER.debug("Camera stream detection for %s failed: %s", self.printer_name, err)
+        self._schedule_after_success(machine_info)
+        self._async_poll_finished(self.hass.loop.time() - poll_started, succeeded=True)
+        self.async_set_updated_data(machine_info)
+
     async def async_shutdown(self) -> None:
         """Shutdown the coordinator and cleanup resources."""
         await async_close_flashforge_client(self.client)
@@ -7,12 +7,17 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from .camera_feed import CameraFeed
+from .camera_stream import async_get_camera_stream_cache
 from .const import (
     CONF_CHECK_CODE,
     CONF_SERIAL_NUMBER,
     DOMAIN,
 )
 from .coordinator import FlashForgeDataUpdateCoordinator
+from .fleet import async_get_fleet
+from .request_stats import RequestStats
+from .timelapse import TimelapseRecorder
 
 TO_REDACT_ENTRY = {CONF_CHECK_CODE, CONF_SERIAL_NUMBER}
 TO_REDACT_DATA = {
@@ -48,6 +53,9 @@ async def async_get_config_entry_diagnostics(
         "coordinator"
     ]
     client = hass.data[DOMAIN][entry.entry_id]["client"]
+    feed: CameraFeed = hass.data[DOMAIN][entry.entry_id]["camera_feed"]
+    timelapse: TimelapseRecorder | None = hass.data[DOMAIN][entry.entry_id]["timelapse"]
+    request_stats: RequestStats = hass.data[DOMAIN][entry.entry_id]["request_stats"]
 
     machine_info = async_redact_data(
         _machine_info_to_dict(coordinator.data) or {}, TO_REDACT_DATA
@@ -61,13 +69,26 @@ async def async_get_config_entry_diagnostics(
         },
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
+            # The interval actually in effect, which adaptive polling moves
+            # between the configured scan interval, the idle rate and the
+            # failure backoff. `scan_interval` is what the user configured.
             "update_interval": (
                 coordinator.update_interval.total_seconds()
                 if coordinator.update_interval
                 else None
             ),
+            "scan_interval": coordinator.scan_interval,
+            "consecutive_failures": coordinator.consecutive_failures,
+            # This printer's own poll timing, in seconds; the fleet section
+            # below has the figures across every printer.
+            "last_poll_duration": coordinator.last_poll_duration,
+            "poll_duration_p95": coordinator.poll_duration_p95,
+            "seconds_since_success": coordinator.seconds_since_success,
             "device_model": coordinator.device_model,
         },
+        # Shared by every printer: the concurrency cap and poll latency across
+        # all of them.
+        "fleet": async_get_fleet(hass).as_dict(),
         "capabilities": {
             "led_control": getattr(client, "led_control", None),
             "filtration_control": getattr(client, "filtration_control", None),
@@ -77,5 +98,29 @@ async def async_get_config_entry_diagnostics(
             "is_creator5_pro": getattr(client, "is_creator5_pro", None),
             "http_only": getattr(client, "http_only", None),
         },
+        "camera_feed": {
+            "subscribers": feed.subscribers,
+            # Upstream connections opened since setup. Far fewer than the
+            # viewers there have been is the point of sharing one.
+            "connections": feed.connections,
+            "frames": feed.frames,
+            # Stills served from the last frame, and those that had to wait.
+            "snapshot_hits": feed.snapshot_hits,
+            "snapshot_misses": feed.snapshot_misses,
+        },
+        # Whether the stream URL was detected rather than reported, and how
+        # often detection has actually probed the printer.
+        "camera_stream": {
+            "detected": coordinator.camera_stream_detected,
+            **async_get_camera_stream_cache(hass).as_dict(entry.entry_id),
+        },
+        # Every request made to this printer since setup, by endpoint: latency,
+        # timeouts, and failures by exception class.
+        "requests": request_stats.as_dict(),
+        "timelapse": (
+            {"recording": timelapse.recording, "frames": timelapse.frames}
+            if timelapse is not None
+            else None
+        ),
         "machine_info": machine_info,
     }
@@ -0,0 +1,86 @@
+"""Short-lived, shared copy of a printer's file list.
+
+Opening the job card, clicking a file and pressing Start used to ask the printer
+for ``/gcodeList`` three times within a few seconds - once per websocket command
+- and two cards open on the same printer doubled that. The list changes only
+when a file is uploaded, which is rare and never urgent, so each entry keeps the
+most recent answer for a few seconds and hands it to every command that asks.
+
+Two callers that miss at the same moment share one request: the second waits on
+the first one's fetch rather than starting its own. A failed fetch is not
+cached; every waiter sees the error, and the next caller tries again.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from flashforge import FlashForgeClient
+
+from .job import file_to_dict
+
+# How long a listing answers every command, in seconds. Short enough that a file
+# uploaded from the slicer shows up the next time the card is opened.
+FILE_LIST_TTL = 10
+
+# How old a listing job/start will still validate against, in seconds. Start
+# re-reads the file to check the mapping the user confirmed against the tools it
+# declares; the listing job/prepare built that dialog from is the one that
+# matters, and it is usually older than the TTL by the time the user confirms.
+START_MAX_AGE = 60
+
+
+def _consume_exception(future: asyncio.Future[Any]) -> None:
+    """Mark a finished fetch's exception as retrieved."""
+    if not future.cancelled():
+        future.exception()
+
+
+class FileListCache:
+    """One printer's most recent file listing, fetched at most once at a time."""
+
+    def __init__(self, client: FlashForgeClient) -> None:
+        self._client = client
+        self._files: list[dict[str, Any]] | None = None
+        self._fetched_at = 0.0
+        self._pending: asyncio.Future[list[dict[str, Any]]] | None = None
+
+    @property
+    def age(self) -> float | None:
+        """Return how many seconds ago the cached listing was fetched, if any."""
+        if self._files is None:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    async def async_get(self, max_age: float = FILE_LIST_TTL) -> list[dict[str, Any]]:
+        """Return the file list, fetching it if the cached one is older than ``max_age``.
+
+        Every supported model answers ``/gcodeList`` with its ten most recent
+        files; the full local listing exists only over the legacy TCP channel
+        this integration deliberately does not speak. The AD5X and Creator 5
+        series include per-tool material data here, which is what makes matching
+        possible.
+        """
+        age = self.age
+        if age is not None and age <= max_age:
+            return self._files  # type: ignore[return-value]
+
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._async_fetch())
+            # The fetch can outlive every waiter; its error is theirs to see,
+            # but must not be logged as never retrieved when none is left.
+            self._pending.add_done_callback(_consume_exception)
+        # Shielded: a card closing mid-request cancels its own wait, not the
+        # fetch another command is also waiting on.
+        return await asyncio.shield(self._pending)
+
+    async def _async_fetch(self) -> list[dict[str, Any]]:
+        try:
+            entries = await self._client.files.get_recent_file_list()
+            files = [file_to_dict(entry) for entry in entries or []]
+        finally:
+            self._pending = None
+        self._files = files
+        self._fetched_at = time.monotonic()
+        return files
@@ -0,0 +1,321 @@
+"""Poll scheduling shared by every printer.
+
+Each printer's coordinator used to keep its own timer, and Home Assistant
+schedules those on whole seconds plus a small random offset. Printers set up
+together - every one of them, after a restart - fired ``/detail`` within the
+same second, every interval, for as long as Home Assistant ran: a burst of
+requests and wakeups, then nothing.
+
+The :class:`FleetScheduler` is shared by every entry. It does three things:
+
+* **Staggers polls.** Each registered coordinator is given a phase, an even
+  share of the interval, and its polls land on that phase's grid: with ten
+  printers on a 10 s interval, one poll a second instead of ten at once. The
+  phases are recomputed whenever a printer is added or removed.
+* **Caps concurrency.** At most :data:`MAX_CONCURRENT_POLLS` status polls are in
+  flight at once, across every printer; the rest wait their turn. Commands and
+  file operations the user asked for are never queued behind it.
+* **Measures.** Every poll's duration and outcome, over a rolling window, for
+  diagnostics.
+
+It also keeps the :class:`FleetSummary` behind the "FlashForge fleet" device's
+sensors: how many printers are printing, idle or in trouble, and what they are
+printing. Dashboards used to template-sum those across dozens of entities,
+re-evaluated on every state change anywhere. The summary is kept up to date from
+each printer's own coordinator instead, one printer's contribution at a time.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime
+import math
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from flashforge.models import MachineState
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import IDLE_STATES
+from .util import percentile, print_completion_time
+
+if TYPE_CHECKING:
+    from .coordinator import FlashForgeDataUpdateCoordinator
+
+_DATA_KEY = f"{DOMAIN}_fleet"
+
+# Status polls in flight at once, across every printer. A poll is one short
+# request, so this only ever bites for a large fleet or printers that are slow
+# to answer - which is exactly when piling on more requests helps nobody.
+MAX_CONCURRENT_POLLS = 8
+
+# Polls whose duration is kept for the latency figures.
+LATENCY_WINDOW = 200
+
+# How late a poll may start and still count as on its phase. A poll starts a
+# few milliseconds after its slot; without slack, the next slot would look
+# less than one interval away and be skipped.
+SLOT_TOLERANCE = 1.0  # seconds
+
+# A print that has started and not ended, whether or not it is advancing.
+ACTIVE_PRINT_STATES = frozenset(
+    {MachineState.PRINTING, MachineState.PAUSING, MachineState.PAUSED}
+)
+
+
+class FleetScheduler:
+    """Phases, a concurrency cap and latency figures for every printer's polls."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_POLLS) -> None:
+        self._coordinators: list[FlashForgeDataUpdateCoordinator] = []
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._max_concurrent = max_concurrent
+        self._durations: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.polls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.summary = FleetSummary()
+
+    def __len__(self) -> int:
+        return len(self._coordinators)
+
+    @callback
+    def async_register(self, coordinator: FlashForgeDataUpdateCoordinator) -> None:
+        """Give a coordinator a phase; every other printer's phase shifts to make room."""
+        if coordinator not in self._coordinators:
+            self._coordinators.append(coordinator)
+
+    @callback
+    def async_unregister(self, coordinator: FlashForgeDataUpdateCoordinator) -> None:
+        """Take a coordinator out of the rotation."""
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+
+    def phase(self, coordinator: FlashForgeDataUpdateCoordinator) -> float:
+        """Return the coordinator's share of the interval, from 0 up to 1."""
+        try:
+            index = self._coordinators.index(coordinator)
+        except ValueError:
+            return 0.0
+        return index / len(self._coordinators)
+
+    def next_poll(
+        self,
+        coordinator: FlashForgeDataUpdateCoordinator,
+        interval: float,
+        last_start: float | None,
+        now: float,
+    ) -> float:
+        """Return when the coordinator should next poll, in event loop time.
+
+        The first slot on the coordinator's grid at least one interval after its
+        last poll started. Polls are spaced a full interval apart, start to
+        start, however long each one takes.
+        """
+        earliest = (now if last_start is None else last_start) + interval
+        earliest = max(earliest, now) - SLOT_TOLERANCE
+        offset = self.phase(coordinator) * interval
+        return offset + math.ceil((earliest - offset) / interval) * interval
+
+    @asynccontextmanager
+    async def async_poll(self) -> AsyncIterator[None]:
+        """Hold one of the fleet's poll slots, timing the request made in it."""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._durations.append(time.monotonic() - started)
+            self.polls += 1
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def latency(self) -> dict[str, float | None]:
+        """Return poll latency over the window, in seconds."""
+        durations = sorted(self._durations)
+        if not durations:
+            return {"p50": None, "p95": None, "max": None}
+        return {
+            "p50": round(percentile(durations, 50), 3),
+            "p95": round(percentile(durations, 95), 3),
+            "max": round(durations[-1], 3),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fleet's state for diagnostics."""
+        return {
+            "printers": len(self._coordinators),
+            "max_concurrent_polls": self._max_concurrent,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "polls": self.polls,
+            "failures": self.failures,
+            "latency": self.latency(),
+        }
+
+
+class PrinterSummary(NamedTuple):
+    """What one printer adds to the fleet's totals."""
+
+    printing: bool = False
+    idle: bool = False
+    error: bool = False
+    filament_weight: float = 0.0
+    completion: datetime | None = None
+
+
+def summarize_printer(coordinator: FlashForgeDataUpdateCoordinator) -> PrinterSummary:
+    """Return a printer's contribution to the fleet, from its latest poll.
+
+    A printer that is not answering counts as an error: on a farm, a printer
+    that has dropped off the network needs someone to look at it as much as one
+    reporting a fault does.
+    """
+    data = coordinator.data
+    if data is None or not coordinator.last_update_success:
+        return PrinterSummary(error=True)
+    state = getattr(data, "machine_state", None)
+    printing = state in ACTIVE_PRINT_STATES
+    return PrinterSummary(
+        printing=printing,
+        idle=state in IDLE_STATES,
+        error=state is MachineState.ERROR,
+        filament_weight=float(getattr(data, "est_weight", 0) or 0) if printing else 0.0,
+        completion=print_completion_time(data),
+    )
+
+
+class FleetSummary:
+    """Fleet-wide totals, adjusted by each printer's change rather than recounted.
+
+    A poll that changes nothing about a printer's contribution costs nothing
+    beyond comparing it; one that does adjusts the totals by the difference, and
+    only then wakes the fleet's sensors.
+    """
+
+    def __init__(self) -> None:
+        self._printers: dict[str, PrinterSummary] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._hosts: dict[str, Callable[[FleetSummary], None]] = {}
+        self._host: str | None = None
+        self.printers = 0
+        self.active_prints = 0
+        self.idle = 0
+        self.errors = 0
+        self.filament_weight = 0.0
+        self.earliest_completion: datetime | None = None
+
+    @callback
+    def async_track(
+        self, key: str, coordinator: FlashForgeDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Follow a printer's coordinator; the returned callback stops following it."""
+
+        @callback
+        def _async_on_update() -> None:
+            self._async_set(key, summarize_printer(coordinator))
+
+        remove_listener = coordinator.async_add_listener(_async_on_update)
+        _async_on_update()
+
+        @callback
+        def _async_untrack() -> None:
+            remove_listener()
+            self._async_set(key, None)
+
+        return _async_untrack
+
+    @callback
+    def _async_set(self, key: str, summary: PrinterSummary | None) -> None:
+        previous = self._printers.get(key)
+        if summary == previous:
+            return
+        if previous is not None:
+            self._apply(previous, -1)
+            del self._printers[key]
+        if summary is not None:
+            self._apply(summary, 1)
+            self._printers[key] = summary
+        # The one figure that is not a sum: recomputed, but only when some
+        # printer's completion time actually moved.
+        if getattr(previous, "completion", None) != getattr(summary, "completion", None):
+            self.earliest_completion = min(
+                (
+                    printer.completion
+                    for printer in self._printers.values()
+                    if printer.completion is not None
+                ),
+                default=None,
+            )
+        for listener in list(self._listeners):
+            listener()
+
+    def _apply(self, summary: PrinterSummary, sign: int) -> None:
+        self.printers += sign
+        self.active_prints += sign * summary.printing
+        self.idle += sign * summary.idle
+        self.errors += sign * summary.error
+        self.filament_weight = max(self.filament_weight + sign * summary.filament_weight, 0.0)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call ``update_callback`` whenever a total changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove
+
+    @callback
+    def async_offer_host(
+        self, entry_id: str, add_entities: Callable[[FleetSummary], None]
+    ) -> CALLBACK_TYPE:
+        """Offer an entry's sensor platform as the home of the fleet device.
+
+        The fleet's sensors have to belong to some config entry. The first entry
+        offered hosts them; when it unloads, the next one still loaded takes them
+        over, under the same unique IDs, so history and dashboards carry on.
+        ``add_entities`` re-registers the device and sensors to its own entry
+        before adding them; the registry does not move them on its own.
+        """
+        self._hosts[entry_id] = add_entities
+        if self._host is None:
+            self._async_move_host()
+
+        @callback
+        def _async_withdraw() -> None:
+            del self._hosts[entry_id]
+            if self._host == entry_id:
+                self._async_move_host()
+
+        return _async_withdraw
+
+    @callback
+    def _async_move_host(self) -> None:
+        self._host = next(iter(self._hosts), None)
+        if self._host is not None:
+            self._hosts[self._host](self)
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> FleetScheduler:
+    """Return the scheduler shared by every entry, creating it on first use."""
+    fleet: FleetScheduler | None = hass.data.get(_DATA_KEY)
+    if fleet is None:
+        fleet = hass.data[_DATA_KEY] = FleetScheduler()
+    return fleet
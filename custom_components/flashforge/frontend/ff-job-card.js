@@ -197,6 +197,13 @@ function pendingTranslator() {
 /* Styles                                                              */
 /* ------------------------------------------------------------------ */
 
+/**
+ * Pixel size thumbnails are asked for: twice the largest tile (`.summary
+ * .thumb`), so they stay sharp on high-density screens. The server downscales
+ * and re-encodes them, and caches the result.
+ */
+const THUMB_SIZE = 152;
+
 const STYLES = `
   :host { display: block; }
   ha-card { overflow: hidden; }
@@ -358,6 +365,10 @@ class FlashForgeJobCard extends HTMLElement {
     this._notice = null;
     this._data = null; // { files, slots, model, printer_name, has_material_station, is_creator5_series }
     this._thumbs = {};
+    this._filesSubscription = null;
+    this._filesUnsubscribe = null;
+    this._thumbsUnsubscribe = null;
+    this._thumbsBatch = null;
     this._selected = null;
     this._leveling = false;
     this._dialog = null; // matching / confirm dialog state
@@ -375,6 +386,8 @@ class FlashForgeJobCard extends HTMLElement {
     // Reconfigured live (the card editor, or a dashboard edit). `hass` is only
     // set once per element, so nothing else would reload the new printer.
     if (this._hass && this._config.entry_id !== previousEntry) {
+      this._stopFiles();
+      this._stopThumbnails();
       this._data = null;
       this._thumbs = {};
       this._selected = null;
@@ -425,57 +438,142 @@ class FlashForgeJobCard extends HTMLElement {
     });
   }
 
-  async _loadFiles() {
+  /**
+   * Subscribe to the printer's files and Material Station state. The first
+   * event is the whole picture; every later one carries only what changed, and
+   * is merged over it. Nothing here polls: the server pushes a slot change
+   * from its own status poll, and a new file list when that poll shows one.
+   */
+  async _loadFiles(refresh = false) {
     // Nothing to ask for until the card knows which printer it belongs to;
     // _render() is already showing the "pick a printer" message.
-    if (!this._config.entry_id) return;
+    if (!this._config.entry_id || !this._hass) return;
 
+    this._stopFiles();
+    const subscription = {};
+    this._filesSubscription = subscription;
     this._loading = true;
     this._error = null;
     this._render();
 
     try {
-      this._data = await this._send({ type: "flashforge/files/list" });
-      this._loaded = true;
-      // Drop a selection that the printer no longer lists.
-      if (
-        this._selected &&
-        !this._data.files.some((file) => file.file_name === this._selected)
-      ) {
-        this._selected = null;
-      }
+      const unsubscribe = await this._hass.connection.subscribeMessage(
+        (event) => {
+          if (this._filesSubscription !== subscription) return;
+          this._data = { ...(this._data || {}), ...event };
+          this._loaded = true;
+          this._loading = false;
+          // Drop a selection that the printer no longer lists.
+          if (
+            this._selected &&
+            !this._data.files.some((file) => file.file_name === this._selected)
+          ) {
+            this._selected = null;
+          }
+          this._render();
+          if (event.files) this._loadThumbnails();
+        },
+        {
+          type: "flashforge/files/subscribe",
+          entry_id: this._config.entry_id,
+          refresh,
+        },
+      );
+      // Superseded - reconfigured, refreshed or detached - while subscribing.
+      if (this._filesSubscription !== subscription) unsubscribe();
+      else this._filesUnsubscribe = unsubscribe;
     } catch (err) {
+      if (this._filesSubscription !== subscription) return;
+      this._filesSubscription = null;
       this._error = err.message || this._t("err_load");
       this._data = null;
-    } finally {
       this._loading = false;
       this._render();
-      this._loadThumbnails();
+    }
+  }
+
+  _stopFiles() {
+    this._filesSubscription = null;
+    if (this._filesUnsubscribe) {
+      this._filesUnsubscribe();
+      this._filesUnsubscribe = null;
     }
   }
 
   /**
-   * Fetch thumbnails one at a time, after the list is on screen. Sequential so
-   * a printer with ten files is not hit with ten simultaneous requests while it
-   * is also answering the status poll.
+   * Fetch every missing thumbnail over one subscription, after the list is on
+   * screen. The server answers from its cache first and asks the printer for
+   * the rest a couple at a time - so the printer is never hit with ten
+   * simultaneous requests while it is also answering the status poll - and
+   * each tile fills in the moment its image arrives.
    */
   async _loadThumbnails() {
-    if (!this._data) return;
-    for (const file of this._data.files) {
-      if (file.file_name in this._thumbs) continue;
-      try {
-        const result = await this._send({
-          type: "flashforge/file/thumbnail",
-          file_name: file.file_name,
-        });
-        this._thumbs[file.file_name] = result.image || null;
-      } catch (err) {
-        this._thumbs[file.file_name] = null;
+    if (!this._data || !this._hass) return;
+    const wanted = this._data.files
+      .map((file) => file.file_name)
+      .filter((name) => !(name in this._thumbs));
+    if (!wanted.length) return;
+
+    this._stopThumbnails();
+    const batch = {};
+    this._thumbsBatch = batch;
+    let finished = false;
+    const finish = () => {
+      finished = true;
+      // Anything the server never answered for gets the placeholder tile.
+      for (const name of wanted) {
+        if (!(name in this._thumbs)) this._thumbs[name] = null;
       }
+      if (this._thumbsBatch === batch) this._stopThumbnails();
       this._renderFiles();
+    };
+
+    try {
+      const unsubscribe = await this._hass.connection.subscribeMessage(
+        (event) => {
+          if (event.done) {
+            finish();
+            return;
+          }
+          this._thumbs[event.file_name] = event.image
+            ? `data:${event.content_type || "image/png"};base64,${event.image}`
+            : null;
+          this._renderFiles();
+        },
+        {
+          type: "flashforge/file/thumbnails",
+          entry_id: this._config.entry_id,
+          file_names: wanted,
+          size: THUMB_SIZE,
+        },
+      );
+      // The whole batch can arrive in the same frame as the subscription's
+      // result, before this line runs - and a newer batch may have started.
+      if (finished || this._thumbsBatch !== batch) unsubscribe();
+      else this._thumbsUnsubscribe = unsubscribe;
+    } catch (err) {
+      finish();
+    }
+  }
+
+  _stopThumbnails() {
+    if (this._thumbsUnsubscribe) {
+      this._thumbsUnsubscribe();
+      this._thumbsUnsubscribe = null;
     }
   }
 
+  connectedCallback() {
+    // Re-attached after a view switch: follow the printer again. The snapshot
+    // also restarts whatever thumbnails the detach cut short.
+    if (this._hass && !this._filesSubscription) this._loadFiles();
+  }
+
+  disconnectedCallback() {
+    this._stopFiles();
+    this._stopThumbnails();
+  }
+
   /* -- actions ----------------------------------------------------- */
 
   async _onStartClicked() {
@@ -663,7 +761,7 @@ class FlashForgeJobCard extends HTMLElement {
     this._root.getElementById("refresh").addEventListener("click", () => {
       this._thumbs = {};
       this._notice = null;
-      this._loadFiles();
+      this._loadFiles(true);
     });
   }
 
@@ -775,7 +873,7 @@ class FlashForgeJobCard extends HTMLElement {
            data-file="${esc(file.file_name)}">
         ${
           thumb
-            ? `<img class="thumb" src="data:image/png;base64,${thumb}" alt="">`
+            ? `<img class="thumb" src="${thumb}" alt="">`
             : `<div class="thumb">⚙</div>`
         }
         <div class="file-info">
@@ -847,7 +945,7 @@ class FlashForgeJobCard extends HTMLElement {
             <div class="summary">
               ${
                 thumb
-                  ? `<img class="thumb" src="data:image/png;base64,${thumb}" alt="">`
+                  ? `<img class="thumb" src="${thumb}" alt="">`
                   : `<div class="thumb">⚙</div>`
               }
               <div>
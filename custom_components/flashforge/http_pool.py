@@ -0,0 +1,114 @@
+"""One HTTP connection pool for every printer.
+
+The library gives each :class:`FlashForgeClient` its own ``aiohttp`` session,
+and with it its own connector: twenty printers meant twenty connection pools,
+each with aiohttp's defaults and none of them shared. Every client is now handed
+a session on a single connector owned by the integration instead, tuned for what
+it talks to - a small embedded web server per printer, polled every few seconds.
+
+Each client still gets a session of its own, created with
+``connector_owner=False``. The library and :func:`util.async_close_flashforge_client`
+close a client's session as they always have; that releases the session and
+leaves the connections to the pool. Entries hold the pool for as long as they
+are loaded, config flows for as long as they check a printer. The connector
+closes when the last of them lets go, or when Home Assistant stops.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from flashforge import FlashForgeClient
+
+_DATA_KEY = f"{DOMAIN}_http_pool"
+
+# The library's own per-request budget, which its calls rely on as the default.
+HTTP_TIMEOUT = 15  # seconds
+
+# The printers' web servers handle a handful of connections badly and dozens not
+# at all. The library serializes commands, so more than this only ever queues
+# status reads behind each other on the printer instead of in Home Assistant.
+LIMIT_PER_HOST = 4
+
+# Long enough to carry a connection from one busy-printer poll to the next, so a
+# printing machine is not re-handshaken every few seconds; short enough that an
+# idle printer's connection is let go long before the printer drops it.
+KEEPALIVE_TIMEOUT = 15  # seconds
+
+# Printers are normally configured by IP, but a host name resolves once here.
+DNS_CACHE_TTL = 300  # seconds
+
+
+class HttpPool:
+    """A connector shared by every entry's client, closed with the last entry."""
+
+    def __init__(self) -> None:
+        self._connector: aiohttp.TCPConnector | None = None
+        self._users = 0
+
+    @property
+    def users(self) -> int:
+        """Return how many entries and flows hold the pool."""
+        return self._users
+
+    @callback
+    def async_attach(self, client: FlashForgeClient) -> None:
+        """Put ``client``'s requests on the shared connector; release it when done.
+
+        The library takes no session from outside, so this sets its private
+        ``_http_session``. It makes a session of its own only when that one is
+        missing or closed, which happens here only on teardown; should it ever
+        replace an open one, the client would quietly leave the pool.
+        """
+        client._http_session = self.async_acquire()
+
+    @callback
+    def async_acquire(self) -> aiohttp.ClientSession:
+        """Return a new session on the shared connector; release it when done."""
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit_per_host=LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            )
+        self._users += 1
+        return aiohttp.ClientSession(
+            connector=self._connector,
+            connector_owner=False,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+            headers={"Accept": "*/*"},
+        )
+
+    async def async_release(self) -> None:
+        """Give up one hold on the pool, closing the connector after the last."""
+        self._users = max(self._users - 1, 0)
+        if self._users == 0:
+            await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close every pooled connection."""
+        connector, self._connector = self._connector, None
+        if connector is not None and not connector.closed:
+            await connector.close()
+
+
+@callback
+def async_get_http_pool(hass: HomeAssistant) -> HttpPool:
+    """Return the pool shared by every entry, creating it on first use."""
+    pool: HttpPool | None = hass.data.get(_DATA_KEY)
+    if pool is None:
+        pool = hass.data[_DATA_KEY] = HttpPool()
+
+        # Entries are not unloaded when Home Assistant stops.
+        async def _async_close(event: Event) -> None:
+            await pool.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return pool
@@ -1,10 +1,15 @@
 """Image platform: g-code thumbnail + Material Station slot color swatches."""
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache, partial
 from io import BytesIO
 import logging
 from pathlib import Path
+import threading
 from typing import Any
+from xml.sax.saxutils import escape
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -15,9 +20,11 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import CONF_SWATCH_FORMAT, DEFAULT_SWATCH_FORMAT, DOMAIN
 from .coordinator import FlashForgeDataUpdateCoordinator
-from .util import build_device_info
+from .file_list import FileListCache
+from .thumbnails import ThumbnailStore, async_get_thumbnail_store
+from .util import WriteOnChangeMixin, build_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +33,10 @@ EMPTY_LABEL = "EMPTY"
 EMPTY_COLOR = "#3A3A3A"
 SWATCH_SIZE = 256
 
+SWATCH_PNG = "png"
+SWATCH_SVG = "svg"
+SWATCH_FORMATS = [SWATCH_PNG, SWATCH_SVG]
+
 _FONT_CANDIDATES = (
     "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
     "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
@@ -33,6 +44,11 @@ _FONT_CANDIDATES = (
     "C:/Windows/Fonts/arialbd.ttf",
 )
 
+# Rendered swatches kept in memory, across every slot of every printer. A label
+# and color pair is a few kB of PNG, and a fleet rarely loads more than a dozen
+# distinct spools at once.
+SWATCH_CACHE_SIZE = 64
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -44,6 +60,7 @@ async def async_setup_entry(
         "coordinator"
     ]
     printer_name: str = hass.data[DOMAIN][entry.entry_id]["name"]
+    swatch_format: str = entry.options.get(CONF_SWATCH_FORMAT, DEFAULT_SWATCH_FORMAT)
 
     async_add_entities(
         [FlashForgeThumbnailImage(hass, coordinator, printer_name, entry.entry_id)]
@@ -65,7 +82,12 @@ async def async_setup_entry(
         slots_added = True
         async_add_entities(
             FlashForgeMaterialStationSlotImage(
-                hass, coordinator, printer_name, entry.entry_id, slot_id
+                hass,
+                coordinator,
+                printer_name,
+                entry.entry_id,
+                slot_id,
+                swatch_format=swatch_format,
             )
             for slot_id in range(1, IFS_SLOT_COUNT + 1)
         )
@@ -100,11 +122,32 @@ def _text_color_for(bg: tuple[int, int, int]) -> tuple[int, int, int]:
     return (20, 20, 20) if luma > 140 else (245, 245, 245)
 
 
-def _load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+def _rgb_to_hex(rgb: tuple[int, int, int]) -> str:
+    """Format an RGB triple as ``#RRGGBB``."""
+    r, g, b = rgb
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+@lru_cache(maxsize=1)
+def _font_path() -> str | None:
     for path in _FONT_CANDIDATES:
         if Path(path).exists():
-            return ImageFont.truetype(path, size)
-    return ImageFont.load_default()
+            return path
+    return None
+
+
+@lru_cache(maxsize=64)
+def _load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """Return the label font at ``size``, loaded once per process."""
+    path = _font_path()
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+# The cached font objects wrap FreeType faces, which are not safe to use from two
+# executor threads at once.
+_RENDER_LOCK = threading.Lock()
 
 
 def _fit_font(
@@ -129,6 +172,11 @@ def render_swatch_bytes(
     material: str, hex_color: str, *, size: int = SWATCH_SIZE
 ) -> bytes:
     """Render a PNG swatch (color + material label). Blocking — call via executor."""
+    with _RENDER_LOCK:
+        return _render_swatch(material, hex_color, size)
+
+
+def _render_swatch(material: str, hex_color: str, size: int) -> bytes:
     bg = _hex_to_rgb(hex_color) or _hex_to_rgb(EMPTY_COLOR) or (60, 60, 60)
     img = Image.new("RGB", (size, size), bg)
     draw = ImageDraw.Draw(img)
@@ -152,13 +200,125 @@ def render_swatch_bytes(
     return buf.getvalue()
 
 
+# Average advance of an upper-case bold sans glyph, in ems. Without a font to
+# measure with, the SVG label is sized from this and then told its exact width.
+_SVG_GLYPH_EM = 0.68
+
+_SVG_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}"'
+    ' viewBox="0 0 {size} {size}">'
+    '<rect x="1" y="1" width="{inner}" height="{inner}" fill="{bg}"'
+    ' stroke="{border}" stroke-width="2"/>'
+    '<text x="{half}" y="{half}" fill="{fg}" font-size="{font_size}"'
+    ' font-family="DejaVu Sans, Segoe UI, Arial, sans-serif" font-weight="bold"'
+    ' text-anchor="middle" dominant-baseline="central"{fit}>{label}</text>'
+    "</svg>"
+)
+
+
+def render_swatch_svg(
+    material: str, hex_color: str, *, size: int = SWATCH_SIZE
+) -> bytes:
+    """Render the swatch as SVG, from a template. Cheap enough for the event loop.
+
+    Same layout and colors as :func:`render_swatch_bytes`. The label is sized
+    from an average glyph width, shrinking like the PNG's does; a label that is
+    still too wide at the smallest size is squeezed to fit by the browser.
+    """
+    bg = _hex_to_rgb(hex_color) or _hex_to_rgb(EMPTY_COLOR) or (60, 60, 60)
+    border = (180, 180, 180) if sum(bg) > 600 else (40, 40, 40)
+    fg = _text_color_for(bg)
+
+    max_width = size - 2 * int(size * 0.12)
+    per_em = _SVG_GLYPH_EM * max(len(material), 1)
+    font_size = max(min(int(size * 0.36), int(max_width / per_em)), 24)
+    fit = ""
+    if font_size * per_em > max_width:
+        fit = f' textLength="{max_width}" lengthAdjust="spacingAndGlyphs"'
+
+    return _SVG_TEMPLATE.format(
+        size=size,
+        inner=size - 2,
+        half=f"{size / 2:g}",
+        bg=_rgb_to_hex(bg),
+        border=_rgb_to_hex(border),
+        fg=_rgb_to_hex(fg),
+        font_size=font_size,
+        fit=fit,
+        label=escape(material),
+    ).encode()
+
+
+class SwatchCache:
+    """Least-recently-used cache of rendered swatches, keyed by what they depict.
+
+    Four slots on each of several printers mostly show the same few spools, and
+    every filament change used to re-render each slot from scratch. Slots that
+    depict the same label, color and size share one render; two that miss at the
+    same moment share one executor job.
+    """
+
+    def __init__(self, max_entries: int = SWATCH_CACHE_SIZE) -> None:
+        self._max_entries = max_entries
+        self._swatches: OrderedDict[tuple[str, str, int], bytes] = OrderedDict()
+        self._pending: dict[tuple[str, str, int], asyncio.Future[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._swatches)
+
+    async def async_get(
+        self,
+        hass: HomeAssistant,
+        material: str,
+        hex_color: str,
+        size: int = SWATCH_SIZE,
+    ) -> bytes:
+        """Return the swatch for a label and color, rendering it on a miss."""
+        key = (material, hex_color.upper(), size)
+        data = self._swatches.get(key)
+        if data is not None:
+            self._swatches.move_to_end(key)
+            self.hits += 1
+            return data
+
+        pending = self._pending.get(key)
+        if pending is None:
+            self.misses += 1
+            pending = self._pending[key] = asyncio.ensure_future(
+                self._async_render(hass, key)
+            )
+        # Shielded: an image request that goes away mid-render leaves the render
+        # to whichever other slot is waiting on it.
+        return await asyncio.shield(pending)
+
+    async def _async_render(
+        self, hass: HomeAssistant, key: tuple[str, str, int]
+    ) -> bytes:
+        material, hex_color, size = key
+        try:
+            data = await hass.async_add_executor_job(
+                partial(render_swatch_bytes, material, hex_color, size=size)
+            )
+        finally:
+            del self._pending[key]
+        self._swatches[key] = data
+        while len(self._swatches) > self._max_entries:
+            self._swatches.popitem(last=False)
+        return data
+
+
+_SWATCHES = SwatchCache()
+
+
 # --------------------------------------------------------------------------- #
 # Entities
 # --------------------------------------------------------------------------- #
 
 
 class FlashForgeThumbnailImage(
-    CoordinatorEntity[FlashForgeDataUpdateCoordinator], ImageEntity
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], ImageEntity
 ):
     """Image entity exposing the thumbnail of the currently printing g-code file."""
 
@@ -176,11 +336,15 @@ class FlashForgeThumbnailImage(
         CoordinatorEntity.__init__(self, coordinator)
         ImageEntity.__init__(self, hass)
 
+        self._entry_id = entry_id
         self._attr_unique_id = f"{entry_id}_thumbnail"
         self._attr_device_info = build_device_info(coordinator, printer_name, entry_id)
 
         self._cached_file: str | None = None
         self._cached_bytes: bytes | None = None
+        # The file last checked against the listing, so one without a thumbnail
+        # does not list the printer's files on every request.
+        self._reconciled_file: str | None = None
 
     def _current_file(self) -> str | None:
         if self.coordinator.data is None:
@@ -206,6 +370,10 @@ class FlashForgeThumbnailImage(
             self._cached_file = current
             self._attr_image_last_updated = dt_util.utcnow()
 
+    def _state_snapshot(self) -> tuple[bool, str | None]:
+        """Return what this image's written state is derived from: the file, not its bytes."""
+        return (self.available, self._current_file())
+
     def _handle_coordinator_update(self) -> None:
         current = self._current_file()
         if current != self._cached_file:
@@ -214,6 +382,26 @@ class FlashForgeThumbnailImage(
             self._attr_image_last_updated = dt_util.utcnow()
         super()._handle_coordinator_update()
 
+    async def _async_reconcile(self, store: ThumbnailStore) -> None:
+        """Drop the cached thumbnail if the file was re-sliced under the same name.
+
+        ``/detail`` only says which file is printing - its time and weight are
+        what remains of the print - so the fingerprint comes from the listing,
+        shared with the job card. Runs once per file printed.
+        """
+        current = self._current_file()
+        if current == self._reconciled_file:
+            return
+        file_list: FileListCache = self.hass.data[DOMAIN][self._entry_id]["file_list"]
+        try:
+            files = await file_list.async_get()
+        except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
+            # Served by name alone, as before the listing was consulted.
+            _LOGGER.debug("Could not list files to check the thumbnail: %s", err)
+            return
+        await store.async_reconcile(self._entry_id, files)
+        self._reconciled_file = current
+
     async def async_image(self) -> bytes | None:
         current = self._current_file()
         if current is None:
@@ -222,11 +410,22 @@ class FlashForgeThumbnailImage(
         if self._cached_bytes is not None and self._cached_file == current:
             return self._cached_bytes
 
-        try:
-            data = await self.coordinator.client.files.get_gcode_thumbnail(current)
-        except Exception as err:  # noqa: BLE001
-            _LOGGER.debug("Thumbnail fetch failed for %s: %s", current, err)
+        # Shared with the job card, and on disk: whichever of the two asked for
+        # this file first, the other - and the next restart - is served locally.
+        store = async_get_thumbnail_store(self.hass)
+        await self._async_reconcile(store)
+        if store.is_missing(self._entry_id, current):
             return None
+        data = await store.async_get(self._entry_id, current)
+        if data is None:
+            try:
+                data = await self.coordinator.client.files.get_gcode_thumbnail(current)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Thumbnail fetch failed for %s: %s", current, err)
+                data = None
+            # Even "none", as the job card does, so a file without a thumbnail
+            # is not asked for again on every request.
+            await store.async_set(self._entry_id, current, data)
 
         if data:
             self._cached_file = current
@@ -235,12 +434,15 @@ class FlashForgeThumbnailImage(
 
 
 class FlashForgeMaterialStationSlotImage(
-    CoordinatorEntity[FlashForgeDataUpdateCoordinator], ImageEntity
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], ImageEntity
 ):
-    """Image entity rendering a Material Station slot as a labeled color swatch."""
+    """Image entity rendering a Material Station slot as a labeled color swatch.
+
+    The swatch is a PNG by default. An entry set to SVG serves a vector swatch
+    rendered from a template instead - a few hundred bytes, no PIL, no executor.
+    """
 
     _attr_has_entity_name = True
-    _attr_content_type = "image/png"
 
     def __init__(
         self,
@@ -249,17 +451,20 @@ class FlashForgeMaterialStationSlotImage(
         printer_name: str,
         entry_id: str,
         slot_id: int,
+        *,
+        swatch_format: str = SWATCH_PNG,
     ) -> None:
         CoordinatorEntity.__init__(self, coordinator)
         ImageEntity.__init__(self, hass)
 
         self._slot_id = slot_id
+        self._svg = swatch_format == SWATCH_SVG
+        self._attr_content_type = "image/svg+xml" if self._svg else "image/png"
         self._attr_unique_id = f"{entry_id}_ifs_slot_{slot_id}"
         self._attr_translation_key = f"ifs_slot_{slot_id}"
         self._attr_device_info = build_device_info(coordinator, printer_name, entry_id)
 
         self._cached_key: tuple[str, str] | None = None
-        self._cached_bytes: bytes | None = None
 
     def _slot(self) -> Any | None:
         data = self.coordinator.data
@@ -311,23 +516,19 @@ class FlashForgeMaterialStationSlotImage(
             self._cached_key = self._swatch_key()
             self._attr_image_last_updated = dt_util.utcnow()
 
+    def _state_snapshot(self) -> tuple[bool, dict[str, Any]]:
+        """Return what this swatch's written state is derived from: the slot's attributes."""
+        return (self.available, self.extra_state_attributes)
+
     def _handle_coordinator_update(self) -> None:
         key = self._swatch_key()
         if key != self._cached_key:
             self._cached_key = key
-            self._cached_bytes = None
             self._attr_image_last_updated = dt_util.utcnow()
         super()._handle_coordinator_update()
 
     async def async_image(self) -> bytes | None:
-        key = self._swatch_key()
-        if self._cached_bytes is not None and key == self._cached_key:
-            return self._cached_bytes
-
-        material, color = key
-        data = await self.hass.async_add_executor_job(
-            render_swatch_bytes, material, color
-        )
-        self._cached_key = key
-        self._cached_bytes = data
-        return data
+        material, color = self._swatch_key()
+        if self._svg:
+            return render_swatch_svg(material, color)
+        return await _SWATCHES.async_get(self.hass, material, color)
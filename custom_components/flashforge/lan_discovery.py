@@ -0,0 +1,149 @@
+"""LAN discovery shared by every config flow, run in the background and remembered.
+
+The discovery step used to start a fresh UDP scan each time the flow was opened
+and hold the step until the scan gave up: an idle timeout after the last answer,
+and up to three full timeouts when nothing answered. Adding the 25th printer to
+a farm meant sitting through it for the 25th time.
+
+Scans now run in the background on the library's event-based monitor, which
+probes every interface's broadcast address and the multicast group from one
+socket at once and reports each printer the moment it answers:
+
+* A scan starts when the integration loads and when the setup dialog opens, so
+  by the time the user picks automatic discovery the answers are usually in.
+* Results are kept for :data:`DISCOVERY_TTL`. A flow opened within that time is
+  answered from memory.
+* A flow that has to wait returns once the first printer has answered and no
+  other has for :data:`SETTLE_TIME`, rather than when the scan ends. The scan
+  carries on behind it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from flashforge.discovery import DiscoveredPrinter, DiscoveryOptions, PrinterDiscovery
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_DATA_KEY = f"{DOMAIN}_lan_discovery"
+
+# How long a completed scan answers every flow, in seconds. Printers rarely
+# change address; one that does is still reachable through manual setup.
+DISCOVERY_TTL = 300
+
+# Once a printer has answered, how long a waiting flow gives the rest to answer
+# too, in seconds. Printers on one LAN answer a broadcast within milliseconds of
+# each other.
+SETTLE_TIME = 1.0
+
+
+class LanDiscovery:
+    """The printers on the LAN, from the most recent background scan."""
+
+    def __init__(self) -> None:
+        self._printers: dict[str, DiscoveredPrinter] = {}
+        self._monitor = None
+        self._scanned_at: float | None = None
+        self._last_found_at = 0.0
+        self._changed = asyncio.Event()
+        self.last_error: Exception | None = None
+        self.scans = 0
+
+    @property
+    def scanning(self) -> bool:
+        """Return True while a scan is running."""
+        return self._monitor is not None
+
+    @property
+    def printers(self) -> list[DiscoveredPrinter]:
+        """Return every printer the latest scan has heard from so far."""
+        return list(self._printers.values())
+
+    @property
+    def fresh(self) -> bool:
+        """Return True when the last completed scan is recent enough to trust."""
+        return (
+            self._scanned_at is not None
+            and time.monotonic() - self._scanned_at < DISCOVERY_TTL
+        )
+
+    @callback
+    def async_scan(self, force: bool = False) -> None:
+        """Start a scan in the background, unless one is running or results are fresh."""
+        if self._monitor is not None or (self.fresh and not force):
+            return
+        self.scans += 1
+        self._printers = {}
+        self.last_error = None
+        self._monitor = (
+            PrinterDiscovery()
+            .monitor(DiscoveryOptions())
+            .on("discovered", self._on_discovered)
+            .on("error", self._on_error)
+            .on("end", self._on_end)
+        )
+
+    async def async_discover(self, force: bool = False) -> list[DiscoveredPrinter]:
+        """Return the printers on the LAN, scanning first unless results are fresh.
+
+        A fresh scan that found nothing is not trusted: whoever is opening the
+        flow has most likely just switched a printer on.
+        """
+        if force or not (self.fresh and self._printers):
+            self.async_scan(force=True)
+
+        while self._monitor is not None:
+            timeout: float | None = None
+            if self._printers:
+                timeout = self._last_found_at + SETTLE_TIME - time.monotonic()
+                if timeout <= 0:
+                    break
+            self._changed.clear()
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._changed.wait()
+            except TimeoutError:
+                break
+        return self.printers
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop a running scan."""
+        if self._monitor is not None:
+            self._monitor.stop()
+
+    def _on_discovered(self, printer: DiscoveredPrinter) -> None:
+        self._printers[f"{printer.ip_address}:{printer.command_port}"] = printer
+        self._last_found_at = time.monotonic()
+        self._changed.set()
+
+    def _on_error(self, err: Exception) -> None:
+        _LOGGER.debug("Printer discovery failed: %s", err)
+        self.last_error = err
+
+    def _on_end(self) -> None:
+        self._monitor = None
+        self._scanned_at = time.monotonic()
+        self._changed.set()
+
+
+@callback
+def async_get_lan_discovery(hass: HomeAssistant) -> LanDiscovery:
+    """Return the discovery shared by every flow, creating it on first use."""
+    discovery: LanDiscovery | None = hass.data.get(_DATA_KEY)
+    if discovery is None:
+        discovery = hass.data[_DATA_KEY] = LanDiscovery()
+
+        @callback
+        def _async_stop(event: Event) -> None:
+            discovery.async_stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    return discovery
@@ -0,0 +1,225 @@
+"""Latency, timeouts and errors of every request made to a printer.
+
+The coordinator only logged failures, so a printer whose embedded web server was
+slowly degrading looked healthy right up to the day it stopped answering. Every
+call the integration makes through a printer's client - status reads, file
+listings and thumbnails, controls, job commands, the camera probe - now passes
+through a thin layer that times it and records how it ended, per endpoint:
+
+* a latency histogram since setup, and p50/p95/max over the last
+  :data:`LATENCY_WINDOW` requests;
+* timeouts, counted on their own;
+* every other failure, by exception class. On a status read the library reports
+  a printer that did not answer by returning None rather than raising; that is
+  counted as :data:`NO_RESPONSE`.
+
+Each entry keeps its own :class:`RequestStats`, in memory. Diagnostics report
+every endpoint; the printer's request sensors report the totals.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+import inspect
+import time
+from typing import Any, TypeVar
+
+from flashforge import FlashForgeClient
+
+from .util import percentile
+
+_T = TypeVar("_T")
+
+# Requests whose duration is kept for the percentiles, per endpoint and overall.
+LATENCY_WINDOW = 100
+
+# Upper bounds of the latency histogram's buckets, in seconds; the last bucket
+# takes everything slower. A healthy printer answers well inside a quarter second.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+TIMEOUT = "TimeoutError"
+NO_RESPONSE = "NoResponse"
+
+# The client's sub-APIs whose every call is a request, and its own methods that are.
+INSTRUMENTED_APIS = ("info", "files", "control", "job_control", "temp_control")
+INSTRUMENTED_METHODS = ("detect_camera_stream", "send_product_command")
+
+# Endpoints where None means the printer did not answer. Elsewhere None is an
+# answer - a file without a thumbnail, say.
+_NONE_IS_FAILURE = frozenset({"info.get", "info.get_detail_raw"})
+
+
+class EndpointStats:
+    """The requests made to one endpoint of one printer."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.timeouts = 0
+        self.errors: Counter[str] = Counter()
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.durations: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, duration: float, error: str | None) -> None:
+        """Count one request that took ``duration`` seconds and ended in ``error``."""
+        self.requests += 1
+        self.durations.append(duration)
+        self.histogram[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        if error == TIMEOUT:
+            self.timeouts += 1
+        elif error is not None:
+            self.errors[error] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the endpoint's figures for diagnostics, latencies in seconds."""
+        return {
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": dict(self.errors),
+            "latency": _latency(self.durations),
+            "histogram": {
+                **{
+                    f"le_{bound:g}": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.histogram)
+                },
+                "slower": self.histogram[-1],
+            },
+        }
+
+
+class RequestStats:
+    """Every request made to one printer, by endpoint."""
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._durations: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def requests(self) -> int:
+        """Return the requests made since setup."""
+        return sum(stats.requests for stats in self._endpoints.values())
+
+    @property
+    def timeouts(self) -> int:
+        """Return the requests that timed out."""
+        return sum(stats.timeouts for stats in self._endpoints.values())
+
+    @property
+    def failures(self) -> int:
+        """Return the requests that failed in any way, timeouts included."""
+        return sum(
+            stats.timeouts + stats.errors.total() for stats in self._endpoints.values()
+        )
+
+    def errors(self) -> dict[str, int]:
+        """Return failures other than timeouts, by class, across every endpoint."""
+        total: Counter[str] = Counter()
+        for stats in self._endpoints.values():
+            total.update(stats.errors)
+        return dict(total)
+
+    def latency(self) -> dict[str, float | None]:
+        """Return latency over the most recent requests to any endpoint, in seconds."""
+        return _latency(self._durations)
+
+    def record(self, endpoint: str, duration: float, error: str | None) -> None:
+        """Count one request to ``endpoint``."""
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = EndpointStats()
+        stats.record(duration, error)
+        self._durations.append(duration)
+
+    async def async_track(self, endpoint: str, request: Awaitable[_T]) -> _T:
+        """Await a request to ``endpoint``, recording how long it took and how it ended.
+
+        A request cancelled by its caller - a card closed mid-fetch - is not
+        recorded: it says nothing about the printer.
+        """
+        started = time.monotonic()
+        try:
+            result = await request
+        except TimeoutError:
+            self.record(endpoint, time.monotonic() - started, TIMEOUT)
+            raise
+        except Exception as err:
+            self.record(endpoint, time.monotonic() - started, type(err).__name__)
+            raise
+        error = NO_RESPONSE if result is None and endpoint in _NONE_IS_FAILURE else None
+        self.record(endpoint, time.monotonic() - started, error)
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every endpoint's figures, and the totals, for diagnostics."""
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "errors": self.errors(),
+            "latency": self.latency(),
+            "endpoints": {
+                endpoint: stats.as_dict()
+                for endpoint, stats in sorted(self._endpoints.items())
+            },
+        }
+
+
+def _latency(durations: deque[float]) -> dict[str, float | None]:
+    ordered = sorted(durations)
+    if not ordered:
+        return {"p50": None, "p95": None, "max": None}
+    return {
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class _TimedMethod:
+    """A client method whose every request is tracked."""
+
+    def __init__(
+        self, stats: RequestStats, endpoint: str, method: Callable[..., Any]
+    ) -> None:
+        self._stats = stats
+        self._endpoint = endpoint
+        self.__wrapped__ = method
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        result = self.__wrapped__(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return self._stats.async_track(self._endpoint, result)
+        return result
+
+
+class _InstrumentedApi:
+    """One of the client's sub-APIs, with every request it makes tracked.
+
+    Everything else - attributes, and setting them - goes straight through.
+    """
+
+    def __init__(self, api: Any, stats: RequestStats, name: str) -> None:
+        object.__setattr__(self, "_api", api)
+        object.__setattr__(self, "_stats", stats)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._api, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        return _TimedMethod(self._stats, f"{self._name}.{attr}", value)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._api, attr, value)
+
+
+def instrument_client(client: FlashForgeClient, stats: RequestStats) -> None:
+    """Track every request the integration makes through ``client`` in ``stats``."""
+    for name in INSTRUMENTED_APIS:
+        api = getattr(client, name, None)
+        if api is not None and not isinstance(api, _InstrumentedApi):
+            setattr(client, name, _InstrumentedApi(api, stats, name))
+    for name in INSTRUMENTED_METHODS:
+        method = getattr(client, name, None)
+        if method is not None and not isinstance(method, _TimedMethod):
+            setattr(client, name, _TimedMethod(stats, name, method))
@@ -17,7 +17,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FlashForgeDataUpdateCoordinator
-from .util import build_device_info
+from .util import WriteOnChangeMixin, build_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -74,7 +74,9 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class FlashForgeSelect(CoordinatorEntity[FlashForgeDataUpdateCoordinator], SelectEntity):
+class FlashForgeSelect(
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], SelectEntity
+):
     """Representation of a FlashForge select entity."""
 
     entity_description: FlashForgeSelectEntityDescription
@@ -118,6 +120,10 @@ class FlashForgeSelect(CoordinatorEntity[FlashForgeDataUpdateCoordinator], Selec
 
         return True
 
+    def _state_snapshot(self) -> tuple[bool, str | None]:
+        """Return what this select's written state is derived from."""
+        return (self.available, self.current_option)
+
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         if self.entity_description.select_fn:
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime
 import logging
 from typing import Any
 
@@ -20,6 +19,7 @@ from homeassistant.const import (
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
     PERCENTAGE,
     EntityCategory,
+    Platform,
     UnitOfInformation,
     UnitOfLength,
     UnitOfMass,
@@ -27,14 +27,21 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from homeassistant.util import dt as dt_util
-
-from .const import DOMAIN
+from .const import DOMAIN, FLEET_DEVICE_ID
 from .coordinator import FlashForgeDataUpdateCoordinator
-from .util import build_device_info, is_creator5_series
+from .fleet import FleetSummary, async_get_fleet
+from .request_stats import RequestStats
+from .util import (
+    WriteOnChangeMixin,
+    build_device_info,
+    build_fleet_device_info,
+    is_creator5_series,
+    print_completion_time,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,39 +58,6 @@ def _parse_disk_space_mb(raw: str | float | int | None) -> float | None:
         return None
 
 
-def _completion_time(data: FFMachineInfo) -> datetime | None:
-    """Return the absolute completion timestamp, rounded to the minute.
-
-    HA 2026 rejects naive datetimes on timestamp sensors, so if the library's
-    ``completion_time`` is timezone-naive we stamp it with HA's configured
-    default timezone. Aware datetimes pass through unchanged.
-
-    Timezone-stamping approach adapted from pcamp96 (GhostTypes/ff-5mp-hass#15).
-
-    PRINTING is the only allowed state. The firmware freezes ``estimatedTime``
-    whenever the print is not advancing, so the library's ``completion_time``
-    (``now() + estimatedTime``, recomputed every poll) would step forward one
-    minute per minute and a paused print would appear to recede forever.
-    HEATING is excluded for the same reason as PAUSED/PAUSING - the pre-print
-    warmup does not advance the job either, it just drifts for minutes rather
-    than hours. The ``remaining_time`` sensor is unaffected: the duration stays
-    correct, only its conversion to an absolute timestamp does not.
-    ``flashforge-python-api`` >= 1.4.0 already returns ``None`` here; the state
-    check is kept so the sensor is correct against older libraries too.
-    """
-    if not data.estimated_time:
-        return None
-    if data.machine_state is not MachineState.PRINTING:
-        return None
-    ts = data.completion_time
-    if ts is None:
-        return None
-    ts = ts.replace(second=0, microsecond=0)
-    if ts.tzinfo is None:
-        ts = ts.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-    return ts
-
-
 def _active_ifs_slot(data: FFMachineInfo) -> int | None:
     """Return the active Material Station slot (1-4), 0 when idle, None when absent."""
     if not data.has_matl_station:
@@ -230,7 +204,7 @@ _BASE_SENSORS: tuple[FlashForgeSensorEntityDescription, ...] = (
         translation_key="print_completion_time",
         device_class=SensorDeviceClass.TIMESTAMP,
         icon="mdi:calendar-clock",
-        value_fn=_completion_time,
+        value_fn=print_completion_time,
     ),
     FlashForgeSensorEntityDescription(
         key="filament_length",
@@ -426,6 +400,178 @@ SENSORS: tuple[FlashForgeSensorEntityDescription, ...] = (
 )
 
 
+@dataclass
+class FlashForgeFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the FlashForge fleet device."""
+
+    value_fn: Callable[[FleetSummary], Any] | None = None
+
+
+FLEET_SENSORS: tuple[FlashForgeFleetSensorEntityDescription, ...] = (
+    FlashForgeFleetSensorEntityDescription(
+        key="active_prints",
+        translation_key="fleet_active_prints",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:printer-3d-nozzle",
+        value_fn=lambda summary: summary.active_prints,
+    ),
+    FlashForgeFleetSensorEntityDescription(
+        key="idle_printers",
+        translation_key="fleet_idle_printers",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:printer-3d",
+        value_fn=lambda summary: summary.idle,
+    ),
+    FlashForgeFleetSensorEntityDescription(
+        key="printers_in_error",
+        translation_key="fleet_printers_in_error",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:printer-3d-off",
+        value_fn=lambda summary: summary.errors,
+    ),
+    FlashForgeFleetSensorEntityDescription(
+        key="earliest_completion",
+        translation_key="fleet_earliest_completion",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:clock-end",
+        value_fn=lambda summary: summary.earliest_completion,
+    ),
+    FlashForgeFleetSensorEntityDescription(
+        key="filament_weight",
+        translation_key="fleet_filament_weight",
+        device_class=SensorDeviceClass.WEIGHT,
+        native_unit_of_measurement=UnitOfMass.GRAMS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:weight-gram",
+        value_fn=lambda summary: round(summary.filament_weight, 2),
+    ),
+)
+
+
+def _milliseconds(seconds: float | None) -> int | None:
+    return None if seconds is None else round(seconds * 1000)
+
+
+@dataclass
+class FlashForgeRequestSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the requests made to a printer."""
+
+    value_fn: Callable[[RequestStats], Any] | None = None
+    attributes_fn: Callable[[RequestStats], dict[str, Any]] | None = None
+
+
+# Off by default: they are for telling a printer that answers slowly, or not
+# at all, from a network that drops requests - not for everyday dashboards.
+REQUEST_SENSORS: tuple[FlashForgeRequestSensorEntityDescription, ...] = (
+    FlashForgeRequestSensorEntityDescription(
+        key="request_latency",
+        translation_key="request_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-sand",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: _milliseconds(stats.latency()["p95"]),
+        attributes_fn=lambda stats: {
+            "p50": _milliseconds(stats.latency()["p50"]),
+            "max": _milliseconds(stats.latency()["max"]),
+            "requests": stats.requests,
+        },
+    ),
+    FlashForgeRequestSensorEntityDescription(
+        key="request_failures",
+        translation_key="request_failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:lan-disconnect",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.failures,
+        attributes_fn=lambda stats: {"timeouts": stats.timeouts, **stats.errors()},
+    ),
+    FlashForgeRequestSensorEntityDescription(
+        key="request_timeouts",
+        translation_key="request_timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:timer-alert-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.timeouts,
+    ),
+)
+
+
+@dataclass
+class FlashForgePollSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of how a printer's polls are going."""
+
+    value_fn: Callable[[FlashForgeDataUpdateCoordinator], Any] | None = None
+
+
+# Off by default, like the request sensors: the poll duration moves on every
+# poll, and nobody needs that in the recorder until a printer misbehaves.
+POLL_SENSORS: tuple[FlashForgePollSensorEntityDescription, ...] = (
+    FlashForgePollSensorEntityDescription(
+        key="poll_duration",
+        translation_key="poll_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.last_poll_duration),
+    ),
+    FlashForgePollSensorEntityDescription(
+        key="poll_duration_p95",
+        translation_key="poll_duration_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-sand",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.poll_duration_p95),
+    ),
+    FlashForgePollSensorEntityDescription(
+        key="consecutive_poll_failures",
+        translation_key="consecutive_poll_failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-disconnect",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.consecutive_failures,
+    ),
+    FlashForgePollSensorEntityDescription(
+        key="last_successful_update",
+        translation_key="last_successful_update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:update",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        # A point in time rather than an age: the frontend shows how long ago
+        # it was and keeps that current, with no write until the next success.
+        value_fn=lambda coordinator: coordinator.last_success_time,
+    ),
+    FlashForgePollSensorEntityDescription(
+        key="poll_interval",
+        translation_key="poll_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-refresh-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        # The interval adaptive polling has settled on, not the configured one.
+        value_fn=lambda coordinator: (
+            coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None
+        ),
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -436,12 +582,23 @@ async def async_setup_entry(
         "coordinator"
     ]
     printer_name: str = hass.data[DOMAIN][entry.entry_id]["name"]
+    request_stats: RequestStats = hass.data[DOMAIN][entry.entry_id]["request_stats"]
 
     async_add_entities(
         FlashForgeSensor(coordinator, description, printer_name, entry.entry_id)
         for description in SENSORS
         if description.availability_fn is None
     )
+    async_add_entities(
+        FlashForgeRequestSensor(
+            coordinator, request_stats, description, printer_name, entry.entry_id
+        )
+        for description in REQUEST_SENSORS
+    )
+    async_add_entities(
+        FlashForgePollSensor(coordinator, description, printer_name, entry.entry_id)
+        for description in POLL_SENSORS
+    )
 
     pending = [
         description for description in SENSORS if description.availability_fn is not None
@@ -476,8 +633,57 @@ async def async_setup_entry(
     if pending:
         entry.async_on_unload(coordinator.async_add_listener(_async_add_available_sensors))
 
+    @callback
+    def _async_add_fleet_sensors(summary: FleetSummary) -> None:
+        _async_adopt_fleet_device(hass, entry.entry_id)
+        async_add_entities(
+            FlashForgeFleetSensor(summary, description) for description in FLEET_SENSORS
+        )
 
-class FlashForgeSensor(CoordinatorEntity[FlashForgeDataUpdateCoordinator], SensorEntity):
+    # One entry at a time hosts the fleet device; see FleetSummary.async_offer_host.
+    entry.async_on_unload(
+        async_get_fleet(hass).summary.async_offer_host(
+            entry.entry_id, _async_add_fleet_sensors
+        )
+    )
+
+
+def _fleet_unique_id(description: FlashForgeFleetSensorEntityDescription) -> str:
+    return f"{DOMAIN}_fleet_{description.key}"
+
+
+@callback
+def _async_adopt_fleet_device(hass: HomeAssistant, entry_id: str) -> None:
+    """Register the fleet device and its sensors to the entry about to host them.
+
+    The entry they were registered to has unloaded, and may be about to be
+    removed - which would take its registry entries, and the sensors' history,
+    with it. They are moved over explicitly rather than left to whatever the
+    registry does with a unique ID that turns up under another entry.
+    """
+    entity_registry = er.async_get(hass)
+    for description in FLEET_SENSORS:
+        entity_id = entity_registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, _fleet_unique_id(description)
+        )
+        if entity_id is None:
+            continue
+        registered = entity_registry.async_get(entity_id)
+        if registered is not None and registered.config_entry_id != entry_id:
+            entity_registry.async_update_entity(entity_id, config_entry_id=entry_id)
+
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, FLEET_DEVICE_ID)})
+    if device is not None and device.config_entries != {entry_id}:
+        # Added before the others are removed: a device left with no entry is deleted.
+        device_registry.async_update_device(device.id, add_config_entry_id=entry_id)
+        for other in device.config_entries - {entry_id}:
+            device_registry.async_update_device(device.id, remove_config_entry_id=other)
+
+
+class FlashForgeSensor(
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], SensorEntity
+):
     """Representation of a FlashForge sensor."""
 
     entity_description: FlashForgeSensorEntityDescription
@@ -511,3 +717,163 @@ class FlashForgeSensor(CoordinatorEntity[FlashForgeDataUpdateCoordinator], Senso
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success and self.coordinator.data is not None
+
+    def _state_snapshot(self) -> tuple[bool, Any]:
+        """Return what this sensor's written state is derived from."""
+        return (self.available, self.native_value)
+
+
+class FlashForgeRequestSensor(
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], SensorEntity
+):
+    """Latency or failures of the requests made to a printer.
+
+    Refreshed at the end of every poll - itself a request, so there is always
+    something new - and available even when the poll failed, which is when it
+    matters.
+    """
+
+    entity_description: FlashForgeRequestSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: FlashForgeDataUpdateCoordinator,
+        stats: RequestStats,
+        description: FlashForgeRequestSensorEntityDescription,
+        printer_name: str,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._stats = stats
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = build_device_info(coordinator, printer_name, entry_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True: the figures are this integration's own, not the printer's."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if self.entity_description.value_fn is None:
+            return None
+        return self.entity_description.value_fn(self._stats)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow every poll, not only those that changed the printer's data."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._handle_coordinator_update)
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the figures behind the state."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._stats)
+
+    def _state_snapshot(self) -> tuple[Any, dict[str, Any] | None]:
+        """Return what this sensor's written state is derived from."""
+        return (self.native_value, self.extra_state_attributes)
+
+
+class FlashForgePollSensor(
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], SensorEntity
+):
+    """How a printer's polls are going: their duration, failures and interval.
+
+    Read from the coordinator's own timing of each poll, so it costs no request,
+    and written at the end of every poll, good or bad.
+    """
+
+    entity_description: FlashForgePollSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: FlashForgeDataUpdateCoordinator,
+        description: FlashForgePollSensorEntityDescription,
+        printer_name: str,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = build_device_info(coordinator, printer_name, entry_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True: a printer that is not answering is what these describe."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if self.entity_description.value_fn is None:
+            return None
+        return self.entity_description.value_fn(self.coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow every poll, not only those that changed the printer's data."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._handle_coordinator_update)
+        )
+
+    def _state_snapshot(self) -> Any:
+        """Return what this sensor's written state is derived from."""
+        return self.native_value
+
+
+class FlashForgeFleetSensor(SensorEntity):
+    """A total across every printer, on the FlashForge fleet device.
+
+    Written when the fleet summary changes, and then only if this sensor's own
+    value moved: a printer starting a print wakes the active and idle counts,
+    not the filament total of a fleet that is still idle.
+    """
+
+    entity_description: FlashForgeFleetSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        summary: FleetSummary,
+        description: FlashForgeFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self._summary = summary
+        self.entity_description = description
+        self._attr_unique_id = _fleet_unique_id(description)
+        self._attr_device_info = build_fleet_device_info()
+        self._last_value: Any = None
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if self.entity_description.value_fn is None:
+            return None
+        return self.entity_description.value_fn(self._summary)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the fleet summary."""
+        await super().async_added_to_hass()
+        self._last_value = self.native_value
+        self.async_on_remove(
+            self._summary.async_add_listener(self._async_on_summary_update)
+        )
+
+    @callback
+    def _async_on_summary_update(self) -> None:
+        value = self.native_value
+        if value == self._last_value:
+            return
+        self._last_value = value
+        self.async_write_ha_state()
@@ -17,7 +17,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FlashForgeDataUpdateCoordinator
-from .util import build_device_info
+from .util import WriteOnChangeMixin, build_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -92,7 +92,9 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class FlashForgeSwitch(CoordinatorEntity[FlashForgeDataUpdateCoordinator], SwitchEntity):
+class FlashForgeSwitch(
+    WriteOnChangeMixin, CoordinatorEntity[FlashForgeDataUpdateCoordinator], SwitchEntity
+):
     """Representation of a FlashForge switch."""
 
     entity_description: FlashForgeSwitchEntityDescription
@@ -136,6 +138,10 @@ class FlashForgeSwitch(CoordinatorEntity[FlashForgeDataUpdateCoordinator], Switc
 
         return True
 
+    def _state_snapshot(self) -> tuple[bool, bool | None]:
+        """Return what this switch's written state is derived from."""
+        return (self.available, self.is_on)
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         if self.entity_description.turn_on_fn:
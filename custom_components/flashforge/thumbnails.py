@@ -0,0 +1,327 @@
+"""Persistent g-code thumbnail cache, shared by the job card and the image entity.
+
+A thumbnail is fetched from the printer's embedded HTTP server, which is slow,
+and it never changes for as long as the file it belongs to does not. Both
+readers used to keep their own copy in memory - the card's websocket command a
+small dict per entry, the thumbnail image entity a single file's bytes - so
+every restart and every reload sent the next card open back to the printer for
+all of them.
+
+One store now backs both, on disk:
+
+* **Blobs** live in ``.storage/flashforge_thumbnails/``, one file per thumbnail,
+  named by a hash of the entry and file name - printer file names are not safe
+  path components.
+* **The index** is an ordinary Home Assistant ``Store`` listing the blobs in
+  least-recently-used order, with each one's size and the metadata the printer
+  reported for its file when it was cached. It is saved on a delay, so a card
+  open that reads twenty thumbnails writes the index once.
+
+A file name is not an identity: re-slice and re-upload ``benchy.3mf`` and the
+printer reports the same name with a different print time and filament weight.
+:meth:`ThumbnailStore.async_reconcile` is handed every fresh file listing and
+drops the thumbnails whose file no longer matches what was cached.
+
+Next to each original the store keeps any *variants* asked for - the same
+thumbnail downscaled to a tile size and re-encoded by :func:`resize_thumbnail`.
+The card renders 56-76 px tiles from images slicers embed at several hundred
+pixels, so a variant is a fraction of the bytes on the websocket and in the
+browser. Variants live and die with their original.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+from io import BytesIO
+import logging
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, features
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_DATA_KEY = f"{DOMAIN}_thumbnail_store"
+_STORE_KEY = f"{DOMAIN}.thumbnails"
+_STORE_VERSION = 1
+_SAVE_DELAY = 30  # seconds
+_BLOB_DIR = f"{DOMAIN}_thumbnails"
+_BLOB_SUFFIX = ".thumb"
+
+# WebP keeps the alpha channel slicer thumbnails are drawn with, at a fraction
+# of PNG's size. Pillow is normally built with it; PNG is the fallback.
+_WEBP = features.check("webp")
+_VARIANT_QUALITY = 80
+
+# A thumbnail is typically 10-60 kB, so this holds several hundred - every
+# printer's ten most recent files many times over - while staying small enough
+# not to matter in a backup.
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+
+def file_fingerprint(file_entry: dict[str, Any]) -> str:
+    """Summarize what the printer reports about a file that changes with its contents.
+
+    Takes a :func:`job.file_to_dict` entry. Models that report file names only
+    fingerprint every file identically, which degrades to caching by name - the
+    best that can be done with what they say.
+    """
+    return f"{file_entry.get('printing_time')}|{file_entry.get('total_filament_weight')}"
+
+
+def _blob_name(entry_id: str, file_name: str, variant: str | None = None) -> str:
+    key = f"{entry_id}/{file_name}"
+    if variant is not None:
+        key = f"{key}#{variant}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def thumbnail_content_type(data: bytes) -> str:
+    """Return the MIME type of a thumbnail, from its leading bytes."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    return "image/png"
+
+
+def resize_thumbnail(data: bytes, size: int) -> bytes | None:
+    """Fit a thumbnail in a ``size`` px square and re-encode it. Blocking — call via executor.
+
+    Returns None when that would not make it any smaller - the image already
+    fits, or the re-encode came out larger - so the caller serves the original.
+    """
+    with Image.open(BytesIO(data)) as img:
+        if max(img.size) <= size:
+            return None
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        buf = BytesIO()
+        if _WEBP:
+            img.save(buf, format="WEBP", quality=_VARIANT_QUALITY)
+        else:
+            img.save(buf, format="PNG", optimize=True)
+    resized = buf.getvalue()
+    return resized if len(resized) < len(data) else None
+
+
+class ThumbnailStore:
+    """Disk-backed, size-capped LRU cache of thumbnails for every entry."""
+
+    def __init__(
+        self, hass: HomeAssistant, directory: Path, max_bytes: int = MAX_CACHE_BYTES
+    ) -> None:
+        self._hass = hass
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._store: Store[dict[str, Any]] = Store(hass, _STORE_VERSION, _STORE_KEY)
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        # Blob name -> record, least recently used first.
+        self._index: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._total_bytes = 0
+        # Fingerprints from the most recent listing, by blob name.
+        self._listed: dict[str, str] = {}
+        # Files the printer had no thumbnail for. Memory only: a fetch that
+        # failed for a transient reason must not be remembered past a restart.
+        self._missing: set[str] = set()
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the size of every cached thumbnail together."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    async def _async_ensure_loaded(self) -> None:
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                stored = await self._store.async_load() or {}
+            except Exception:  # noqa: BLE001 - a broken index only costs a re-fetch
+                _LOGGER.debug("Could not read the thumbnail index; starting empty")
+                stored = {}
+            records = [
+                (name, record)
+                for name, record in stored.get("blobs", [])
+                if isinstance(record, dict)
+            ]
+            present = await self._hass.async_add_executor_job(
+                self._prepare_directory, {name for name, _ in records}
+            )
+            for name, record in records:
+                if name in present:
+                    self._index[name] = record
+                    self._total_bytes += int(record.get("size", 0))
+            self._loaded = True
+
+    def _prepare_directory(self, indexed: set[str]) -> set[str]:
+        """Create the blob directory, delete unindexed blobs, return the rest.
+
+        Blobs outlive the index when Home Assistant stops between writing one
+        and the delayed index save; nothing would ever read or evict them.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        present: set[str] = set()
+        for path in self._directory.iterdir():
+            if path.suffix == _BLOB_SUFFIX and path.stem in indexed:
+                present.add(path.stem)
+            elif path.is_file():
+                path.unlink(missing_ok=True)
+        return present
+
+    def _path(self, name: str) -> Path:
+        return self._directory / f"{name}{_BLOB_SUFFIX}"
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"blobs": [[name, record] for name, record in self._index.items()]}
+
+    async def _async_drop(self, name: str) -> None:
+        record = self._index.pop(name, None)
+        if record is None:
+            return
+        self._total_bytes -= int(record.get("size", 0))
+        await self._hass.async_add_executor_job(self._path(name).unlink, True)
+        if record.get("source", name) == name:
+            # An original: its variants go with it, whatever dropped it.
+            for variant in [
+                other for other, kept in self._index.items() if kept.get("source") == name
+            ]:
+                await self._async_drop(variant)
+        self._schedule_save()
+
+    def is_missing(self, entry_id: str, file_name: str) -> bool:
+        """Return True when the printer already said this file has no thumbnail."""
+        return _blob_name(entry_id, file_name) in self._missing
+
+    async def async_get(
+        self, entry_id: str, file_name: str, variant: str | None = None
+    ) -> bytes | None:
+        """Return the cached thumbnail, or None on a miss."""
+        await self._async_ensure_loaded()
+        name = _blob_name(entry_id, file_name, variant)
+        if name not in self._index:
+            return None
+        try:
+            data = await self._hass.async_add_executor_job(self._path(name).read_bytes)
+        except OSError as err:
+            _LOGGER.debug("Cached thumbnail for %s is unreadable: %s", file_name, err)
+            await self._async_drop(name)
+            return None
+        self._index.move_to_end(name)
+        self._schedule_save()
+        return data
+
+    async def async_set(
+        self,
+        entry_id: str,
+        file_name: str,
+        data: bytes | None,
+        variant: str | None = None,
+    ) -> None:
+        """Cache a thumbnail fetched from the printer; None records that it has none.
+
+        With ``variant``, caches a derived copy of an original instead.
+        """
+        await self._async_ensure_loaded()
+        source = _blob_name(entry_id, file_name)
+        name = _blob_name(entry_id, file_name, variant)
+        if not data:
+            if variant is None:
+                self._missing.add(name)
+            return
+        self._missing.discard(source)
+
+        try:
+            await self._hass.async_add_executor_job(self._path(name).write_bytes, data)
+        except OSError as err:
+            _LOGGER.warning("Could not cache the thumbnail for %s: %s", file_name, err)
+            return
+
+        previous = self._index.pop(name, None)
+        if previous is not None:
+            self._total_bytes -= int(previous.get("size", 0))
+        self._index[name] = {
+            "entry_id": entry_id,
+            "source": source,
+            "size": len(data),
+            "fingerprint": self._listed.get(source),
+        }
+        self._total_bytes += len(data)
+
+        # Never what was just written, nor - for a variant - its own original.
+        while self._total_bytes > self._max_bytes:
+            victim = next(
+                (other for other in self._index if other not in (name, source)), None
+            )
+            if victim is None:
+                break
+            await self._async_drop(victim)
+        self._schedule_save()
+
+    async def async_reconcile(
+        self, entry_id: str, files: list[dict[str, Any]]
+    ) -> None:
+        """Forget thumbnails whose file changed since they were cached.
+
+        A thumbnail cached before its file was ever listed - by the image entity,
+        when the listing could not be read - has no fingerprint yet and adopts
+        this one.
+        """
+        await self._async_ensure_loaded()
+        for file_entry in files:
+            source = _blob_name(entry_id, file_entry["file_name"])
+            fingerprint = file_fingerprint(file_entry)
+            if self._listed.get(source, fingerprint) != fingerprint:
+                self._missing.discard(source)
+            self._listed[source] = fingerprint
+
+            cached = [
+                (name, record)
+                for name, record in self._index.items()
+                if record.get("source", name) == source
+            ]
+            for name, record in cached:
+                if record.get("fingerprint") is None:
+                    record["fingerprint"] = fingerprint
+                    self._schedule_save()
+                elif record["fingerprint"] != fingerprint:
+                    _LOGGER.debug(
+                        "%s changed on the printer; dropping its cached thumbnail",
+                        file_entry["file_name"],
+                    )
+                    await self._async_drop(name)
+
+    async def async_remove_entry(self, entry_id: str) -> None:
+        """Delete every thumbnail cached for a config entry that is going away."""
+        await self._async_ensure_loaded()
+        for name in [
+            name for name, record in self._index.items()
+            if record.get("entry_id") == entry_id
+        ]:
+            await self._async_drop(name)
+
+
+@callback
+def async_get_thumbnail_store(hass: HomeAssistant) -> ThumbnailStore:
+    """Return the store shared by every entry, creating it on first use."""
+    store: ThumbnailStore | None = hass.data.get(_DATA_KEY)
+    if store is None:
+        store = hass.data[_DATA_KEY] = ThumbnailStore(
+            hass, Path(hass.config.path(STORAGE_DIR, _BLOB_DIR))
+        )
+    return store
@@ -0,0 +1,370 @@
+"""Per-print timelapse, recorded from the shared camera feed.
+
+A recorder follows the coordinator. When the printer starts printing it opens a
+session - a directory of numbered JPEGs under the media folder - and adds a
+frame on every layer change, or every N seconds, until the print ends. A
+completed or cancelled print is then assembled into an MJPEG AVI next to the
+frames, or left as the image sequence, depending on the entry's options.
+
+Frames come from the entry's :class:`CameraFeed`. The recorder stays subscribed
+for the whole print, so the whole timelapse costs the printer one camera
+connection - the same one any live viewer is already using - instead of one per
+frame. Every file write and the assembly itself run in the executor.
+
+A session interrupted by a restart keeps the frames it wrote; the print is
+picked up as a new session when Home Assistant comes back.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+from io import BytesIO
+import logging
+from pathlib import Path
+import re
+import shutil
+import struct
+from typing import TYPE_CHECKING, Any
+
+from flashforge.models import MachineState
+from PIL import Image
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .camera_feed import CameraFeed
+    from .coordinator import FlashForgeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMELAPSE_OFF = "off"
+TIMELAPSE_LAYER = "layer"
+TIMELAPSE_INTERVAL = "interval"
+TIMELAPSE_MODES = [TIMELAPSE_OFF, TIMELAPSE_LAYER, TIMELAPSE_INTERVAL]
+
+FORMAT_VIDEO = "video"
+FORMAT_IMAGES = "images"
+TIMELAPSE_FORMATS = [FORMAT_VIDEO, FORMAT_IMAGES]
+
+_MEDIA_DIR = f"{DOMAIN}_timelapse"
+
+# States a print passes through between starting and ending. A session opens
+# on PRINTING; it only ends when the state leaves this set.
+_PRINT_STATES = frozenset(
+    {
+        MachineState.PRINTING,
+        MachineState.PAUSING,
+        MachineState.PAUSED,
+        MachineState.HEATING,
+        MachineState.BUSY,
+        MachineState.CALIBRATING,
+    }
+)
+# Prints whose timelapse is worth assembling. An errored print keeps its
+# frames, for whoever wants to see what went wrong, but is not assembled.
+_ASSEMBLE_STATES = frozenset({MachineState.COMPLETED, MachineState.CANCELLED})
+
+# Playback rate of assembled videos.
+VIDEO_FPS = 24
+
+# Seconds a capture waits for the camera before skipping the frame.
+_CAPTURE_TIMEOUT = 10
+
+# A buffered frame younger than this is as good as a fresh one.
+_FRESH_FRAME_AGE = 1.0
+
+
+class TimelapseSession:
+    """The frames of one print, on disk."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.frames = 0
+
+    def frame_path(self, index: int) -> Path:
+        return self.directory / f"frame_{index:05d}.jpg"
+
+
+class TimelapseRecorder:
+    """Record a timelapse of every print on one printer."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: FlashForgeDataUpdateCoordinator,
+        feed: CameraFeed,
+        directory: Path,
+        *,
+        mode: str,
+        interval: int,
+        output_format: str,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._feed = feed
+        self._directory = directory
+        self._mode = mode
+        self._interval = interval
+        self._format = output_format
+        self._session: TimelapseSession | None = None
+        self._queue: asyncio.Queue[bytes] | None = None
+        self._last_layer: int | None = None
+        self._capture: asyncio.Task[None] | None = None
+        self._ticker: asyncio.Task[None] | None = None
+        self._remove_listener: Callable[[], None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def recording(self) -> bool:
+        """Return True while a print is being recorded."""
+        return self._session is not None
+
+    @property
+    def frames(self) -> int:
+        """Return how many frames the current session has."""
+        return self._session.frames if self._session is not None else 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the printer; a print already running is picked up."""
+        self._remove_listener = self._coordinator.async_add_listener(
+            self._async_on_update
+        )
+        self._async_on_update()
+
+    async def async_stop(self) -> None:
+        """Stop following the printer, keeping whatever was recorded on disk."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        self._async_close_session()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @callback
+    def _async_on_update(self) -> None:
+        data = self._coordinator.data
+        if data is None:
+            return
+        state = getattr(data, "machine_state", None)
+
+        if self._session is None:
+            if state is MachineState.PRINTING:
+                self._async_open_session(data)
+            return
+
+        if state not in _PRINT_STATES:
+            capture = self._capture
+            session = self._async_close_session()
+            if session is not None and state in _ASSEMBLE_STATES:
+                self._async_spawn(self._async_finish(session, capture), "assemble")
+            return
+
+        if self._mode == TIMELAPSE_LAYER:
+            layer = getattr(data, "current_print_layer", None)
+            if layer is not None and layer != self._last_layer:
+                self._last_layer = layer
+                self._async_capture()
+
+    @callback
+    def _async_open_session(self, data: Any) -> None:
+        file_name = getattr(data, "print_file_name", None) or "print"
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        stem = re.sub(r"[^\w.-]+", "_", Path(file_name).stem) or "print"
+        self._session = TimelapseSession(self._directory / f"{stamp}_{stem}")
+        # The opening frame stands for the layer the print is on.
+        self._last_layer = getattr(data, "current_print_layer", None)
+        self._queue = self._feed.subscribe()
+        _LOGGER.debug("Recording a timelapse of %s", file_name)
+        if self._mode == TIMELAPSE_INTERVAL:
+            self._ticker = self._async_spawn(self._async_tick(), "interval")
+        else:
+            self._async_capture()
+
+    @callback
+    def _async_close_session(self) -> TimelapseSession | None:
+        session, self._session = self._session, None
+        if self._queue is not None:
+            self._feed.unsubscribe(self._queue)
+            self._queue = None
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        return session
+
+    @callback
+    def _async_spawn(
+        self, coro: Coroutine[Any, Any, None], name: str
+    ) -> asyncio.Task[None]:
+        task = self._hass.async_create_background_task(coro, f"{DOMAIN} timelapse {name}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _async_tick(self) -> None:
+        while True:
+            self._async_capture()
+            await asyncio.sleep(self._interval)
+
+    @callback
+    def _async_capture(self) -> None:
+        # A capture still waiting on the camera already covers this one.
+        if self._session is None or (self._capture and not self._capture.done()):
+            return
+        self._capture = self._async_spawn(
+            self._async_capture_frame(self._session), "capture"
+        )
+
+    async def _async_capture_frame(self, session: TimelapseSession) -> None:
+        frame = await self._async_next_frame()
+        if frame is None or self._session is not session:
+            return
+        session.frames += 1
+        path = session.frame_path(session.frames)
+        try:
+            await self._hass.async_add_executor_job(_write_frame, path, frame)
+        except OSError as err:
+            session.frames -= 1
+            _LOGGER.warning("Could not save a timelapse frame: %s", err)
+
+    async def _async_next_frame(self) -> bytes | None:
+        if self._feed.frame_age() <= _FRESH_FRAME_AGE:
+            return self._feed.last_frame
+        queue = self._queue
+        if queue is None:
+            return None
+        try:
+            async with asyncio.timeout(_CAPTURE_TIMEOUT):
+                return await queue.get()
+        except TimeoutError:
+            _LOGGER.debug("The camera sent no frame; skipping this timelapse frame")
+            return None
+
+    async def _async_finish(
+        self, session: TimelapseSession, capture: asyncio.Task[None] | None
+    ) -> None:
+        # The last frame may still be on its way to disk.
+        if capture is not None:
+            await asyncio.wait([capture])
+        if session.frames == 0 or self._format != FORMAT_VIDEO:
+            return
+        try:
+            video = await self._hass.async_add_executor_job(assemble_video, session.directory)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning(
+                "Could not assemble the timelapse in %s: %s", session.directory, err
+            )
+            return
+        _LOGGER.debug("Timelapse saved to %s", video)
+
+
+def _write_frame(path: Path, frame: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(frame)
+
+
+def assemble_video(directory: Path, fps: int = VIDEO_FPS) -> Path:
+    """Pack a session's frames into an MJPEG AVI beside it, then delete them. Blocking.
+
+    AVI is the one container that takes JPEG frames as they are - no re-encode,
+    no codec to install - and every player and browser-side converter reads it.
+    The frames are streamed from disk one at a time.
+    """
+    frames = sorted(directory.glob("frame_*.jpg"))
+    if not frames:
+        raise ValueError("no frames recorded")
+    with Image.open(frames[0]) as first:
+        width, height = first.size
+    sizes = [path.stat().st_size for path in frames]
+
+    video = directory.with_suffix(".avi")
+    partial = video.with_suffix(".avi.part")
+    with partial.open("wb") as out:
+        _write_avi(out, frames, sizes, width, height, fps)
+    partial.replace(video)
+    shutil.rmtree(directory)
+    return video
+
+
+def _write_avi(
+    out, frames: list[Path], sizes: list[int], width: int, height: int, fps: int
+) -> None:
+    count = len(frames)
+    padded = [size + (size & 1) for size in sizes]
+    movi_size = 4 + sum(8 + size for size in padded)
+    idx1_size = 16 * count
+
+    avih = struct.pack(
+        "<IIIIIIIIII16x",
+        1_000_000 // fps,  # microseconds per frame
+        max(sizes) * fps,  # max bytes per second
+        0,
+        0x10,  # AVIF_HASINDEX
+        count,
+        0,
+        1,  # streams
+        max(sizes),
+        width,
+        height,
+    )
+    strh = struct.pack(
+        "<4s4sIHHIIIIIIiI4h",
+        b"vids",
+        b"MJPG",
+        0,
+        0,
+        0,
+        0,
+        1,  # scale
+        fps,  # rate
+        0,
+        count,
+        max(sizes),
+        -1,  # quality: default
+        0,
+        0,
+        0,
+        width,
+        height,
+    )
+    strf = struct.pack(
+        "<IiiHH4sIiiII", 40, width, height, 1, 24, b"MJPG", width * height * 3, 0, 0, 0, 0
+    )
+    strl = _list(b"strl", _chunk(b"strh", strh) + _chunk(b"strf", strf))
+    hdrl = _list(b"hdrl", _chunk(b"avih", avih) + strl)
+
+    riff_size = 4 + len(hdrl) + 8 + movi_size + 8 + idx1_size
+    out.write(b"RIFF" + struct.pack("<I", riff_size) + b"AVI ")
+    out.write(hdrl)
+    out.write(b"LIST" + struct.pack("<I", movi_size) + b"movi")
+
+    index = BytesIO()
+    offset = 4  # from the "movi" fourcc
+    for path, size, padded_size in zip(frames, sizes, padded):
+        out.write(b"00dc" + struct.pack("<I", size))
+        out.write(path.read_bytes())
+        if padded_size != size:
+            out.write(b"\0")
+        index.write(b"00dc" + struct.pack("<III", 0x10, offset, size))  # keyframe
+        offset += 8 + padded_size
+
+    out.write(b"idx1" + struct.pack("<I", idx1_size) + index.getvalue())
+
+
+def _chunk(fourcc: bytes, data: bytes) -> bytes:
+    return fourcc + struct.pack("<I", len(data)) + data
+
+
+def _list(kind: bytes, data: bytes) -> bytes:
+    return b"LIST" + struct.pack("<I", 4 + len(data)) + kind + data
+
+
+def timelapse_directory(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return where an entry's timelapses go: the local media folder."""
+    media_dirs = getattr(hass.config, "media_dirs", None) or {}
+    root = media_dirs.get("local") or hass.config.path("media")
+    return Path(root) / _MEDIA_DIR / entry_id
@@ -1,11 +1,18 @@
 """Utility helpers for the FlashForge integration."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+from datetime import datetime
+import math
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from flashforge.models import MachineState
 
-from .const import DOMAIN, MANUFACTURER
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, FLEET_DEVICE_ID, MANUFACTURER
 
 if TYPE_CHECKING:
     from flashforge import FlashForgeClient
@@ -35,6 +42,49 @@ def build_device_info(
     )
 
 
+def build_fleet_device_info() -> DeviceInfo:
+    """Return the DeviceInfo of the virtual device summarizing every printer."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, FLEET_DEVICE_ID)},
+        name="FlashForge fleet",
+        manufacturer=MANUFACTURER,
+        model="Fleet",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+class WriteOnChangeMixin(ABC):
+    """Skip a coordinator-driven state write when the entity would look the same.
+
+    The coordinator already stays quiet when a poll returns exactly what the
+    last one did, but a printing machine changes *something* every poll - the
+    nozzle temperature wobbles, the elapsed time ticks - and every entity on the
+    device used to rewrite its state for it. Each entity instead compares the
+    state it would write, as returned by ``_state_snapshot``, with the one it
+    last wrote. The ``value_fn`` already is the declaration of what an entity
+    depends on, so comparing its output cannot drift out of step with it the way
+    a hand-kept list of fields would.
+
+    List this before ``CoordinatorEntity`` in the bases.
+    """
+
+    _last_snapshot: Any = None
+    _has_snapshot: bool = False
+
+    @abstractmethod
+    def _state_snapshot(self) -> Any:
+        """Return everything this entity's written state is derived from."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        snapshot = self._state_snapshot()
+        if self._has_snapshot and snapshot == self._last_snapshot:
+            return
+        self._last_snapshot = snapshot
+        self._has_snapshot = True
+        super()._handle_coordinator_update()  # type: ignore[misc]
+
+
 def is_creator5_series(data: FFMachineInfo) -> bool:
     """Creator 5 / Creator 5 Pro (the 4-tool tool-changer family).
 
@@ -47,3 +97,42 @@ def is_creator5_series(data: FFMachineInfo) -> bool:
     return bool(
         getattr(data, "is_creator5", False) or getattr(data, "is_creator5_pro", False)
     )
+
+
+def print_completion_time(data: FFMachineInfo) -> datetime | None:
+    """Return the absolute completion timestamp, rounded to the minute.
+
+    HA 2026 rejects naive datetimes on timestamp sensors, so if the library's
+    ``completion_time`` is timezone-naive we stamp it with HA's configured
+    default timezone. Aware datetimes pass through unchanged.
+
+    Timezone-stamping approach adapted from pcamp96 (GhostTypes/ff-5mp-hass#15).
+
+    PRINTING is the only allowed state. The firmware freezes ``estimatedTime``
+    whenever the print is not advancing, so the library's ``completion_time``
+    (``now() + estimatedTime``, recomputed every poll) would step forward one
+    minute per minute and a paused print would appear to recede forever.
+    HEATING is excluded for the same reason as PAUSED/PAUSING - the pre-print
+    warmup does not advance the job either, it just drifts for minutes rather
+    than hours. The ``remaining_time`` sensor is unaffected: the duration stays
+    correct, only its conversion to an absolute timestamp does not.
+    ``flashforge-python-api`` >= 1.4.0 already returns ``None`` here; the state
+    check is kept so the sensor is correct against older libraries too.
+    """
+    if not data.estimated_time:
+        return None
+    if data.machine_state is not MachineState.PRINTING:
+        return None
+    ts = data.completion_time
+    if ts is None:
+        return None
+    ts = ts.replace(second=0, microsecond=0)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return ts
+
+
+def percentile(ordered: list[float], percent: float) -> float:
+    """Return a percentile of a sorted, non-empty list, by the nearest-rank method."""
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
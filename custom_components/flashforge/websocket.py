@@ -1,13 +1,15 @@
 """WebSocket API backing the FlashForge job card.
 
 The card is a plain custom element with no state of its own; everything it shows
-comes from these four commands, and every action it takes goes back through them.
+comes from these commands, and every action it takes goes back through them.
 Commands rather than entities because a file list is a *request*, not a state: it
 is only interesting while the card is open, it carries per-file metadata far too
 large for entity attributes, and thumbnails are not expressible as state at all.
 
     flashforge/files/list      list the files on the printer, plus the slots
-    flashforge/file/thumbnail  one file's thumbnail, base64 PNG
+    flashforge/files/subscribe the same, then only what changes
+    flashforge/file/thumbnail  one file's thumbnail, base64, optionally downscaled
+    flashforge/file/thumbnails many files' thumbnails, streamed as they resolve
     flashforge/job/prepare     what starting this file would involve
     flashforge/job/start       start it
 
@@ -18,6 +20,7 @@ taken on trust.
 """
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
 from typing import Any
@@ -30,15 +33,21 @@ from homeassistant.exceptions import HomeAssistantError
 
 from .const import DOMAIN
 from .coordinator import FlashForgeDataUpdateCoordinator
+from .file_list import FILE_LIST_TTL, START_MAX_AGE, FileListCache
 from .job import (
     async_start_local_print,
     auto_match,
     color_warnings,
-    file_to_dict,
     requires_material_matching,
     slots_to_list,
     validate_mappings,
 )
+from .thumbnails import (
+    ThumbnailStore,
+    async_get_thumbnail_store,
+    resize_thumbnail,
+    thumbnail_content_type,
+)
 from .util import is_creator5_series
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,10 +58,16 @@ ERR_ENTRY_NOT_FOUND = "entry_not_found"
 ERR_FILE_NOT_FOUND = "file_not_found"
 ERR_PRINTER = "printer_error"
 
-# Thumbnails are fetched per file and never change for a given name, so they are
-# worth keeping - but a printer can hold many files and the payloads are images.
-# Cap the cache and evict oldest-first; the cost of a miss is one HTTP request.
-_THUMBNAIL_CACHE_SIZE = 24
+# Thumbnails the batch command fetches from the printer at once. Its web server
+# also has to keep answering the status poll, and a card opening on ten uncached
+# files should not queue ten requests ahead of it.
+_THUMBNAIL_FETCH_CONCURRENCY = 2
+# The printer lists ten files; anything far past that is not the card asking.
+_MAX_THUMBNAIL_BATCH = 50
+
+# Requested thumbnail sizes, in pixels. Bounded so a client cannot make the
+# server cache a variant per integer.
+THUMBNAIL_SIZE = vol.All(int, vol.Range(min=32, max=512))
 
 MATERIAL_MAPPING_SCHEMA = vol.Schema(
     {
@@ -75,7 +90,9 @@ def async_register_websocket_commands(hass: HomeAssistant) -> None:
 
     websocket_api.async_register_command(hass, ws_list_entries)
     websocket_api.async_register_command(hass, ws_list_files)
+    websocket_api.async_register_command(hass, ws_subscribe_files)
     websocket_api.async_register_command(hass, ws_file_thumbnail)
+    websocket_api.async_register_command(hass, ws_file_thumbnails)
     websocket_api.async_register_command(hass, ws_prepare_job)
     websocket_api.async_register_command(hass, ws_start_job)
 
@@ -85,17 +102,12 @@ def _entry_data(hass: HomeAssistant, entry_id: str) -> dict[str, Any] | None:
     return hass.data.get(DOMAIN, {}).get(entry_id)
 
 
-async def _async_fetch_files(data: dict[str, Any]) -> list[dict[str, Any]]:
-    """Fetch and normalize the printer's file list.
-
-    Every supported model answers ``/gcodeList`` with its ten most recent files;
-    the full local listing exists only over the legacy TCP channel this
-    integration deliberately does not speak. The AD5X and Creator 5 series
-    include per-tool material data here, which is what makes matching possible.
-    """
-    client = data["client"]
-    entries = await client.files.get_recent_file_list()
-    return [file_to_dict(entry) for entry in entries or []]
+async def _async_fetch_files(
+    data: dict[str, Any], max_age: float = FILE_LIST_TTL
+) -> list[dict[str, Any]]:
+    """Return the printer's file list, from the entry's short-lived cache if fresh."""
+    file_list: FileListCache = data["file_list"]
+    return await file_list.async_get(max_age)
 
 
 @websocket_api.websocket_command({vol.Required("type"): "flashforge/entries"})
@@ -118,6 +130,9 @@ def ws_list_entries(
     {
         vol.Required("type"): "flashforge/files/list",
         vol.Required("entry_id"): str,
+        # The card's refresh button: the user expects to see a file they have
+        # just uploaded, not the listing from a few seconds ago.
+        vol.Optional("refresh", default=False): bool,
     }
 )
 @websocket_api.async_response
@@ -134,44 +149,176 @@ async def ws_list_files(
         )
         return
 
+    try:
+        max_age = 0 if msg["refresh"] else FILE_LIST_TTL
+        files = await _async_fetch_files(data, max_age)
+    except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
+        _LOGGER.warning("Could not list files on %s: %s", data["name"], err)
+        connection.send_error(
+            msg["id"], ERR_PRINTER, f"Could not read the printer's file list: {err}"
+        )
+        return
+
+    # The listing is the one place the printer says whether a file changed under
+    # the same name; the thumbnails about to be requested must not predate it.
+    await async_get_thumbnail_store(hass).async_reconcile(msg["entry_id"], files)
+
+    connection.send_result(msg["id"], _files_payload(data, files))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "flashforge/files/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("refresh", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_subscribe_files(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send what ``files/list`` returns, then keep it current.
+
+    The first event is the full payload. Every event after it carries only the
+    keys that changed - ``slots``, ``has_material_station``, ``machine_state``
+    or ``files`` - so the card merges it over what it has.
+
+    Slots and machine state come from the coordinator's own poll, so following
+    them costs the printer nothing. The file list is not in ``/detail``; it is
+    re-read only when the poll shows a sign of it having changed - the free disk
+    space moving, or a different file printing - not on every update.
+    """
+    data = _entry_data(hass, msg["entry_id"])
+    if data is None:
+        connection.send_error(
+            msg["id"], ERR_ENTRY_NOT_FOUND, "That FlashForge printer is not set up."
+        )
+        return
+
+    entry_id: str = msg["entry_id"]
     coordinator: FlashForgeDataUpdateCoordinator = data["coordinator"]
+    store = async_get_thumbnail_store(hass)
 
     try:
-        files = await _async_fetch_files(data)
+        max_age = 0 if msg["refresh"] else FILE_LIST_TTL
+        files = await _async_fetch_files(data, max_age)
     except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
         _LOGGER.warning("Could not list files on %s: %s", data["name"], err)
         connection.send_error(
             msg["id"], ERR_PRINTER, f"Could not read the printer's file list: {err}"
         )
         return
+    await store.async_reconcile(entry_id, files)
+
+    # What the card was last sent, key by key.
+    sent = _files_payload(data, files)
+    files_signal = _files_signal(coordinator.data)
+    files_stale = False
+    refresh_task: asyncio.Task[None] | None = None
+
+    @callback
+    def _send(event: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    async def _async_refresh_files() -> None:
+        nonlocal files_stale
+        # Loops for a change that lands while a fetch is already in flight: that
+        # fetch may have been answered before the printer saw it.
+        while files_stale:
+            files_stale = False
+            try:
+                listed = await _async_fetch_files(data, 0)
+            except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
+                # The card keeps the list it has; the next change tries again.
+                _LOGGER.debug("Could not re-list files on %s: %s", data["name"], err)
+                return
+            await store.async_reconcile(entry_id, listed)
+            if listed != sent["files"]:
+                sent["files"] = listed
+                _send({"files": listed})
+
+    @callback
+    def _async_on_update() -> None:
+        nonlocal files_signal, files_stale, refresh_task
+        changed = {
+            key: value
+            for key, value in _live_state(coordinator.data).items()
+            if value != sent[key]
+        }
+        if changed:
+            sent.update(changed)
+            _send(changed)
+
+        signal = _files_signal(coordinator.data)
+        if signal != files_signal:
+            files_signal = signal
+            files_stale = True
+            if refresh_task is None or refresh_task.done():
+                refresh_task = hass.async_create_background_task(
+                    _async_refresh_files(), f"{DOMAIN} file list for {entry_id}"
+                )
+
+    remove_listener = coordinator.async_add_listener(_async_on_update)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        remove_listener()
+        if refresh_task is not None:
+            refresh_task.cancel()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    _send(sent)
+
+
+def _live_state(machine_info: Any) -> dict[str, Any]:
+    """Return the parts of the card's payload that come from the status poll."""
+    slots = slots_to_list(machine_info)
+    machine_state = getattr(machine_info, "machine_state", None)
+    return {
+        "slots": slots,
+        "has_material_station": bool(slots),
+        # Advisory only - the printer is the one that refuses a print while
+        # it is busy, and it is better at knowing than we are.
+        "machine_state": getattr(machine_state, "value", None),
+    }
 
-    slots = slots_to_list(coordinator.data)
-    machine_state = getattr(coordinator.data, "machine_state", None)
 
-    connection.send_result(
-        msg["id"],
-        {
-            "printer_name": data["name"],
-            "model": coordinator.device_model,
-            "files": files,
-            "slots": slots,
-            "has_material_station": bool(slots),
-            # The Creator 5 series cannot start a previously-uploaded local job
-            # over the HTTP API (only a fresh 3mf upload+start works), so the
-            # card shows an info message in place of the file list / Start button.
-            "is_creator5_series": is_creator5_series(coordinator.data),
-            # Advisory only - the printer is the one that refuses a print while
-            # it is busy, and it is better at knowing than we are.
-            "machine_state": getattr(machine_state, "value", None),
-        },
+def _files_signal(machine_info: Any) -> tuple[Any, Any]:
+    """Return what the status poll says that moves when the file list does.
+
+    An upload takes disk space and a deletion frees it; a slicer's upload-and-
+    print also changes the printing file's name.
+    """
+    return (
+        getattr(machine_info, "free_disk_space", None),
+        getattr(machine_info, "print_file_name", None),
     )
 
 
+def _files_payload(data: dict[str, Any], files: list[dict[str, Any]]) -> dict[str, Any]:
+    """Build the card's full view of one printer."""
+    coordinator: FlashForgeDataUpdateCoordinator = data["coordinator"]
+    return {
+        "printer_name": data["name"],
+        "model": coordinator.device_model,
+        "files": files,
+        # The Creator 5 series cannot start a previously-uploaded local job
+        # over the HTTP API (only a fresh 3mf upload+start works), so the
+        # card shows an info message in place of the file list / Start button.
+        "is_creator5_series": is_creator5_series(coordinator.data),
+        **_live_state(coordinator.data),
+    }
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "flashforge/file/thumbnail",
         vol.Required("entry_id"): str,
         vol.Required("file_name"): str,
+        vol.Optional("size"): THUMBNAIL_SIZE,
     }
 )
 @websocket_api.async_response
@@ -180,7 +327,12 @@ async def ws_file_thumbnail(
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Return one file's thumbnail as a base64 PNG, or null if it has none."""
+    """Return one file's thumbnail as base64, or null if it has none.
+
+    Without ``size`` this is the printer's own PNG. With it, the image is
+    downscaled to fit that many pixels square and re-encoded; ``content_type``
+    says what came back.
+    """
     data = _entry_data(hass, msg["entry_id"])
     if data is None:
         connection.send_error(
@@ -188,28 +340,182 @@ async def ws_file_thumbnail(
         )
         return
 
+    entry_id: str = msg["entry_id"]
     file_name: str = msg["file_name"]
-    cache: dict[str, str | None] = data.setdefault("thumbnail_cache", {})
+    size: int | None = msg.get("size")
+    store = async_get_thumbnail_store(hass)
 
-    if file_name in cache:
-        connection.send_result(msg["id"], {"image": cache[file_name]})
+    if store.is_missing(entry_id, file_name):
+        connection.send_result(msg["id"], _thumbnail_payload(None))
         return
 
+    raw = await _async_cached_thumbnail(hass, store, entry_id, file_name, size)
+    if raw is None:
+        raw = await _async_fetch_thumbnail(
+            hass, store, data["client"], entry_id, file_name, size
+        )
+
+    connection.send_result(msg["id"], _thumbnail_payload(raw))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "flashforge/file/thumbnails",
+        vol.Required("entry_id"): str,
+        vol.Required("file_names"): vol.All([str], vol.Length(max=_MAX_THUMBNAIL_BATCH)),
+        vol.Optional("size"): THUMBNAIL_SIZE,
+    }
+)
+@websocket_api.async_response
+async def ws_file_thumbnails(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream several files' thumbnails back as each one resolves.
+
+    A subscription, not a single result: every thumbnail is sent as an event the
+    moment it is known - cached ones first, then the printer's answers as they
+    arrive - and a final ``{"done": true}`` event closes the batch. The card
+    fills its grid tile by tile instead of waiting on the slowest file.
+    ``size`` works as it does for a single thumbnail.
+    """
+    data = _entry_data(hass, msg["entry_id"])
+    if data is None:
+        connection.send_error(
+            msg["id"], ERR_ENTRY_NOT_FOUND, "That FlashForge printer is not set up."
+        )
+        return
+
+    entry_id: str = msg["entry_id"]
+    file_names = list(dict.fromkeys(msg["file_names"]))
+    size: int | None = msg.get("size")
+    store = async_get_thumbnail_store(hass)
+    client = data["client"]
+
+    @callback
+    def _send(file_name: str, raw: bytes | None) -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"file_name": file_name, **_thumbnail_payload(raw)}
+            )
+        )
+
+    async def _async_stream() -> None:
+        uncached: list[str] = []
+        for file_name in file_names:
+            if store.is_missing(entry_id, file_name):
+                _send(file_name, None)
+                continue
+            raw = await _async_cached_thumbnail(hass, store, entry_id, file_name, size)
+            if raw is None:
+                uncached.append(file_name)
+            else:
+                _send(file_name, raw)
+
+        semaphore = asyncio.Semaphore(_THUMBNAIL_FETCH_CONCURRENCY)
+
+        async def _async_fetch_one(file_name: str) -> None:
+            async with semaphore:
+                raw = await _async_fetch_thumbnail(
+                    hass, store, client, entry_id, file_name, size
+                )
+            _send(file_name, raw)
+
+        await asyncio.gather(*(_async_fetch_one(name) for name in uncached))
+        connection.send_message(websocket_api.event_message(msg["id"], {"done": True}))
+
+    # The result goes first: a task started eagerly could otherwise send its
+    # events - even "done" - before the command has been answered.
+    connection.send_result(msg["id"])
+    task = hass.async_create_background_task(
+        _async_stream(), f"{DOMAIN} thumbnails for {entry_id}"
+    )
+    # Closing the card, or the browser tab, unsubscribes - and stops asking the
+    # printer for thumbnails nobody is going to see.
+    connection.subscriptions[msg["id"]] = task.cancel
+
+
+async def _async_cached_thumbnail(
+    hass: HomeAssistant,
+    store: ThumbnailStore,
+    entry_id: str,
+    file_name: str,
+    size: int | None,
+) -> bytes | None:
+    """Return a thumbnail from the cache alone, or None when the printer is needed.
+
+    A size with no cached variant is still a hit when the original is cached:
+    the variant is made from it without asking the printer again.
+    """
+    if size is not None:
+        variant = await store.async_get(entry_id, file_name, _variant(size))
+        if variant is not None:
+            return variant
+    original = await store.async_get(entry_id, file_name)
+    if original is None or size is None:
+        return original
+    return await _async_resized(hass, store, entry_id, file_name, original, size)
+
+
+async def _async_fetch_thumbnail(
+    hass: HomeAssistant,
+    store: ThumbnailStore,
+    client: Any,
+    entry_id: str,
+    file_name: str,
+    size: int | None,
+) -> bytes | None:
+    """Ask the printer for one thumbnail and cache the answer, even "none"."""
     try:
-        raw = await data["client"].files.get_gcode_thumbnail(file_name)
+        raw = await client.files.get_gcode_thumbnail(file_name)
     except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
         # A missing thumbnail is not a failure worth showing the user; the card
         # falls back to a placeholder tile.
         _LOGGER.debug("No thumbnail for %s: %s", file_name, err)
         raw = None
+    await store.async_set(entry_id, file_name, raw)
+    if raw and size is not None:
+        return await _async_resized(hass, store, entry_id, file_name, raw, size)
+    return raw
 
-    image = base64.b64encode(raw).decode("ascii") if raw else None
-
-    if len(cache) >= _THUMBNAIL_CACHE_SIZE:
-        cache.pop(next(iter(cache)))
-    cache[file_name] = image
 
-    connection.send_result(msg["id"], {"image": image})
+async def _async_resized(
+    hass: HomeAssistant,
+    store: ThumbnailStore,
+    entry_id: str,
+    file_name: str,
+    original: bytes,
+    size: int,
+) -> bytes:
+    """Return the ``size`` variant of a thumbnail, caching it; the original if none.
+
+    "None" is cached too, as a copy of the original: slicers often embed
+    thumbnails that already fit a tile, and each card open would otherwise
+    decode the original again to learn the same thing.
+    """
+    try:
+        resized = await hass.async_add_executor_job(resize_thumbnail, original, size)
+    except Exception as err:  # noqa: BLE001 - Pillow raises many types for bad images
+        _LOGGER.debug("Could not resize the thumbnail for %s: %s", file_name, err)
+        resized = None
+    variant = resized if resized is not None else original
+    await store.async_set(entry_id, file_name, variant, _variant(size))
+    return variant
+
+
+def _variant(size: int) -> str:
+    return f"{size}px"
+
+
+def _thumbnail_payload(raw: bytes | None) -> dict[str, str | None]:
+    """Describe a thumbnail for the card: base64 data and its MIME type, or nulls."""
+    if not raw:
+        return {"image": None, "content_type": None}
+    return {
+        "image": base64.b64encode(raw).decode("ascii"),
+        "content_type": thumbnail_content_type(raw),
+    }
 
 
 def _find_file(
@@ -314,7 +620,9 @@ async def ws_start_job(
     requested = msg["material_mappings"]
 
     try:
-        files = await _async_fetch_files(data)
+        # Validate against the listing the card's dialog was built from, unless
+        # it is old enough that the file may have been replaced since.
+        files = await _async_fetch_files(data, START_MAX_AGE)
     except Exception as err:  # noqa: BLE001 - upstream may raise broad exceptions
         connection.send_error(
             msg["id"], ERR_PRINTER, f"Could not read the printer's file list: {err}"
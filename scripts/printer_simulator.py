@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+"""Simulated FlashForge printers, for exercising the integration without one.
+
+Each :class:`SimulatedPrinter` serves the printer's HTTP API - ``/detail``,
+``/product``, ``/gcodeList``, ``/gcodeThumb``, ``/control`` and
+``/printGcode`` - and its MJPEG camera stream, on two localhost ports. What it
+reports follows a scripted print lifecycle (heating, printing, paused,
+completed, ...) driven by the job commands it receives, and any request can be
+slowed down or made to fail. Hundreds of them run comfortably in one process:
+nothing happens between requests, every reading is computed from the clock when
+it is asked for.
+
+It answers what the ``flashforge-python-api`` client sends, in the shapes the
+client parses. It is not a firmware reference: field values are plausible, not
+captured, and commands it does not model are acknowledged and otherwise ignored.
+
+Usage (from the repository root):
+
+    python scripts/printer_simulator.py                        # one Adventurer 5M
+    python scripts/printer_simulator.py --count 200            # a farm, every model
+    python scripts/printer_simulator.py --pid 41 --print       # a Creator 5 Pro, printing
+    python scripts/printer_simulator.py --latency 0.2 --jitter 0.1 --fault-rate 0.05
+    python scripts/printer_simulator.py --speed 20             # lifecycles 20x faster
+
+Each printer's address, ports, serial number and check code are printed on
+start. Point Home Assistant's manual setup at them, or the library's
+``FlashForgeClient`` with ``FiveMClientConnectionOptions(http_port=...)``.
+
+From tests and benchmarks, ``start_fleet()`` returns running printers and
+``stop_fleet()`` stops them. Faults are injected with ``fail_rate`` for random
+ones or ``inject()`` for the next few requests. Every printer counts the
+requests it served. A ``clock`` replaces the event loop's as the lifecycle's
+time source, for callers that step time themselves rather than wait for it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import importlib.util
+import json
+import random
+import socket
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+from PIL import Image
+
+# PIDs and model names come from the integration's own table, so a model added
+# there is simulated here too. Loaded by path: importing the package would pull
+# in Home Assistant, which this script does not need.
+_CONST = Path(__file__).resolve().parent.parent / "custom_components" / "flashforge" / "const.py"
+_spec = importlib.util.spec_from_file_location("_flashforge_const", _CONST)
+_const = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_const)
+PRINTER_MODEL_NAMES: dict[int, str] = _const.PRINTER_MODEL_NAMES
+
+# Models with a Material Station: the AD5X and the Creator 5 series.
+MATERIAL_STATION_PIDS = frozenset({38, 40, 41})
+# Models with an OEM camera fitted as standard.
+CAMERA_PIDS = frozenset({36, 40, 41})
+# The Pro models report filtration fans they can switch.
+FILTRATION_PIDS = frozenset({36, 41})
+
+FIRMWARE_VERSION = "3.2.1"
+
+# (status, seconds) steps. A step of None seconds lasts until the next command.
+# Progress only advances during "printing" steps.
+DEFAULT_LIFECYCLE: tuple[tuple[str, float | None], ...] = (
+    ("heating", 20.0),
+    ("printing", 600.0),
+    ("completed", None),
+)
+
+# Faults a request can be made to suffer.
+FAULT_ERROR = "error"  # HTTP 500
+FAULT_TIMEOUT = "timeout"  # never answers; the client gives up
+FAULT_GARBAGE = "garbage"  # 200 with a body that is not JSON
+FAULT_DISCONNECT = "disconnect"  # connection dropped without a response
+FAULTS = (FAULT_ERROR, FAULT_TIMEOUT, FAULT_GARBAGE, FAULT_DISCONNECT)
+
+# How long a FAULT_TIMEOUT request hangs, in seconds. Longer than any client
+# timeout the integration sets.
+HANG_SECONDS = 120.0
+
+_AMBIENT = 25.0
+_BOUNDARY = "frame"
+
+_FILAMENT_COLORS = ("#FF0000", "#00A0FF", "#FFFFFF", "#202020")
+_FILAMENT_TYPES = ("PLA", "PETG", "PLA", "ABS")
+
+
+@dataclass
+class SimulatedFile:
+    """A file on the simulated printer's storage."""
+
+    name: str
+    print_seconds: int
+    weight: float
+    layers: int = 200
+
+
+def default_files() -> list[SimulatedFile]:
+    """Return the files every simulated printer starts with."""
+    return [
+        SimulatedFile("benchy.3mf", 1800, 12.5, 240),
+        SimulatedFile("calibration_cube.gcode", 900, 6.1, 100),
+        SimulatedFile("vase.3mf", 5400, 48.0, 600),
+    ]
+
+
+class SimulatedPrinter:
+    """One simulated printer: its HTTP API, camera and print lifecycle."""
+
+    def __init__(
+        self,
+        pid: int = 35,
+        *,
+        serial_number: str = "SNSIM00001",
+        check_code: str = "12345678",
+        name: str | None = None,
+        host: str = "127.0.0.1",
+        http_port: int = 0,
+        camera_port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        fail_rate: float = 0.0,
+        faults: tuple[str, ...] = FAULTS,
+        speed: float = 1.0,
+        lifecycle: tuple[tuple[str, float | None], ...] = DEFAULT_LIFECYCLE,
+        camera_fps: float = 10.0,
+        files: list[SimulatedFile] | None = None,
+        seed: int | None = None,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        if pid not in PRINTER_MODEL_NAMES:
+            raise ValueError(f"Unknown pid {pid}; expected one of {sorted(PRINTER_MODEL_NAMES)}")
+        self.pid = pid
+        self.model = PRINTER_MODEL_NAMES[pid]
+        self.serial_number = serial_number
+        self.check_code = check_code
+        self.name = name or self.model
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.faults = faults
+        self.speed = speed
+        self.lifecycle = lifecycle
+        self.camera_fps = camera_fps
+        self.files = {f.name: f for f in (files if files is not None else default_files())}
+        self.requests: Counter[str] = Counter()
+        self.faults_served: Counter[str] = Counter()
+        self.camera_clients = 0
+        self.camera_on = pid in CAMERA_PIDS
+        self.light_on = True
+        self.internal_fan = False
+        self.external_fan = False
+        self.offline = False
+        self._random = random.Random(seed)
+        self._clock = clock
+        self._injected: list[tuple[str, str | None]] = []
+        self._http_port = http_port
+        self._camera_port = camera_port
+        self._runners: list[web.AppRunner] = []
+        self._targets = {"bed": 0.0, "nozzle": 0.0, "chamber": 0.0}
+        self._slots = [
+            {
+                "slotId": index + 1,
+                "hasFilament": True,
+                "materialName": _FILAMENT_TYPES[index],
+                "materialColor": _FILAMENT_COLORS[index],
+            }
+            for index in range(4)
+        ]
+        # The job: which file, where in the lifecycle, and whether it is held.
+        self._job: SimulatedFile | None = None
+        self._job_script = lifecycle
+        self._elapsed = 0.0
+        self._running_since: float | None = None
+        self._override: str | None = None  # "paused" or "cancel"
+        self._jpeg = _solid_jpeg(_FILAMENT_COLORS[pid % len(_FILAMENT_COLORS)])
+
+    # -- lifecycle ---------------------------------------------------------
+
+    @property
+    def http_port(self) -> int:
+        """Return the port the HTTP API is served on."""
+        return self._http_port
+
+    @property
+    def camera_port(self) -> int:
+        """Return the port the camera stream is served on."""
+        return self._camera_port
+
+    @property
+    def camera_url(self) -> str:
+        """Return the camera stream URL, as /detail reports it."""
+        return f"http://{self.host}:{self._camera_port}/?action=stream"
+
+    async def start(self) -> None:
+        """Start serving the HTTP API and the camera stream."""
+        api = web.Application()
+        api.router.add_post("/detail", self._handle_detail)
+        api.router.add_post("/product", self._handle_product)
+        api.router.add_post("/gcodeList", self._handle_gcode_list)
+        api.router.add_post("/gcodeThumb", self._handle_gcode_thumb)
+        api.router.add_post("/control", self._handle_control)
+        api.router.add_post("/printGcode", self._handle_print_gcode)
+        camera = web.Application()
+        camera.router.add_get("/", self._handle_camera)
+
+        self._http_port = await self._serve(api, self._http_port)
+        self._camera_port = await self._serve(camera, self._camera_port)
+
+    async def _serve(self, app: web.Application, port: int) -> int:
+        runner = web.AppRunner(app, access_log=None, handle_signals=False)
+        await runner.setup()
+        self._runners.append(runner)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, port))
+        site = web.SockSite(runner, sock)
+        await site.start()
+        return sock.getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+    def _now(self) -> float:
+        if self._clock is not None:
+            return self._clock()
+        return asyncio.get_running_loop().time()
+
+    def start_print(
+        self,
+        file_name: str,
+        lifecycle: tuple[tuple[str, float | None], ...] | None = None,
+    ) -> None:
+        """Start printing a file, as /printGcode does.
+
+        Without a ``lifecycle``, the printer heats, prints for the file's print
+        time, and completes.
+        """
+        job = self.files[file_name]
+        script = lifecycle or tuple(
+            (status, job.print_seconds if status == "printing" and seconds else seconds)
+            for status, seconds in self.lifecycle
+        )
+        self._job = job
+        self._job_script = script
+        self._elapsed = 0.0
+        self._running_since = self._now()
+        self._override = None
+
+    def pause(self) -> bool:
+        """Hold the job where it is."""
+        if self.status() not in ("printing", "heating"):
+            return False
+        self._elapsed = self._job_elapsed()
+        self._running_since = None
+        self._override = "paused"
+        return True
+
+    def resume(self) -> bool:
+        """Carry on with a held job."""
+        if self._override != "paused":
+            return False
+        self._running_since = self._now()
+        self._override = None
+        return True
+
+    def cancel(self) -> bool:
+        """Abandon the job."""
+        if self._job is None or self._override == "cancel":
+            return False
+        self._elapsed = self._job_elapsed()
+        self._running_since = None
+        self._override = "cancel"
+        return True
+
+    def clear_platform(self) -> None:
+        """Acknowledge a finished job, returning the printer to ready."""
+        self._job = None
+        self._override = None
+        self._running_since = None
+
+    def inject(self, fault: str, count: int = 1, endpoint: str | None = None) -> None:
+        """Make the next ``count`` requests, to ``endpoint`` or to any, suffer ``fault``."""
+        if fault not in FAULTS:
+            raise ValueError(f"Unknown fault {fault!r}; expected one of {FAULTS}")
+        self._injected.extend([(fault, endpoint)] * count)
+
+    def _job_elapsed(self) -> float:
+        elapsed = self._elapsed
+        if self._running_since is not None:
+            elapsed += (self._now() - self._running_since) * self.speed
+        return elapsed
+
+    def _step(self) -> tuple[str, float]:
+        """Return the lifecycle status and the printing seconds done so far."""
+        elapsed = self._job_elapsed()
+        printed = 0.0
+        status = "ready"
+        for status, seconds in self._job_script:
+            if seconds is None or elapsed < seconds:
+                if status == "printing":
+                    printed += elapsed
+                return status, printed
+            elapsed -= seconds
+            if status == "printing":
+                printed += seconds
+        return status, printed
+
+    def status(self) -> str:
+        """Return the raw status string /detail would report now."""
+        if self._job is None:
+            return "ready"
+        if self._override == "paused":
+            return "paused"
+        if self._override == "cancel":
+            return "cancel"
+        return self._step()[0]
+
+    def _progress(self) -> float:
+        if self._job is None:
+            return 0.0
+        total = sum(s for status, s in self._job_script if status == "printing" and s)
+        if not total:
+            return 0.0
+        return min(self._step()[1] / total, 1.0)
+
+    # -- payloads ----------------------------------------------------------
+
+    def detail(self) -> dict[str, Any]:
+        """Return the /detail body for the printer's current state."""
+        status = self.status()
+        job = self._job
+        progress = self._progress()
+        active = status in ("heating", "printing", "paused", "pausing")
+        bed_target = self._targets["bed"] or (60.0 if active else 0.0)
+        nozzle_target = self._targets["nozzle"] or (210.0 if active else 0.0)
+        heated = 1.0 if status != "heating" else 0.5
+        bed = _AMBIENT + (bed_target - _AMBIENT) * heated if bed_target else _AMBIENT
+        nozzle = (
+            _AMBIENT + (nozzle_target - _AMBIENT) * heated if nozzle_target else _AMBIENT
+        )
+        remaining = job.print_seconds * (1.0 - progress) if job and active else 0
+        detail: dict[str, Any] = {
+            "name": self.name,
+            "model": self.model,
+            "pid": self.pid,
+            "firmwareVersion": FIRMWARE_VERSION,
+            "ipAddr": self.host,
+            "macAddr": "00:00:00:00:00:00",
+            "status": status,
+            "errorCode": "",
+            "printFileName": job.name if job else "",
+            "printProgress": round(progress, 4),
+            "printLayer": int((job.layers if job else 0) * progress),
+            "targetPrintLayer": job.layers if job else 0,
+            "printDuration": int(self._job_elapsed()) if job else 0,
+            "estimatedTime": int(remaining),
+            "estimatedRightWeight": job.weight if job else 0.0,
+            "estimatedRightLen": job.weight * 330 if job else 0.0,
+            "platTemp": round(bed, 1),
+            "platTargetTemp": bed_target,
+            "rightTemp": round(nozzle, 1),
+            "rightTargetTemp": nozzle_target,
+            "leftTemp": 0.0,
+            "leftTargetTemp": 0.0,
+            "chamberTemp": _AMBIENT + (10.0 if active else 0.0),
+            "chamberTargetTemp": self._targets["chamber"],
+            "coolingFanSpeed": 100 if status == "printing" else 0,
+            "chamberFanSpeed": 100 if status == "printing" else 0,
+            "currentPrintSpeed": 100 if status == "printing" else 0,
+            "printSpeedAdjust": 100,
+            "zAxisCompensation": 0.0,
+            "lightStatus": "open" if self.light_on else "close",
+            "internalFanStatus": "open" if self.internal_fan else "close",
+            "externalFanStatus": "open" if self.external_fan else "close",
+            "doorStatus": "close",
+            "autoShutdown": "close",
+            "remainingDiskSpace": 6.2 - 0.1 * len(self.files),
+            "cumulativeFilament": 1234.5,
+            "cumulativePrintTime": 98765,
+            "nozzleModel": "0.4mm",
+            "nozzleCnt": 1,
+            "camera": 1 if self.pid in CAMERA_PIDS else 0,
+            "cameraStreamUrl": self.camera_url if self.camera_on else "",
+            "location": "Group A",
+            "measure": "220X220X220",
+            "tvoc": 0.0,
+        }
+        if self.pid in MATERIAL_STATION_PIDS:
+            detail["matlStationInfo"] = {
+                "currentLoadSlot": 0,
+                "currentSlot": 1 if active else 0,
+                "slotCnt": len(self._slots),
+                "slotInfos": self._slots,
+                "stateAction": 0,
+                "stateStep": 0,
+            }
+            if self.pid == 38:
+                # Only the AD5X reports the flag; see the library's parser.
+                detail["hasMatlStation"] = True
+        return {"code": 0, "message": "Success", "detail": detail}
+
+    def product(self) -> dict[str, Any]:
+        """Return the /product body: what the printer lets itself be switched."""
+        filtration = 1 if self.pid in FILTRATION_PIDS else 0
+        return {
+            "code": 0,
+            "message": "Success",
+            "product": {
+                "chamberTempCtrlState": 1 if self.pid in (40, 41) else 0,
+                "externalFanCtrlState": filtration,
+                "internalFanCtrlState": filtration,
+                "lightCtrlState": 1,
+                "nozzleTempCtrlState": 1,
+                "platformTempCtrlState": 1,
+            },
+        }
+
+    def gcode_list(self) -> dict[str, Any]:
+        """Return the /gcodeList body, in the shape this model answers with."""
+        if self.pid == 38:
+            return {
+                "code": 0,
+                "message": "Success",
+                "gcodeListDetail": [
+                    {
+                        "gcodeFileName": f.name,
+                        "printingTime": f.print_seconds,
+                        "totalFilamentWeight": f.weight,
+                        "gcodeToolCnt": 1,
+                        "useMatlStation": False,
+                    }
+                    for f in self.files.values()
+                ],
+            }
+        return {"code": 0, "message": "Success", "gcodeList": list(self.files)}
+
+    # -- HTTP --------------------------------------------------------------
+
+    async def _admit(self, request: web.Request) -> dict[str, Any] | web.StreamResponse:
+        """Count, delay and maybe fail a request; return its JSON body if it proceeds."""
+        endpoint = request.path
+        self.requests[endpoint] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        fault = None
+        if self.offline:
+            fault = FAULT_DISCONNECT
+        else:
+            for index, (injected, only) in enumerate(self._injected):
+                if only is None or only == endpoint:
+                    fault = injected
+                    del self._injected[index]
+                    break
+            if fault is None and self.fail_rate and self._random.random() < self.fail_rate:
+                fault = self._random.choice(self.faults)
+        if fault is not None:
+            self.faults_served[fault] += 1
+            return await _fault_response(request, fault)
+
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return web.json_response({"code": 1, "message": "Bad request"})
+        if (
+            body.get("serialNumber") != self.serial_number
+            or body.get("checkCode") != self.check_code
+        ):
+            return web.json_response({"code": 1, "message": "Check code error"})
+        return body
+
+    async def _handle_detail(self, request: web.Request) -> web.StreamResponse:
+        body = await self._admit(request)
+        if isinstance(body, web.StreamResponse):
+            return body
+        return web.json_response(self.detail())
+
+    async def _handle_product(self, request: web.Request) -> web.StreamResponse:
+        body = await self._admit(request)
+        if isinstance(body, web.StreamResponse):
+            return body
+        return web.json_response(self.product())
+
+    async def _handle_gcode_list(self, request: web.Request) -> web.StreamResponse:
+        body = await self._admit(request)
+        if isinstance(body, web.StreamResponse):
+            return body
+        return web.json_response(self.gcode_list())
+
+    async def _handle_gcode_thumb(self, request: web.Request) -> web.StreamResponse:
+        body = await self._admit(request)
+        if isinstance(body, web.StreamResponse):
+            return body
+        file = self.files.get(body.get("fileName", ""))
+        if file is None:
+            return web.json_response({"code": 1, "message": "File not found"})
+        return web.json_response(
+            {
+                "code": 0,
+                "message": "Success",
+                "imageData": base64.b64encode(_thumbnail(file.name)).decode(),
+            }
+        )
+
+    async def _handle_print_gcode(self, request: web.Request) -> web.StreamResponse:
+        body = await self._admit(request)
+        if isinstance(body, web.StreamResponse):
+            return body
+        file_name = body.get("fileName", "")
+        if file_name not in self.files:
+            return web.json_response({"code": 1, "message": "File not found"})
+        if self.status() not in ("ready", "completed", "cancel"):
+            return web.json_response({"code": 1, "message": "Printer busy"})
+        self.start_print(file_name)
+        return web.json_response({"code": 0, "message": "Success"})
+
+    async def _handle_control(self, request: web.Request) -> web.StreamResponse:
+        body = await self._admit(request)
+        if isinstance(body, web.StreamResponse):
+            return body
+        payload = body.get("payload") or {}
+        ok = self._control(payload.get("cmd", ""), payload.get("args") or {})
+        return web.json_response(
+            {"code": 0, "message": "Success"} if ok else {"code": 1, "message": "Failed"}
+        )
+
+    def _control(self, command: str, args: dict[str, Any]) -> bool:
+        if command == "jobCtl_cmd":
+            action = args.get("action")
+            if action == "pause":
+                return self.pause()
+            if action == "continue":
+                return self.resume()
+            if action == "cancel":
+                return self.cancel()
+            return False
+        if command == "lightControl_cmd":
+            self.light_on = args.get("status") == "open"
+        elif command == "circulateCtl_cmd":
+            self.internal_fan = args.get("internal") == "open"
+            self.external_fan = args.get("external") == "open"
+        elif command == "streamCtrl_cmd":
+            self.camera_on = args.get("action") == "open"
+        elif command == "stateCtrl_cmd" and args.get("action") == "setClearPlatform":
+            self.clear_platform()
+        elif command == "temperatureCtl_cmd":
+            for key, target in (
+                ("platform", "bed"),
+                ("rightNozzle", "nozzle"),
+                ("chamber", "chamber"),
+            ):
+                value = args.get(key)
+                if isinstance(value, (int, float)) and value >= 0:
+                    self._targets[target] = float(value)
+        elif command == "msConfig_cmd":
+            slot = args.get("slot")
+            if not isinstance(slot, int) or not 1 <= slot <= len(self._slots):
+                return False
+            self._slots[slot - 1].update(
+                materialName=args.get("mt", ""), materialColor=args.get("rgb", "")
+            )
+        # Anything else - printerCtl_cmd and the rest - is acknowledged.
+        return True
+
+    async def _handle_camera(self, request: web.Request) -> web.StreamResponse:
+        self.requests["camera"] += 1
+        if self.offline:
+            self.faults_served[FAULT_DISCONNECT] += 1
+            return await _fault_response(request, FAULT_DISCONNECT)
+        if not self.camera_on or request.query.get("action") != "stream":
+            return web.Response(status=404)
+        response = web.StreamResponse(
+            headers={"Content-Type": f"multipart/x-mixed-replace; boundary={_BOUNDARY}"}
+        )
+        await response.prepare(request)
+        if request.method == "HEAD":
+            return response
+        self.camera_clients += 1
+        header = (
+            f"--{_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+            f"Content-Length: {len(self._jpeg)}\r\n\r\n"
+        ).encode()
+        try:
+            while self.camera_on and not self.offline:
+                await response.write(header + self._jpeg + b"\r\n")
+                await asyncio.sleep(1 / self.camera_fps)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.camera_clients -= 1
+        return response
+
+
+async def _fault_response(request: web.Request, fault: str) -> web.StreamResponse:
+    if fault == FAULT_TIMEOUT:
+        await asyncio.sleep(HANG_SECONDS)
+        return web.Response(status=504)
+    if fault == FAULT_GARBAGE:
+        return web.Response(status=200, text="<html>busy</html>", content_type="text/html")
+    if fault == FAULT_DISCONNECT:
+        if request.transport is not None:
+            request.transport.close()
+        raise asyncio.CancelledError
+    return web.Response(status=500, text="Internal Server Error")
+
+
+def _solid_jpeg(color: str) -> bytes:
+    """Return a small JPEG camera frame in one colour."""
+    buffer = BytesIO()
+    Image.new("RGB", (320, 240), color).save(buffer, format="JPEG", quality=60)
+    return buffer.getvalue()
+
+
+def _thumbnail(file_name: str) -> bytes:
+    """Return a PNG thumbnail for a file, coloured by its name."""
+    color = _FILAMENT_COLORS[sum(file_name.encode()) % len(_FILAMENT_COLORS)]
+    buffer = BytesIO()
+    Image.new("RGB", (300, 300), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def start_fleet(count: int, *, pids: list[int] | None = None, **kwargs: Any) -> list[SimulatedPrinter]:
+    """Start ``count`` printers on localhost, cycling through ``pids`` (every model by default).
+
+    Keyword arguments are passed to every :class:`SimulatedPrinter`; each gets
+    its own serial number, name, ports and random seed.
+    """
+    models = pids or sorted(PRINTER_MODEL_NAMES)
+    seed = kwargs.pop("seed", None)
+    printers = [
+        SimulatedPrinter(
+            models[index % len(models)],
+            serial_number=f"SNSIM{index + 1:05d}",
+            name=f"Sim {index + 1:03d} {PRINTER_MODEL_NAMES[models[index % len(models)]]}",
+            seed=None if seed is None else seed + index,
+            **kwargs,
+        )
+        for index in range(count)
+    ]
+    await asyncio.gather(*(printer.start() for printer in printers))
+    return printers
+
+
+async def stop_fleet(printers: list[SimulatedPrinter]) -> None:
+    """Stop every printer in a fleet."""
+    await asyncio.gather(*(printer.stop() for printer in printers))
+
+
+async def _main(args: argparse.Namespace) -> None:
+    printers = await start_fleet(
+        args.count,
+        pids=[args.pid] if args.pid else None,
+        host=args.host,
+        latency=args.latency,
+        jitter=args.jitter,
+        fail_rate=args.fault_rate,
+        speed=args.speed,
+        seed=args.seed,
+    )
+    if args.print:
+        for printer in printers:
+            printer.start_print(next(iter(printer.files)))
+    print(f"{'name':<28} {'ip':<15} {'http':>6} {'camera':>6}  serial      check code")
+    for printer in printers:
+        print(
+            f"{printer.name:<28} {printer.host:<15} {printer.http_port:>6}"
+            f" {printer.camera_port:>6}  {printer.serial_number}  {printer.check_code}"
+        )
+    print("Serving; Ctrl+C to stop.")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_fleet(printers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--count", type=int, default=1, help="printers to start")
+    parser.add_argument("--pid", type=int, choices=sorted(PRINTER_MODEL_NAMES), help="simulate only this model")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--speed", type=float, default=1.0, help="lifecycle speed multiplier")
+    parser.add_argument("--print", action="store_true", help="start every printer on a job")
+    parser.add_argument("--seed", type=int, help="seed for latency jitter and faults")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
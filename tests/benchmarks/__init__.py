@@ -0,0 +1 @@
+"""Benchmarks, run on demand; see each module for how."""
@@ -0,0 +1,391 @@
+"""Benchmark of the job card's websocket commands, as the user drives them.
+
+What the card feels like is decided by two things: how long each action takes,
+and how many requests it sends a printer whose web server answers one thing at
+a time. Each scenario below is one user action, performed the way the card
+performs it, against a printer that takes ``--latency`` seconds (plus up to
+``--jitter`` more) to answer anything:
+
+* ``open_card`` - ``files/list``, then ``file/thumbnails`` for every listed
+  file at the card's tile size, with nothing cached yet;
+* ``reopen_card`` - the same again a moment later;
+* ``thumbnail`` - one ``file/thumbnail``, uncached;
+* ``pick_file`` - ``job/prepare`` for a two-colour file, after opening the card;
+* ``start`` - ``job/start`` with the mapping ``job/prepare`` suggested.
+
+Each scenario's end-to-end latency is reported as p50/p95/p99 in milliseconds,
+from the command being handled to its last message being sent. The printer
+requests it caused are counted per endpoint. An action that needs more requests
+than its entry in :data:`REQUEST_BUDGETS` fails the run: a change that makes
+opening the card cost another round trip is caught here, not by a user with a
+slow printer. A change that saves one should lower the budget with it.
+
+The printer is an AD5X, whose status comes from the simulator
+(``scripts/printer_simulator.py``); its client is a stand-in, so only the
+printer's latency is simulated, not its network. The thumbnail cache is the
+real one, on disk in a scratch directory.
+
+Usage (from the repository root):
+
+    python -m tests.benchmarks.job_card                         # 50 ms printer
+    python -m tests.benchmarks.job_card --latency 0.3 --jitter 0.2
+    python -m tests.benchmarks.job_card --output job_card.json
+
+Exits non-zero when a scenario is over its request budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import Store, mock_homeassistant
+
+mock_homeassistant()
+
+from flashforge.api.controls.info import MachineInfoParser
+from flashforge.models import DetailResponse, FFGcodeFileEntry, FFGcodeToolData
+from PIL import Image
+
+from custom_components.flashforge.const import DOMAIN
+from custom_components.flashforge.file_list import FileListCache
+from custom_components.flashforge.websocket import (
+    ws_file_thumbnail,
+    ws_file_thumbnails,
+    ws_list_files,
+    ws_prepare_job,
+    ws_start_job,
+)
+from scripts.printer_simulator import SimulatedPrinter
+
+ENTRY_ID = "benchmark"
+LATENCY = 0.05  # seconds
+JITTER = 0.0  # seconds
+ITERATIONS = 20
+# The printer lists its ten most recent files.
+FILE_COUNT = 10
+MULTI_COLOR_FILE = "two_colour.3mf"
+# The tile size the card asks for; see THUMB_SIZE in the card.
+CARD_THUMBNAIL_SIZE = 152
+
+SCENARIOS = ("open_card", "reopen_card", "thumbnail", "pick_file", "start")
+
+# The most printer requests each scenario may cost.
+REQUEST_BUDGETS = {
+    # One listing and one thumbnail per file.
+    "open_card": 1 + FILE_COUNT,
+    # Listing and thumbnails are both still cached.
+    "reopen_card": 0,
+    "thumbnail": 1,
+    # Validated against the listing the card just fetched.
+    "pick_file": 0,
+    # The print command, then the status refresh that shows it started.
+    "start": 2,
+}
+
+
+def _thumbnail_png() -> bytes:
+    """Return a thumbnail the size slicers embed, noisy so it compresses like one."""
+    buffer = BytesIO()
+    Image.effect_noise((300, 300), 64).convert("RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _files() -> list[FFGcodeFileEntry]:
+    """Return the printer's listing: one two-colour file and single-colour others."""
+    files = [
+        FFGcodeFileEntry(
+            gcodeFileName=MULTI_COLOR_FILE,
+            printingTime=6120,
+            gcodeToolCnt=2,
+            useMatlStation=True,
+            totalFilamentWeight=24.0,
+            gcodeToolDatas=[
+                FFGcodeToolData(
+                    toolId=0, materialName="PLA", materialColor="#FF0000", filamentWeight=14.0, slotId=1
+                ),
+                FFGcodeToolData(
+                    toolId=1, materialName="PETG", materialColor="#00A0FF", filamentWeight=10.0, slotId=2
+                ),
+            ],
+        )
+    ]
+    files.extend(
+        FFGcodeFileEntry(
+            gcodeFileName=f"part_{index:02d}.3mf",
+            printingTime=1800 + 60 * index,
+            gcodeToolCnt=1,
+            useMatlStation=False,
+            totalFilamentWeight=12.5,
+        )
+        for index in range(1, FILE_COUNT)
+    )
+    return files
+
+
+class BenchmarkPrinter:
+    """The client of one slow printer, counting every request it is sent."""
+
+    def __init__(self, latency: float, jitter: float, seed: int | None = None) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.requests: Counter[str] = Counter()
+        self.is_ad5x = True
+        self.is_creator5 = False
+        self._random = random.Random(seed)
+        self._files = _files()
+        self._thumbnail = _thumbnail_png()
+        self.files = SimpleNamespace(
+            get_recent_file_list=self._async_file_list,
+            get_gcode_thumbnail=self._async_thumbnail,
+        )
+        self.job_control = SimpleNamespace(
+            start_ad5x_multi_color_job=self._async_start,
+            start_ad5x_single_color_job=self._async_start,
+        )
+
+    async def async_request(self, endpoint: str) -> None:
+        """Count a request and take as long as the printer does to answer it."""
+        self.requests[endpoint] += 1
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+    async def _async_file_list(self) -> list[FFGcodeFileEntry]:
+        await self.async_request("/gcodeList")
+        return list(self._files)
+
+    async def _async_thumbnail(self, file_name: str) -> bytes:
+        await self.async_request("/gcodeThumb")
+        return self._thumbnail
+
+    async def _async_start(self, params: Any) -> bool:
+        await self.async_request("/printGcode")
+        return True
+
+
+class _Connection:
+    """A websocket connection that records what the card would receive."""
+
+    def __init__(self) -> None:
+        self.subscriptions: dict[int, Callable[[], None]] = {}
+        self.results: dict[int, Any] = {}
+        self.errors: dict[int, tuple[str, str]] = {}
+        self.done = asyncio.Event()
+
+    def send_result(self, msg_id: int, result: Any = None) -> None:
+        self.results[msg_id] = result
+
+    def send_error(self, msg_id: int, code: str, message: str) -> None:
+        self.errors[msg_id] = (code, message)
+
+    def send_message(self, message: dict[str, Any]) -> None:
+        if message.get("event") == {"done": True}:
+            self.done.set()
+
+
+class _Environment:
+    """One Home Assistant with the printer set up and an empty thumbnail cache."""
+
+    def __init__(self, config_dir: str, latency: float, jitter: float, seed: int) -> None:
+        Store.reset()
+        loop = asyncio.get_running_loop()
+        self.printer = BenchmarkPrinter(latency, jitter, seed)
+        detail = DetailResponse(**SimulatedPrinter(38).detail()).detail
+        coordinator = SimpleNamespace(
+            data=MachineInfoParser.from_detail(detail),
+            device_model="AD5X",
+            async_request_refresh=self._async_refresh,
+        )
+        self.hass = SimpleNamespace(
+            config=SimpleNamespace(path=lambda *parts: os.path.join(config_dir, *parts)),
+            async_add_executor_job=lambda func, *args: loop.run_in_executor(None, func, *args),
+            async_create_background_task=lambda coro, name: asyncio.ensure_future(coro),
+            data={
+                DOMAIN: {
+                    ENTRY_ID: {
+                        "coordinator": coordinator,
+                        "client": self.printer,
+                        "name": "Benchmark AD5X",
+                        "file_list": FileListCache(self.printer),
+                    }
+                }
+            },
+        )
+        self.file_names: list[str] = []
+        self.suggested: list[dict[str, Any]] = []
+        self._msg_id = 0
+
+    async def _async_refresh(self) -> None:
+        await self.printer.async_request("/detail")
+
+    async def async_command(
+        self,
+        handler: Callable[..., Awaitable[None]],
+        subscription: bool = False,
+        **fields: Any,
+    ) -> Any:
+        """Handle one command; return its result, waiting out a subscription."""
+        self._msg_id += 1
+        connection = _Connection()
+        await handler(self.hass, connection, {"id": self._msg_id, "entry_id": ENTRY_ID, **fields})
+        if subscription:
+            await connection.done.wait()
+        if connection.errors:
+            raise RuntimeError(f"{handler.__name__} failed: {connection.errors}")
+        return connection.results[self._msg_id]
+
+    async def async_open_card(self) -> None:
+        listing = await self.async_command(ws_list_files, refresh=False)
+        self.file_names = [item["file_name"] for item in listing["files"]]
+        await self.async_command(
+            ws_file_thumbnails,
+            subscription=True,
+            file_names=self.file_names,
+            size=CARD_THUMBNAIL_SIZE,
+        )
+
+    async def async_thumbnail(self) -> None:
+        await self.async_command(
+            ws_file_thumbnail, file_name=MULTI_COLOR_FILE, size=CARD_THUMBNAIL_SIZE
+        )
+
+    async def async_pick_file(self) -> None:
+        prepared = await self.async_command(ws_prepare_job, file_name=MULTI_COLOR_FILE)
+        self.suggested = prepared["suggested_mappings"]
+
+    async def async_start(self) -> None:
+        await self.async_command(
+            ws_start_job,
+            file_name=MULTI_COLOR_FILE,
+            leveling=False,
+            material_mappings=self.suggested,
+        )
+
+
+async def _async_timed(
+    env: _Environment, action: Callable[[], Awaitable[None]]
+) -> tuple[float, Counter[str]]:
+    """Run one action; return its latency in milliseconds and the requests it sent."""
+    before = Counter(env.printer.requests)
+    started = time.perf_counter()
+    await action()
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, env.printer.requests - before
+
+
+async def async_run(
+    latency: float = LATENCY, jitter: float = JITTER, iterations: int = ITERATIONS
+) -> dict[str, Any]:
+    """Run every scenario ``iterations`` times; return the results, ready for JSON."""
+    latencies: dict[str, list[float]] = {scenario: [] for scenario in SCENARIOS}
+    requests: dict[str, Counter[str]] = {scenario: Counter() for scenario in SCENARIOS}
+
+    def record(scenario: str, measured: tuple[float, Counter[str]]) -> None:
+        elapsed, sent = measured
+        latencies[scenario].append(elapsed)
+        # The most any one run of the scenario sent, per endpoint.
+        requests[scenario] |= sent
+
+    for iteration in range(iterations):
+        with tempfile.TemporaryDirectory() as config_dir:
+            # One card session: open, reopen, pick, start.
+            env = _Environment(config_dir, latency, jitter, seed=iteration)
+            record("open_card", await _async_timed(env, env.async_open_card))
+            record("reopen_card", await _async_timed(env, env.async_open_card))
+            record("pick_file", await _async_timed(env, env.async_pick_file))
+            record("start", await _async_timed(env, env.async_start))
+
+        with tempfile.TemporaryDirectory() as config_dir:
+            env = _Environment(config_dir, latency, jitter, seed=iteration)
+            record("thumbnail", await _async_timed(env, env.async_thumbnail))
+
+    manifest = project_root / "custom_components" / "flashforge" / "manifest.json"
+    return {
+        "benchmark": "job_card",
+        "version": json.loads(manifest.read_text())["version"],
+        "python": platform.python_version(),
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "latency": latency,
+        "jitter": jitter,
+        "iterations": iterations,
+        "unit": "ms",
+        "scenarios": {
+            scenario: {
+                **_percentiles(latencies[scenario]),
+                "requests": dict(sorted(requests[scenario].items())),
+                "total_requests": requests[scenario].total(),
+                "budget": REQUEST_BUDGETS[scenario],
+            }
+            for scenario in SCENARIOS
+        },
+    }
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if len(samples) < 2:
+        return {key: round(samples[0], 2) for key in ("p50", "p95", "p99", "max")}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(statistics.median(samples), 2),
+        "p95": round(cuts[94], 2),
+        "p99": round(cuts[98], 2),
+        "max": round(max(samples), 2),
+    }
+
+
+def over_budget(results: dict[str, Any]) -> list[str]:
+    """Return a line for each scenario that sent more requests than its budget."""
+    return [
+        f"{scenario}: {result['total_requests']} printer requests, budget {result['budget']}"
+        f" ({', '.join(f'{endpoint} x{count}' for endpoint, count in result['requests'].items())})"
+        for scenario, result in results["scenarios"].items()
+        if result["total_requests"] > result["budget"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--latency", type=float, default=LATENCY, help="seconds the printer takes to answer")
+    parser.add_argument("--jitter", type=float, default=JITTER, help="up to this many more seconds, at random")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS, help="runs of each scenario")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run(args.latency, args.jitter, args.iterations))
+    print(f"{'scenario':<12} {'p50':>9} {'p95':>9} {'p99':>9}  requests")
+    for scenario, result in results["scenarios"].items():
+        print(
+            f"{scenario:<12} {result['p50']:>9.1f} {result['p95']:>9.1f} {result['p99']:>9.1f}"
+            f"  {result['total_requests']} of {result['budget']}"
+        )
+    print("Milliseconds, end to end.")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    problems = over_budget(results)
+    if problems:
+        print("Over the request budget:\n" + "\n".join(problems))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""Benchmark of one coordinator refresh, from /detail to the last state write.
+
+Every poll of every printer runs the same path: the coordinator parses the
+``/detail`` body, wakes its listeners, and each entity works out what it shows
+and writes it if it changed. Timed per refresh of every entry, in microseconds:
+
+* ``update_data`` - ``_async_update_data``: validating the body, parsing it
+  into ``FFMachineInfo`` and completing it, as a poll does;
+* ``fan_out`` - the coordinator's did-anything-change check and
+  ``async_update_listeners``, with every entity's ``_handle_coordinator_update``
+  and the state writes they make;
+* ``refresh`` - the two together;
+* ``value_fn``, ``is_on``, ``swatch_key`` and ``state_writes`` - every sensor
+  ``value_fn``, binary sensor ``is_on``, slot image ``_swatch_key`` and state
+  write on its own, so a regression in the fan-out can be placed.
+
+The printers are the simulator's (``scripts/printer_simulator.py``), mid-print,
+with each refresh one scan interval later than the last, so progress and
+elapsed time move between polls the way they do on a real printer. Nothing goes
+over a socket: each client's ``/detail`` request is answered with the
+simulator's body directly, so what is measured is the integration rather than
+the network. Home Assistant is the test suite's stand-in; a state write reads
+the state, availability and attributes a real one would.
+
+Usage (from the repository root):
+
+    python -m tests.benchmarks.update_path                  # every model, 1/10/100 entries
+    python -m tests.benchmarks.update_path --pid 38 --entries 50
+    python -m tests.benchmarks.update_path --output bench.json
+    python -m tests.benchmarks.update_path --compare bench-1.5.0.json
+
+Results are written as JSON, one case per model and entry count. ``--compare``
+prints each case's median refresh next to a previous run's.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from flashforge import FiveMClientConnectionOptions, FlashForgeClient
+
+from custom_components.flashforge.binary_sensor import (
+    BINARY_SENSORS,
+    FlashForgeBinarySensor,
+)
+from custom_components.flashforge.camera_stream import CameraStreamCache
+from custom_components.flashforge.coordinator import FlashForgeDataUpdateCoordinator
+from custom_components.flashforge.image import (
+    IFS_SLOT_COUNT,
+    FlashForgeMaterialStationSlotImage,
+    FlashForgeThumbnailImage,
+)
+from custom_components.flashforge.sensor import SENSORS, FlashForgeSensor
+from scripts.printer_simulator import PRINTER_MODEL_NAMES, SimulatedPrinter
+
+# Adventurer 5M, Adventurer 5M Pro, AD5X, Creator 5 Pro.
+MODELS = (35, 36, 38, 41)
+ENTRY_COUNTS = (1, 10, 100)
+ROUNDS = 50
+SCAN_INTERVAL = 10  # seconds of printer time between refreshes
+
+# Refreshes run before timing starts: the first after setup writes every
+# entity, and the simulated print spends its first 20 seconds heating.
+WARMUP_ROUNDS = 3
+
+STAGES = (
+    "refresh",
+    "update_data",
+    "fan_out",
+    "value_fn",
+    "is_on",
+    "swatch_key",
+    "state_writes",
+)
+
+
+def _read_state(entity: Any) -> tuple[Any, ...]:
+    """Return what Home Assistant reads from an entity to write its state."""
+    if isinstance(entity, FlashForgeSensor):
+        state = entity.native_value
+    elif isinstance(entity, FlashForgeBinarySensor):
+        state = entity.is_on
+    else:
+        state = entity._attr_image_last_updated
+    return (entity.available, state, getattr(entity, "extra_state_attributes", None))
+
+
+class BenchmarkEntry:
+    """One configured printer: its simulator, client, coordinator and entities."""
+
+    def __init__(
+        self,
+        hass: Any,
+        camera_streams: CameraStreamCache,
+        pid: int,
+        index: int,
+        clock: Callable[[], float],
+    ) -> None:
+        self.printer = SimulatedPrinter(
+            pid, serial_number=f"SNBENCH{index:05d}", name=f"Bench {index:03d}", clock=clock
+        )
+        self.printer.start_print(next(iter(self.printer.files)))
+        self.client = FlashForgeClient(
+            ip_address=self.printer.host,
+            serial_number=self.printer.serial_number,
+            check_code=self.printer.check_code,
+            options=FiveMClientConnectionOptions(http_only=True),
+        )
+        self.client.info.get_detail_raw = self._async_detail
+        self.client.detect_camera_stream = self._async_no_camera
+        self.entry_id = f"bench_{index}"
+        self.coordinator = FlashForgeDataUpdateCoordinator(
+            hass,
+            self.client,
+            self.printer.name,
+            SCAN_INTERVAL,
+            entry_id=self.entry_id,
+            camera_streams=camera_streams,
+        )
+        self.hass = hass
+        self.sensors: list[FlashForgeSensor] = []
+        self.binary_sensors: list[FlashForgeBinarySensor] = []
+        self.images: list[Any] = []
+        self.slot_images: list[FlashForgeMaterialStationSlotImage] = []
+        self.writes = 0
+
+    async def _async_detail(self) -> dict[str, Any]:
+        return self.printer.detail()
+
+    async def _async_no_camera(self) -> str:
+        return ""
+
+    @property
+    def entities(self) -> list[Any]:
+        return [*self.sensors, *self.binary_sensors, *self.images]
+
+    async def async_setup(self) -> None:
+        """Seed the coordinator and add the entities setup would, listening."""
+        name = self.printer.name
+        machine_info = await self.client.info.get()
+        await self.coordinator.async_set_initial_data(machine_info, self.hass.loop.time())
+        data = self.coordinator.data
+
+        self.sensors = [
+            FlashForgeSensor(self.coordinator, description, name, self.entry_id)
+            for description in SENSORS
+            if description.availability_fn is None or description.availability_fn(data)
+        ]
+        self.binary_sensors = [
+            FlashForgeBinarySensor(self.coordinator, description, name, self.entry_id)
+            for description in BINARY_SENSORS
+        ]
+        if data.has_matl_station:
+            self.slot_images = [
+                FlashForgeMaterialStationSlotImage(
+                    self.hass, self.coordinator, name, self.entry_id, slot_id
+                )
+                for slot_id in range(1, IFS_SLOT_COUNT + 1)
+            ]
+        self.images = [
+            FlashForgeThumbnailImage(self.hass, self.coordinator, name, self.entry_id),
+            *self.slot_images,
+        ]
+        for entity in self.entities:
+            await entity.async_added_to_hass()
+            entity.async_write_ha_state = partial(self._write_state, entity)
+            self.coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    def _write_state(self, entity: Any) -> None:
+        self.writes += 1
+        _read_state(entity)
+
+    async def async_refresh(self) -> tuple[int, int]:
+        """Refresh as the coordinator's timer does; return (update, fan-out) in ns."""
+        coordinator = self.coordinator
+        started = time.perf_counter_ns()
+        data = await coordinator._async_update_data()
+        parsed = time.perf_counter_ns()
+        # What DataUpdateCoordinator._async_refresh does with a successful poll.
+        previous = coordinator.data
+        coordinator.data = data
+        if coordinator.always_update or data != previous:
+            coordinator.async_update_listeners()
+        return parsed - started, time.perf_counter_ns() - parsed
+
+
+def _time(func: Callable[[], None]) -> int:
+    started = time.perf_counter_ns()
+    func()
+    return time.perf_counter_ns() - started
+
+
+def _call_value_fns(entries: list[BenchmarkEntry]) -> None:
+    for entry in entries:
+        data = entry.coordinator.data
+        for sensor in entry.sensors:
+            if sensor.entity_description.value_fn:
+                sensor.entity_description.value_fn(data)
+
+
+def _read_is_on(entries: list[BenchmarkEntry]) -> None:
+    for entry in entries:
+        for binary_sensor in entry.binary_sensors:
+            _ = binary_sensor.is_on
+
+
+def _read_swatch_keys(entries: list[BenchmarkEntry]) -> None:
+    for entry in entries:
+        for image in entry.slot_images:
+            image._swatch_key()
+
+
+def _read_states(entries: list[BenchmarkEntry]) -> None:
+    for entry in entries:
+        for entity in entry.entities:
+            _read_state(entity)
+
+
+def _summary(samples: list[int]) -> dict[str, float]:
+    """Return a stage's statistics, in microseconds."""
+    micros = sorted(sample / 1000 for sample in samples)
+    return {
+        "median": round(statistics.median(micros), 2),
+        "mean": round(statistics.fmean(micros), 2),
+        "p95": round(micros[min(len(micros) - 1, int(len(micros) * 0.95))], 2),
+        "min": round(micros[0], 2),
+        "max": round(micros[-1], 2),
+    }
+
+
+async def async_run_case(pid: int, entry_count: int, rounds: int = ROUNDS) -> dict[str, Any]:
+    """Benchmark ``rounds`` refreshes of ``entry_count`` printers of one model."""
+    now = [0.0]
+    hass = SimpleNamespace(loop=asyncio.get_running_loop(), data={})
+    camera_streams = CameraStreamCache(hass)
+    entries = [
+        BenchmarkEntry(hass, camera_streams, pid, index, lambda: now[0])
+        for index in range(entry_count)
+    ]
+    samples: dict[str, list[int]] = {stage: [] for stage in STAGES}
+    try:
+        for entry in entries:
+            await entry.async_setup()
+
+        for round_index in range(WARMUP_ROUNDS + rounds):
+            now[0] += SCAN_INTERVAL
+            if round_index == WARMUP_ROUNDS:
+                writes_before = sum(entry.writes for entry in entries)
+            update = fan_out = 0
+            for entry in entries:
+                entry_update, entry_fan_out = await entry.async_refresh()
+                update += entry_update
+                fan_out += entry_fan_out
+            if round_index < WARMUP_ROUNDS:
+                continue
+            samples["refresh"].append(update + fan_out)
+            samples["update_data"].append(update)
+            samples["fan_out"].append(fan_out)
+            samples["value_fn"].append(_time(partial(_call_value_fns, entries)))
+            samples["is_on"].append(_time(partial(_read_is_on, entries)))
+            samples["swatch_key"].append(_time(partial(_read_swatch_keys, entries)))
+            samples["state_writes"].append(_time(partial(_read_states, entries)))
+    finally:
+        await asyncio.gather(*(entry.client.dispose() for entry in entries))
+
+    writes = sum(entry.writes for entry in entries) - writes_before
+    return {
+        "pid": pid,
+        "model": PRINTER_MODEL_NAMES[pid],
+        "entries": entry_count,
+        "entities": sum(len(entry.entities) for entry in entries),
+        "rounds": rounds,
+        "writes_per_refresh": round(writes / rounds, 2),
+        "stages": {stage: _summary(values) for stage, values in samples.items()},
+    }
+
+
+async def async_run(
+    pids: tuple[int, ...] = MODELS,
+    entry_counts: tuple[int, ...] = ENTRY_COUNTS,
+    rounds: int = ROUNDS,
+) -> dict[str, Any]:
+    """Run every case and return the results, ready to be written as JSON."""
+    manifest = project_root / "custom_components" / "flashforge" / "manifest.json"
+    cases = [
+        await async_run_case(pid, entry_count, rounds)
+        for pid in pids
+        for entry_count in entry_counts
+    ]
+    return {
+        "benchmark": "update_path",
+        "version": json.loads(manifest.read_text())["version"],
+        "python": platform.python_version(),
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "unit": "us",
+        "cases": cases,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Return a line per case: its median refresh against the baseline's."""
+    before = {(case["pid"], case["entries"]): case for case in baseline["cases"]}
+    lines = [f"against {baseline.get('version', '?')} ({baseline.get('created', '?')})"]
+    for case in results["cases"]:
+        now = case["stages"]["refresh"]["median"]
+        old = before.get((case["pid"], case["entries"]))
+        if old is None:
+            change = "new"
+        else:
+            then = old["stages"]["refresh"]["median"]
+            change = f"{then:>10.1f} us  {(now - then) / then:+.1%}" if then else "-"
+        lines.append(f"{case['model']:<18} {case['entries']:>4}  {now:>10.1f} us  {change}")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pid", type=int, action="append", choices=MODELS, help="benchmark only this model; repeatable")
+    parser.add_argument("--entries", type=int, action="append", help="entry count to benchmark; repeatable")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="timed refreshes per case")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="previous results to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        async_run(
+            tuple(args.pid or MODELS),
+            tuple(args.entries or ENTRY_COUNTS),
+            args.rounds,
+        )
+    )
+    print(f"{'model':<18} {'entries':>7}  {'entities':>8}  {'writes':>6}  " + "  ".join(f"{stage:>12}" for stage in STAGES))
+    for case in results["cases"]:
+        print(
+            f"{case['model']:<18} {case['entries']:>7}  {case['entities']:>8}  {case['writes_per_refresh']:>6}  "
+            + "  ".join(f"{case['stages'][stage]['median']:>12.1f}" for stage in STAGES)
+        )
+    print("Median microseconds per refresh of every entry.")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    if args.compare:
+        print("\n".join(compare(results, json.loads(args.compare.read_text()))))
+
+
+if __name__ == "__main__":
+    main()
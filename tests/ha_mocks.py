@@ -34,7 +34,8 @@ from unittest.mock import AsyncMock, MagicMock
 class Entity:
     """Stub for homeassistant.helpers.entity.Entity."""
 
-    pass
+    async def async_added_to_hass(self) -> None:
+        """Nothing to set up in the stub."""
 
 
 class CoordinatorEntity(Entity):
@@ -44,6 +45,13 @@ class CoordinatorEntity(Entity):
         """Initialize coordinator entity."""
         self.coordinator = coordinator
 
+    def _handle_coordinator_update(self) -> None:
+        """Write state, as the real one does; tests count the writes."""
+        self.async_write_ha_state()
+
+    def async_write_ha_state(self) -> None:
+        """Stub; replaced with a Mock by tests that assert on it."""
+
     def __class_getitem__(cls, item):
         """Make class subscriptable for type hints like CoordinatorEntity[Coordinator]."""
         return cls
@@ -52,15 +60,80 @@ class CoordinatorEntity(Entity):
 class DataUpdateCoordinator:
     """Stub for homeassistant.helpers.update_coordinator.DataUpdateCoordinator."""
 
-    def __init__(self, hass, logger, name: str, update_interval) -> None:
+    def __init__(
+        self, hass, logger, name: str, update_interval, always_update: bool = True
+    ) -> None:
         """Initialize the coordinator."""
         self.hass = hass
         self.logger = logger
         self.name = name
         self.update_interval = update_interval
+        self.always_update = always_update
         self.data = None
         self.last_update_success = True
         self.async_request_refresh = AsyncMock()
+        self._microsecond = 0.0
+        self.next_refresh = None
+        self._unsub_refresh = None
+        self._listeners: dict = {}
+        # The real one picks up the entry being set up from a context variable.
+        self.config_entry = None
+
+    def _schedule_refresh(self) -> None:
+        # The real one hands this time to loop.call_at; tests read it back.
+        if self.update_interval is None:
+            return
+        self.next_refresh = (
+            int(self.hass.loop.time())
+            + self._microsecond
+            + self.update_interval.total_seconds()
+        )
+        self._unsub_refresh = self._async_unsub_refresh
+
+    def _async_unsub_refresh(self) -> None:
+        self.next_refresh = None
+        self._unsub_refresh = None
+
+    async def _handle_refresh_interval(self, _now=None) -> None:
+        self._unsub_refresh = None
+        await self.async_refresh()
+
+    def async_add_listener(self, update_callback, context=None):
+        """Register a callback for updates, as the real one does."""
+
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener, None)
+
+        self._listeners[remove_listener] = update_callback
+        return remove_listener
+
+    def async_update_listeners(self) -> None:
+        """Call every registered callback."""
+        for update_callback in list(self._listeners.values()):
+            update_callback()
+
+    def async_set_updated_data(self, data) -> None:
+        self.data = data
+        self.last_update_success = True
+        self.async_update_listeners()
+
+    async def async_refresh(self) -> None:
+        """Poll once, telling listeners only what the real one would."""
+        previous_success = self.last_update_success
+        previous_data = self.data
+        try:
+            self.data = await self._async_update_data()
+            self.last_update_success = True
+        except UpdateFailed:
+            self.last_update_success = False
+        if not self.last_update_success and not previous_success:
+            return
+        if (
+            self.always_update
+            or self.last_update_success != previous_success
+            or previous_data != self.data
+        ):
+            self.async_update_listeners()
 
     def __class_getitem__(cls, item):
         """Make class subscriptable for type hints like DataUpdateCoordinator[Data]."""
@@ -88,6 +161,10 @@ class Store:
     async def async_save(self, data: Any) -> None:
         Store._data[self.key] = data
 
+    def async_delay_save(self, data_func: Any, delay: float = 0) -> None:
+        # Saved immediately: no test waits out a real delay.
+        Store._data[self.key] = data_func()
+
     @classmethod
     def reset(cls) -> None:
         cls._data = {}
@@ -138,6 +215,8 @@ class SwitchEntity(Entity):
 class ImageEntity(Entity):
     """Stub for homeassistant.components.image.ImageEntity."""
 
+    _attr_image_last_updated = None
+
     def __init__(self, hass=None, *args, **kwargs):
         # The real ImageEntity takes `hass` positionally and sets up verify_ssl
         # / access-token plumbing the tests do not exercise.
@@ -323,6 +402,7 @@ def mock_homeassistant():
 
     # UnitOfTime stub
     class UnitOfTime:
+        MILLISECONDS = "ms"
         SECONDS = "s"
         MINUTES = "min"
         HOURS = "h"
@@ -402,6 +482,7 @@ def mock_homeassistant():
     # cannot remember anything would make the interesting case untestable.
     storage_module = MagicMock()
     storage_module.Store = Store
+    storage_module.STORAGE_DIR = ".storage"
     sys.modules["homeassistant.helpers.storage"] = storage_module
 
     translation_module = MagicMock()
@@ -477,6 +558,11 @@ def mock_homeassistant():
     websocket_api_module.async_response = lambda func: func
     websocket_api_module.require_admin = lambda func: func
     websocket_api_module.async_register_command = lambda hass, handler: None
+    websocket_api_module.event_message = lambda iden, event: {
+        "id": iden,
+        "type": "event",
+        "event": event,
+    }
     sys.modules["homeassistant.components.websocket_api"] = websocket_api_module
     # `from homeassistant.components import websocket_api` reads an *attribute*
     # of the parent package, which the MagicMock above would happily invent -
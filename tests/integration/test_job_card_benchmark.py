@@ -0,0 +1,55 @@
+"""Integration tests for the job card websocket benchmark.
+
+The benchmark's request budgets are the part that guards anything: a change
+that makes a card action cost the printer another request must fail it. What is
+checked here is that today's commands stay within budget, and that one which
+stops sharing the file listing does not.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge import websocket
+from tests.benchmarks.job_card import REQUEST_BUDGETS, SCENARIOS, async_run, over_budget
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_every_scenario_is_within_its_request_budget():
+    results = await async_run(latency=0.0, iterations=2)
+
+    assert over_budget(results) == []
+    assert list(results["scenarios"]) == list(SCENARIOS)
+    open_card = results["scenarios"]["open_card"]
+    assert open_card["requests"] == {
+        "/gcodeList": 1,
+        "/gcodeThumb": REQUEST_BUDGETS["open_card"] - 1,
+    }
+    assert results["scenarios"]["start"]["requests"] == {"/detail": 1, "/printGcode": 1}
+    assert open_card["p50"] <= open_card["p95"] <= open_card["p99"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_an_extra_request_fails_the_budget(monkeypatch):
+    fetch_files = websocket._async_fetch_files
+
+    async def always_fetch(data, max_age=0):
+        return await fetch_files(data, 0)
+
+    monkeypatch.setattr(websocket, "_async_fetch_files", always_fetch)
+
+    results = await async_run(latency=0.0, iterations=1)
+
+    problems = over_budget(results)
+    assert [line.split(":")[0] for line in problems] == ["reopen_card", "pick_file", "start"]
+    assert "/gcodeList x1" in problems[1]
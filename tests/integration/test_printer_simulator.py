@@ -0,0 +1,137 @@
+"""Integration tests for the printer simulator, driven by the real API library.
+
+The simulator is only useful if the library reads it as it reads a printer.
+What is checked here is that it does, end to end over localhost: status,
+capabilities, files and thumbnails parse; job commands move the lifecycle; and
+injected faults reach the client the way real failures do.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from flashforge import FiveMClientConnectionOptions, FlashForgeClient
+from flashforge.models import MachineState
+
+from scripts.printer_simulator import (
+    FAULT_ERROR,
+    PRINTER_MODEL_NAMES,
+    SimulatedPrinter,
+    start_fleet,
+    stop_fleet,
+)
+
+
+@pytest.fixture
+async def printer():
+    printer = SimulatedPrinter(41, speed=100.0)
+    await printer.start()
+    yield printer
+    await printer.stop()
+
+
+def _client(printer: SimulatedPrinter) -> FlashForgeClient:
+    return FlashForgeClient(
+        ip_address=printer.host,
+        serial_number=printer.serial_number,
+        check_code=printer.check_code,
+        options=FiveMClientConnectionOptions(http_port=printer.http_port, http_only=True),
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_library_reads_the_simulated_printer(printer):
+    client = _client(printer)
+    try:
+        info = await client.info.get()
+        assert await client.send_product_command()
+        files = await client.files.get_recent_file_list()
+        thumbnail = await client.files.get_gcode_thumbnail(files[0].gcode_file_name)
+    finally:
+        await client.dispose()
+
+    assert info.pid == 41
+    assert info.machine_state is MachineState.READY
+    assert info.camera_stream_url == printer.camera_url
+    assert info.has_matl_station
+    assert [f.gcode_file_name for f in files] == list(printer.files)
+    assert thumbnail.startswith(b"\x89PNG")
+    assert printer.requests["/detail"] == 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_job_commands_drive_the_lifecycle(printer):
+    client = _client(printer)
+    try:
+        assert await client.job_control.print_local_file("benchy.3mf", False)
+        assert (await client.info.get()).machine_state is MachineState.HEATING
+
+        printer.start_print("benchy.3mf", (("heating", 0.0), ("printing", 3600.0), ("completed", None)))
+        assert await client.job_control.pause_print_job()
+        assert (await client.info.get()).machine_state is MachineState.PAUSED
+        assert await client.job_control.resume_print_job()
+        assert (await client.info.get()).machine_state is MachineState.PRINTING
+        assert await client.job_control.cancel_print_job()
+        assert (await client.info.get()).machine_state is MachineState.CANCELLED
+    finally:
+        await client.dispose()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_print_runs_to_completion(printer):
+    printer.start_print("calibration_cube.gcode", (("heating", 0.5), ("printing", 1.0), ("completed", None)))
+
+    assert printer.status() == "heating"
+    await asyncio.sleep(0.02)
+    assert printer.status() == "completed"
+    assert printer.detail()["detail"]["printProgress"] == 1.0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_injected_fault_and_bad_credentials_reach_the_client(printer):
+    printer.inject(FAULT_ERROR, endpoint="/detail")
+    client = _client(printer)
+    printer.check_code = "other"
+    try:
+        assert await client.info.get_detail_raw() is None
+        assert not await client.send_product_command()
+    finally:
+        await client.dispose()
+
+    assert printer.faults_served[FAULT_ERROR] == 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_fleet_covers_every_model():
+    printers = await start_fleet(len(PRINTER_MODEL_NAMES) * 2)
+    try:
+        assert {p.pid for p in printers} == set(PRINTER_MODEL_NAMES)
+        assert len({p.http_port for p in printers}) == len(printers)
+        assert len({p.serial_number for p in printers}) == len(printers)
+    finally:
+        await stop_fleet(printers)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_camera_serves_mjpeg_until_switched_off(printer):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(printer.camera_url) as response:
+            assert response.content_type == "multipart/x-mixed-replace"
+            chunk = await response.content.readuntil(b"\xff\xd9")
+            assert b"Content-Type: image/jpeg" in chunk
+
+        printer.camera_on = False
+        async with session.get(printer.camera_url) as response:
+            assert response.status == 404
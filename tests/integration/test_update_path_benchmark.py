@@ -0,0 +1,48 @@
+"""Integration tests for the coordinator-to-entity update path benchmark.
+
+The benchmark is run on demand, so nothing else would notice it breaking. What
+is checked here is that a short run completes for every model, that each
+refresh really reaches the entities, and that results round-trip through JSON
+and compare against an earlier run.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.benchmarks.update_path import MODELS, STAGES, async_run, compare
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_short_run_covers_every_model_and_stage():
+    results = await async_run(MODELS, (1, 3), rounds=2)
+
+    assert [(case["pid"], case["entries"]) for case in results["cases"]] == [
+        (pid, entries) for pid in MODELS for entries in (1, 3)
+    ]
+    for case in results["cases"]:
+        assert set(case["stages"]) == set(STAGES)
+        assert case["stages"]["refresh"]["median"] > 0
+        # Mid-print, progress moves every poll: something is always written.
+        assert case["writes_per_refresh"] > 0
+    by_case = {(case["pid"], case["entries"]): case for case in results["cases"]}
+    assert by_case[(35, 3)]["entities"] == 3 * by_case[(35, 1)]["entities"]
+    # The AD5X has a Material Station, so it has slot swatches to time.
+    assert by_case[(38, 1)]["entities"] > by_case[(35, 1)]["entities"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_results_round_trip_and_compare():
+    results = json.loads(json.dumps(await async_run((41,), (1,), rounds=2)))
+
+    lines = compare(results, results)
+
+    assert len(lines) == 2
+    assert lines[1].split()[-1] == "+0.0%"
@@ -3,6 +3,7 @@
 import sys
 from pathlib import Path
 from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
@@ -30,7 +31,7 @@ async def test_camera_entity_uses_printer_reported_stream_url():
     """The camera entity should expose the current stream URL from coordinator data."""
     stream_url = "http://192.168.1.120:8080/?action=stream"
     coordinator = _build_coordinator(stream_url)
-    camera = FlashForgeCamera(coordinator, "Printer", "entry-id")
+    camera = FlashForgeCamera(coordinator, "Printer", "entry-id", Mock())
 
     assert camera.available is True
     assert await camera.stream_source() == stream_url
@@ -41,7 +42,7 @@ async def test_camera_entity_uses_printer_reported_stream_url():
 async def test_camera_entity_becomes_unavailable_without_stream_url():
     """The camera entity should be unavailable when the printer stops reporting a stream URL."""
     coordinator = _build_coordinator("http://192.168.1.120:8080/?action=stream")
-    camera = FlashForgeCamera(coordinator, "Printer", "entry-id")
+    camera = FlashForgeCamera(coordinator, "Printer", "entry-id", Mock())
 
     coordinator.data.camera_stream_url = ""
 
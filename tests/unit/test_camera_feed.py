@@ -0,0 +1,291 @@
+"""Unit tests for the shared camera feed.
+
+What matters is what the printer sees: one connection however many viewers
+there are, and frames for a slow viewer dropped rather than queued behind it.
+The MJPEG parser is checked against both framings cameras use - with and
+without a Content-Length per part - and against chunks that split anywhere.
+Stills should come from the last frame whenever it is fresh enough, and a
+capped viewer should get the rate and width it was promised.
+"""
+
+import asyncio
+import sys
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge import camera_feed
+from custom_components.flashforge.camera_feed import (
+    CLIENT_QUEUE_SIZE,
+    CameraFeed,
+    MjpegParser,
+    downscale_jpeg,
+)
+
+STREAM_URL = "http://192.168.1.120:8080/?action=stream"
+
+
+def jpeg(payload: bytes) -> bytes:
+    return b"\xff\xd8" + payload + b"\xff\xd9"
+
+
+def part(frame: bytes, *, content_length: bool = True) -> bytes:
+    headers = b"--boundarydonotcross\r\nContent-Type: image/jpeg\r\n"
+    if content_length:
+        headers += b"Content-Length: %d\r\n" % len(frame)
+    return headers + b"\r\n" + frame + b"\r\n"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("content_length", [True, False])
+def test_parser_survives_any_chunking(content_length):
+    frames = [jpeg(b"one"), jpeg(b"two" * 50), jpeg(b"three")]
+    stream = b"".join(part(frame, content_length=content_length) for frame in frames)
+
+    for size in (1, 2, 7, len(stream)):
+        parser = MjpegParser()
+        parsed = []
+        for offset in range(0, len(stream), size):
+            parsed += parser.feed(stream[offset : offset + size])
+        assert parsed == frames, size
+
+
+@pytest.mark.unit
+def test_parser_trusts_content_length_over_markers():
+    """An embedded EXIF thumbnail has its own end marker mid-frame."""
+    frame = jpeg(b"exif" + jpeg(b"thumb") + b"rest")
+
+    assert MjpegParser().feed(part(frame)) == [frame]
+
+
+class FakeUpstream:
+    """The printer's stream: chunks the test pushes, to every connection."""
+
+    def __init__(self):
+        self.chunks: asyncio.Queue[bytes] = asyncio.Queue()
+        self.connections = 0
+
+    def get(self, url, timeout=None):
+        return self._Response(self)
+
+    class _Response:
+        def __init__(self, upstream):
+            self._upstream = upstream
+            self.content = self
+
+        async def __aenter__(self):
+            self._upstream.connections += 1
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        async def iter_any(self):
+            while True:
+                yield await self._upstream.chunks.get()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(camera_feed, "async_get_clientsession", lambda hass: fake)
+    return fake
+
+
+@pytest.fixture
+async def feed():
+    hass = Mock()
+    hass.loop = asyncio.get_running_loop()
+    hass.async_create_background_task = lambda coro, name: asyncio.ensure_future(coro)
+    hass.async_add_executor_job = lambda func, *args: hass.loop.run_in_executor(
+        None, func, *args
+    )
+    coordinator = SimpleNamespace(data=SimpleNamespace(camera_stream_url=STREAM_URL))
+    feed = CameraFeed(hass, coordinator)
+    yield feed
+    await feed.async_stop()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_viewers_share_one_upstream_connection(feed, upstream):
+    viewers = [feed.subscribe() for _ in range(5)]
+    await settle()
+
+    upstream.chunks.put_nowait(part(jpeg(b"frame")))
+    await settle()
+
+    assert upstream.connections == 1
+    assert [viewer.get_nowait() for viewer in viewers] == [jpeg(b"frame")] * 5
+    assert feed.last_frame == jpeg(b"frame")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_slow_viewer_drops_its_oldest_frames(feed, upstream):
+    slow = feed.subscribe()
+    await settle()
+
+    for index in range(CLIENT_QUEUE_SIZE + 3):
+        upstream.chunks.put_nowait(part(jpeg(b"%d" % index)))
+    await settle()
+
+    received = [slow.get_nowait() for _ in range(slow.qsize())]
+    assert received == [jpeg(b"3"), jpeg(b"4")]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_connection_closes_after_the_last_viewer_lingers_out(
+    feed, upstream, monkeypatch
+):
+    monkeypatch.setattr(camera_feed, "_LINGER", 0)
+    viewer = feed.subscribe()
+    await settle()
+
+    feed.unsubscribe(viewer)
+    await settle()
+
+    assert feed._task is None
+    assert feed.subscribers == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fresh_snapshot_is_served_from_the_last_frame(feed, upstream):
+    viewer = feed.subscribe()
+    await settle()
+    upstream.chunks.put_nowait(part(jpeg(b"live")))
+    await settle()
+
+    assert await feed.async_snapshot(max_age=10) == jpeg(b"live")
+    assert (feed.snapshot_hits, feed.snapshot_misses) == (1, 0)
+    assert upstream.connections == 1
+    feed.unsubscribe(viewer)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stale_snapshot_grabs_one_frame_and_lets_go(feed, upstream):
+    snapshot = asyncio.ensure_future(feed.async_snapshot(max_age=10))
+    await settle()
+    upstream.chunks.put_nowait(part(jpeg(b"still")))
+
+    assert await snapshot == jpeg(b"still")
+    assert feed.snapshot_misses == 1
+    # A still alone does not keep the stream open for the linger period.
+    assert feed._task is None
+
+
+def camera_jpeg(width, height):
+    buf = BytesIO()
+    Image.new("RGB", (width, height), "orange").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+@pytest.mark.unit
+def test_downscale_keeps_the_aspect_ratio():
+    scaled = downscale_jpeg(camera_jpeg(1280, 720), 640)
+
+    with Image.open(BytesIO(scaled)) as img:
+        assert img.size == (640, 360)
+
+
+@pytest.mark.unit
+def test_downscale_leaves_narrow_frames_alone():
+    frame = camera_jpeg(320, 240)
+
+    assert downscale_jpeg(frame, 640) is frame
+
+
+class FakeResponse:
+    """Records what a viewer is sent."""
+
+    def __init__(self):
+        self.headers = {}
+        self.frames = []
+
+    async def prepare(self, request):
+        pass
+
+    async def write(self, data):
+        self.frames.append(data.split(b"\r\n\r\n", 1)[1][:-2])
+
+
+@pytest.fixture
+def response(monkeypatch):
+    fake = FakeResponse()
+    monkeypatch.setattr(camera_feed.web, "StreamResponse", lambda: fake)
+    return fake
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_capped_viewer_gets_the_capped_rate(feed, upstream, response, monkeypatch):
+    now = [100.0]
+    # The module's clock only: the event loop keeps the real one.
+    monkeypatch.setattr(camera_feed, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    viewer = asyncio.ensure_future(feed.async_handle_request(Mock(), max_fps=5))
+    await settle()
+    # Sixteen frames a second for one second.
+    for index in range(16):
+        now[0] = 100.0 + index / 16
+        upstream.chunks.put_nowait(part(jpeg(b"%d" % index)))
+        await settle()
+    viewer.cancel()
+
+    assert response.frames == [jpeg(b"0"), jpeg(b"4"), jpeg(b"7"), jpeg(b"10"), jpeg(b"13")]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_downscaled_viewer_gets_narrow_frames(feed, upstream, response):
+    viewer = asyncio.ensure_future(feed.async_handle_request(Mock(), max_width=640))
+    await settle()
+    upstream.chunks.put_nowait(part(camera_jpeg(1280, 720)))
+    while not response.frames:
+        await asyncio.sleep(0.01)
+    viewer.cancel()
+
+    with Image.open(BytesIO(response.frames[0])) as img:
+        assert img.width == 640
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_viewer_of_a_silent_camera_leaves_when_its_client_does(
+    feed, upstream, response, monkeypatch
+):
+    monkeypatch.setattr(camera_feed, "_CLIENT_CHECK", 0.01)
+    request = SimpleNamespace(transport=Mock(is_closing=Mock(return_value=False)))
+    viewer = asyncio.ensure_future(feed.async_handle_request(request))
+    await asyncio.sleep(0.05)
+    # Still connected: it keeps waiting for the camera.
+    assert not viewer.done()
+    assert feed.subscribers == 1
+
+    request.transport.is_closing.return_value = True
+    await asyncio.wait_for(viewer, 1)
+
+    assert feed.subscribers == 0
+    assert response.frames == []
@@ -0,0 +1,139 @@
+"""Unit tests for the remembered camera stream detection.
+
+Firmware that never reports its stream URL used to be probed for it on every
+poll. What is checked here is that an answer is reused - across restarts too -
+until it is stale, the printer moves, or the feed cannot read the stream.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import Store, mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge import camera_stream
+from custom_components.flashforge.camera_stream import (
+    DETECTED_TTL,
+    MISSING_TTL,
+    CameraStreamCache,
+)
+from custom_components.flashforge.coordinator import FlashForgeDataUpdateCoordinator
+
+URL = "http://192.168.1.111:8080/?action=stream"
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    Store.reset()
+    now = [1_000_000.0]
+    monkeypatch.setattr(camera_stream, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _client(url=URL, ip="192.168.1.111"):
+    client = Mock()
+    client.ip_address = ip
+    client.detect_camera_stream = AsyncMock(return_value=url)
+    return client
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_answer_is_reused_until_it_is_stale(clock):
+    cache = CameraStreamCache(Mock())
+    client = _client()
+
+    assert await cache.async_detect("entry", client) == URL
+    clock[0] += DETECTED_TTL - 1
+    assert await cache.async_detect("entry", client) == URL
+    assert client.detect_camera_stream.await_count == 1
+
+    clock[0] += 2
+    await cache.async_detect("entry", client)
+    assert client.detect_camera_stream.await_count == 2
+    assert cache.as_dict("entry")["probes"] == 2
+    assert cache.as_dict("entry")["hits"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_answer_survives_a_restart():
+    await CameraStreamCache(Mock()).async_detect("entry", _client())
+
+    client = _client()
+    assert await CameraStreamCache(Mock()).async_detect("entry", client) == URL
+    client.detect_camera_stream.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_no_camera_is_rechecked_sooner(clock):
+    cache = CameraStreamCache(Mock())
+    client = _client(url="")
+
+    assert await cache.async_detect("entry", client) == ""
+    clock[0] += MISSING_TTL + 1
+    await cache.async_detect("entry", client)
+
+    assert client.detect_camera_stream.await_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_new_address_is_probed():
+    cache = CameraStreamCache(Mock())
+    await cache.async_detect("entry", _client())
+
+    moved = _client(url="http://192.168.1.112:8080/?action=stream", ip="192.168.1.112")
+    assert await cache.async_detect("entry", moved) == moved.detect_camera_stream.return_value
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unreadable_detected_stream_is_probed_on_the_next_poll():
+    cache = CameraStreamCache(Mock())
+    client = _client()
+    client.info.get = AsyncMock(side_effect=lambda: SimpleNamespace(camera_stream_url=""))
+    client.cache_details = Mock()
+    coordinator = FlashForgeDataUpdateCoordinator(
+        Mock(), client, "Printer", 10, entry_id="entry", camera_streams=cache
+    )
+
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+    assert client.detect_camera_stream.await_count == 1
+    assert coordinator.camera_stream_detected
+
+    coordinator.async_camera_stream_failed()
+    result = await coordinator._async_update_data()
+
+    assert result.camera_stream_url == URL
+    assert client.detect_camera_stream.await_count == 2
+    assert cache.as_dict("entry")["invalidations"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reported_stream_failure_does_not_invalidate():
+    cache = CameraStreamCache(Mock())
+    cache.async_invalidate = Mock()
+    client = _client()
+    client.info.get = AsyncMock(return_value=SimpleNamespace(camera_stream_url=URL))
+    client.cache_details = Mock()
+    coordinator = FlashForgeDataUpdateCoordinator(
+        Mock(), client, "Printer", 10, entry_id="entry", camera_streams=cache
+    )
+
+    await coordinator._async_update_data()
+    coordinator.async_camera_stream_failed()
+
+    client.detect_camera_stream.assert_not_awaited()
+    cache.async_invalidate.assert_not_called()
@@ -27,6 +27,7 @@ mock_homeassistant()
 from custom_components.flashforge.const import DOMAIN
 from custom_components.flashforge.image import IFS_SLOT_COUNT
 from custom_components.flashforge.image import async_setup_entry as image_setup_entry
+from custom_components.flashforge.request_stats import RequestStats
 from custom_components.flashforge.sensor import async_setup_entry as sensor_setup_entry
 
 
@@ -66,7 +67,15 @@ def _setup_args(coordinator):
     entry = Mock()
     entry.entry_id = "entry-1"
     entry.async_on_unload = Mock()
-    hass.data = {DOMAIN: {entry.entry_id: {"coordinator": coordinator, "name": "Printer"}}}
+    hass.data = {
+        DOMAIN: {
+            entry.entry_id: {
+                "coordinator": coordinator,
+                "name": "Printer",
+                "request_stats": RequestStats(),
+            }
+        }
+    }
 
     added = []
 
@@ -12,10 +12,10 @@ These tests pin the distinction: only a printer that answered and refused
 produces `invalid_auth`.
 """
 
+import asyncio
 import json
 import sys
 from pathlib import Path
-from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
@@ -28,12 +28,14 @@ from tests.ha_mocks import mock_homeassistant
 mock_homeassistant()
 sys.modules["voluptuous"] = MagicMock()
 
+from custom_components.flashforge import config_flow
 from custom_components.flashforge.config_flow import (
     FlashForgeResponseError,
     InvalidAuthError,
     UnsupportedPrinterError,
     validate_connection,
 )
+from custom_components.flashforge.http_pool import async_get_http_pool
 from homeassistant.const import CONF_IP_ADDRESS, CONF_NAME
 
 ENTRY = {
@@ -44,24 +46,27 @@ ENTRY = {
 }
 
 
-def _client(*, detail=None, machine_info=True, product_ok=True, get_raises=None) -> Mock:
+def _hass() -> Mock:
+    """A hass mock the flow can take a hold on the connection pool from."""
+    hass = Mock()
+    hass.data = {}
+    return hass
+
+
+def _client(*, detail=None, product_ok=True) -> Mock:
     """Build a mock client.
 
     `detail` is a raw dict now, not a parsed model: the flow reads identity off
     the undecoded /detail payload so the supported-model gate cannot be blocked
-    by an unrelated field failing validation.
+    by an unrelated field failing validation, then validates that same payload.
     """
     client = Mock()
     client.info.get_detail_raw = AsyncMock(
         return_value={"code": 0, "detail": detail} if detail is not None else None
     )
-    client.info.get = AsyncMock(
-        return_value=SimpleNamespace(name="Creator 5 Pro") if machine_info else None,
-        side_effect=get_raises,
-    )
+    client.info.get = AsyncMock()
     client.cache_details = Mock()
     client.send_product_command = AsyncMock(return_value=product_ok)
-    client._http_session = None
     return client
 
 
@@ -73,7 +78,7 @@ async def test_rejected_credentials_raise_invalid_auth():
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
         with pytest.raises(InvalidAuthError):
-            await validate_connection(Mock(), ENTRY)
+            await validate_connection(_hass(), ENTRY)
 
 
 @pytest.mark.unit
@@ -88,23 +93,33 @@ async def test_unreadable_detail_is_not_reported_as_bad_credentials():
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
         with pytest.raises(ConnectionError) as excinfo:
-            await validate_connection(Mock(), ENTRY)
+            await validate_connection(_hass(), ENTRY)
 
+    # The product command went out alongside and was accepted; it is the
+    # missing detail that decides the error.
     assert not isinstance(excinfo.value, InvalidAuthError)
-    client.send_product_command.assert_not_awaited()
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_unparseable_machine_info_is_not_reported_as_bad_credentials():
-    """Same rule for the second /detail read, which parses into FFMachineInfo."""
-    client = _client(detail={"pid": 41, "name": "Creator 5 Pro"}, machine_info=False)
+async def test_detail_is_read_once_and_parsed_from_the_same_payload():
+    """The identity gate and the validated machine info share one /detail read."""
+    client = _client(detail={"pid": 41, "name": "Creator 5 Pro"})
+    hass = _hass()
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
-        with pytest.raises(ConnectionError) as excinfo:
-            await validate_connection(Mock(), ENTRY)
+        result = await validate_connection(hass, ENTRY)
 
-    assert not isinstance(excinfo.value, InvalidAuthError)
+    # The check rode the shared pool and let go of it.
+    session = client._http_session
+    assert session.connector_owner is False
+    assert session.closed
+    assert async_get_http_pool(hass).users == 0
+
+    assert result["machine_name"] == "Creator 5 Pro"
+    client.info.get_detail_raw.assert_awaited_once()
+    client.info.get.assert_not_awaited()
+    assert client.cache_details.call_args.args[0].name == "Creator 5 Pro"
 
 
 @pytest.mark.unit
@@ -161,14 +176,11 @@ async def test_unreadable_response_propagates_as_its_own_error_type():
     check their network for three releases. The error has to stay distinguishable
     all the way up to the message the user reads.
     """
-    client = _client(
-        detail={"pid": 40, "name": "Creator 5"},
-        get_raises=FlashForgeResponseError("chamberTemp out of range"),
-    )
+    client = _client(detail={"pid": 40, "name": "Creator 5", "chamberTemp": "unreadable"})
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
         with pytest.raises(FlashForgeResponseError):
-            await validate_connection(Mock(), ENTRY)
+            await validate_connection(_hass(), ENTRY)
 
 
 @pytest.mark.unit
@@ -199,17 +211,12 @@ async def test_supported_gate_reads_pid_before_validation():
     Reading the raw payload means the model check happens first and the
     unreadable-response path is reported for what it is.
     """
-    client = _client(
-        detail={"pid": 40, "name": "Creator 5", "chamberTemp": -108},
-        get_raises=FlashForgeResponseError("chamberTemp out of range"),
-    )
+    client = _client(detail={"pid": 40, "name": "Creator 5", "chamberTemp": "unreadable"})
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
+        # Crucially NOT UnsupportedPrinterError - the model gate passed on pid 40.
         with pytest.raises(FlashForgeResponseError):
-            await validate_connection(Mock(), ENTRY)
-
-    # Crucially NOT UnsupportedPrinterError - the model gate passed on pid 40.
-    client.info.get.assert_awaited()
+            await validate_connection(_hass(), ENTRY)
 
 
 @pytest.mark.unit
@@ -220,4 +227,49 @@ async def test_unsupported_printer_still_wins_over_auth():
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
         with pytest.raises(UnsupportedPrinterError):
-            await validate_connection(Mock(), ENTRY)
+            await validate_connection(_hass(), ENTRY)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_requests_are_issued_together():
+    """Both requests are in flight before either of them answers."""
+    started = []
+    release = asyncio.Event()
+
+    def request(name, result):
+        async def _request():
+            started.append(name)
+            await release.wait()
+            return result
+
+        return _request
+
+    client = _client()
+    client.info.get_detail_raw = request(
+        "detail_raw", {"code": 0, "detail": {"pid": 41, "name": "Creator 5 Pro"}}
+    )
+    client.send_product_command = request("product", True)
+
+    with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
+        validation = asyncio.ensure_future(validate_connection(_hass(), ENTRY))
+        for _ in range(2):
+            await asyncio.sleep(0)
+        assert sorted(started) == ["detail_raw", "product"]
+        release.set()
+        assert (await validation)["machine_name"] == "Creator 5 Pro"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_shared_timeout_is_reported_as_a_connection_problem(monkeypatch):
+    """A printer that never answers runs out the one budget, not two."""
+    client = _client(detail={"pid": 41, "name": "Creator 5 Pro"})
+    client.send_product_command = AsyncMock(side_effect=asyncio.Event().wait)
+    monkeypatch.setattr(config_flow, "VALIDATE_TIMEOUT", 0.01)
+
+    with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
+        with pytest.raises(ConnectionError) as excinfo:
+            await validate_connection(_hass(), ENTRY)
+
+    assert not isinstance(excinfo.value, InvalidAuthError)
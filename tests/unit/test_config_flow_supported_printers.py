@@ -97,21 +97,25 @@ def test_supported_detail_falls_back_to_name_when_pid_missing():
     assert _is_supported_detail(SimpleNamespace(pid=None, name="Adventurer 4")) is False
 
 
+def _hass() -> Mock:
+    """A hass mock the flow can take a hold on the connection pool from."""
+    hass = Mock()
+    hass.data = {}
+    return hass
+
+
 def _make_validate_client(detail: SimpleNamespace) -> Mock:
     """Build a Mock FlashForgeClient serving ``detail`` from get_detail_raw.
 
     The flow reads identity from the undecoded payload, so the mock hands back a
     dict - see `_is_supported_detail`, which accepts either form.
     """
-    machine_info = SimpleNamespace(name=detail.name)
     client = Mock()
     client.info.get_detail_raw = AsyncMock(
         return_value={"code": 0, "detail": {"pid": detail.pid, "name": detail.name}}
     )
-    client.info.get = AsyncMock(return_value=machine_info)
     client.cache_details = Mock()
     client.send_product_command = AsyncMock(return_value=True)
-    client._http_session = None
     return client
 
 
@@ -126,7 +130,7 @@ async def test_validate_connection_rejects_legacy_printers():
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
         with pytest.raises(UnsupportedPrinterError):
             await validate_connection(
-                Mock(),
+                _hass(),
                 {
                     CONF_NAME: "Legacy Printer",
                     CONF_IP_ADDRESS: "192.168.1.50",
@@ -135,8 +139,6 @@ async def test_validate_connection_rejects_legacy_printers():
                 },
             )
 
-    client.send_product_command.assert_not_awaited()
-
 
 @pytest.mark.unit
 @pytest.mark.asyncio
@@ -148,7 +150,7 @@ async def test_validate_connection_accepts_renamed_5m_by_pid():
 
     with patch("custom_components.flashforge.config_flow.FlashForgeClient", return_value=client):
         result = await validate_connection(
-            Mock(),
+            _hass(),
             {
                 CONF_NAME: "Workshop Printer",
                 CONF_IP_ADDRESS: "192.168.3.10",
@@ -1,6 +1,7 @@
 """Unit tests for the FlashForge data coordinator."""
 
 import sys
+from datetime import timedelta
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
@@ -14,8 +15,14 @@ from tests.ha_mocks import mock_homeassistant
 
 mock_homeassistant()
 
-from custom_components.flashforge.coordinator import FlashForgeDataUpdateCoordinator
+from custom_components.flashforge.coordinator import (
+    MAX_BACKOFF_INTERVAL,
+    POLL_DURATION_WINDOW,
+    FlashForgeDataUpdateCoordinator,
+)
+from custom_components.flashforge.sensor import POLL_SENSORS, FlashForgePollSensor
 from flashforge import FlashForgeResponseError
+from flashforge.models import MachineState
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 
@@ -99,3 +106,203 @@ async def test_transport_failures_keep_the_communication_wording(caplog):
         await coordinator._async_update_data()
 
     assert "Error communicating" in str(excinfo.value)
+
+
+def _polling_coordinator(state, scan_interval=10):
+    """A coordinator whose printer reports `state` on every poll."""
+    client = Mock()
+    client.info = Mock()
+    client.info.get = AsyncMock(
+        return_value=SimpleNamespace(
+            machine_state=state,
+            camera_stream_url="http://192.168.1.120:8080/?action=stream",
+        )
+    )
+    client.cache_details = Mock()
+    return FlashForgeDataUpdateCoordinator(Mock(), client, "Printer", scan_interval), client
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "state",
+    [MachineState.HEATING, MachineState.PRINTING, MachineState.PAUSING, MachineState.UNKNOWN],
+)
+async def test_active_printer_is_polled_at_the_configured_interval(state):
+    """Anything not known to be idle polls at the user's scan interval."""
+    coordinator, _ = _polling_coordinator(state)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("state", [MachineState.READY, MachineState.COMPLETED])
+async def test_idle_printer_is_polled_less_often(state):
+    """An idle printer slows down, but never past the idle ceiling."""
+    coordinator, _ = _polling_coordinator(state)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_idle_interval_never_drops_below_the_configured_interval():
+    """A long scan interval is a floor: idling must not poll faster than it."""
+    coordinator, _ = _polling_coordinator(MachineState.READY, scan_interval=300)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.update_interval == timedelta(seconds=300)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unreachable_printer_backs_off_exponentially_and_recovers():
+    """Each failed poll doubles the interval up to the cap; one success resets it."""
+    coordinator, client = _polling_coordinator(MachineState.PRINTING)
+    reply = client.info.get.return_value
+    client.info.get.side_effect = OSError("Network unreachable")
+
+    seen = []
+    for _ in range(7):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        seen.append(coordinator.update_interval.total_seconds())
+
+    assert seen == [20, 40, 80, 160, MAX_BACKOFF_INTERVAL, MAX_BACKOFF_INTERVAL, MAX_BACKOFF_INTERVAL]
+    assert coordinator.consecutive_failures == 7
+
+    client.info.get.side_effect = None
+    client.info.get.return_value = reply
+    await coordinator._async_update_data()
+
+    assert coordinator.consecutive_failures == 0
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_setup_reading_takes_the_place_of_the_first_poll():
+    """Seeding with setup's /detail read must not ask the printer again."""
+    coordinator, client = _polling_coordinator(MachineState.READY)
+    reading = SimpleNamespace(machine_state=MachineState.READY, camera_stream_url="")
+    client.detect_camera_stream = AsyncMock(return_value="http://printer:8080/?action=stream")
+    coordinator.hass.loop.time = Mock(return_value=42.5)
+
+    await coordinator.async_set_initial_data(reading, 42.0)
+
+    client.info.get.assert_not_awaited()
+    assert coordinator.data is reading
+    assert reading.camera_stream_url == "http://printer:8080/?action=stream"
+    # Scheduled as a poll would have been: idle rate, from when it was made.
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert coordinator._poll_started == 42.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_every_poll_is_timed_and_reported_failed_or_not():
+    """Poll listeners hear about every poll, repeated failures included.
+
+    Coordinator listeners are not told about a failure after a failure, which is
+    exactly when the consecutive-failure and staleness figures keep moving.
+    """
+    coordinator, client = _polling_coordinator(MachineState.PRINTING)
+    reply = client.info.get.return_value
+    heard = []
+    remove = coordinator.async_add_poll_listener(
+        lambda: heard.append(coordinator.consecutive_failures)
+    )
+    assert coordinator.last_poll_duration is None
+    assert coordinator.seconds_since_success is None
+
+    await coordinator._async_update_data()
+    assert coordinator.seconds_since_success < 1
+    succeeded_at = coordinator.last_success_time
+    assert succeeded_at is not None
+
+    client.info.get.side_effect = OSError("Network unreachable")
+    for _ in range(2):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    assert heard == [0, 1, 2]
+    assert coordinator.last_poll_duration >= 0
+    assert coordinator.poll_duration_p95 >= coordinator.last_poll_duration
+    # Still counted from the one good poll, not from the failures.
+    assert coordinator.seconds_since_success is not None
+    assert coordinator.last_success_time == succeeded_at
+
+    remove()
+    client.info.get.side_effect = None
+    client.info.get.return_value = reply
+    await coordinator._async_update_data()
+    assert heard == [0, 1, 2]
+
+
+@pytest.mark.unit
+def test_poll_duration_p95_covers_the_most_recent_polls():
+    coordinator, _ = _polling_coordinator(MachineState.PRINTING)
+    coordinator._poll_durations.append(30.0)  # pushed out of the window below
+    coordinator._poll_durations.extend(i / 100 for i in range(1, POLL_DURATION_WINDOW + 1))
+
+    assert coordinator.poll_duration_p95 == 0.95
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_setup_reading_counts_as_a_successful_poll():
+    """Setup's read is timed like the poll it replaces, so nothing waits a poll."""
+    coordinator, _ = _polling_coordinator(MachineState.READY)
+    coordinator.hass.loop.time = Mock(return_value=42.25)
+    reading = SimpleNamespace(machine_state=MachineState.READY, camera_stream_url="x")
+    heard = []
+    coordinator.async_add_poll_listener(lambda: heard.append(coordinator.last_poll_duration))
+
+    await coordinator.async_set_initial_data(reading, 42.0)
+
+    assert heard == [0.25]
+    assert coordinator.poll_duration_p95 == 0.25
+    assert coordinator.seconds_since_success < 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_poll_sensors_are_written_after_every_poll():
+    coordinator, client = _polling_coordinator(MachineState.PRINTING)
+    sensors = {
+        description.key: FlashForgePollSensor(coordinator, description, "Printer", "entry-1")
+        for description in POLL_SENSORS
+    }
+    for sensor in sensors.values():
+        sensor.async_on_remove = Mock()
+        sensor.async_write_ha_state = Mock()
+        await sensor.async_added_to_hass()
+
+    client.info.get.side_effect = OSError("Network unreachable")
+    for _ in range(2):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    failures = sensors["consecutive_poll_failures"]
+    assert failures.available
+    assert failures.native_value == 2
+    assert failures.async_write_ha_state.call_count == 2
+    assert sensors["poll_interval"].native_value == 40
+    assert sensors["poll_duration"].native_value >= 0
+    assert sensors["last_successful_update"].native_value is None
+    assert not any(
+        sensor.entity_description.entity_registry_enabled_default
+        for sensor in sensors.values()
+    )
+
+    client.info.get.side_effect = None
+    await coordinator._async_update_data()
+    last_success = sensors["last_successful_update"]
+    assert last_success.native_value == coordinator.last_success_time
+    assert last_success.native_value.tzinfo is not None
@@ -0,0 +1,371 @@
+"""Unit tests for the fleet poll scheduler and the fleet summary.
+
+Printers set up together used to poll in the same second forever. What is
+checked here is where polls land - an even spread across the interval, a full
+interval apart start to start - and that the concurrency cap holds however many
+printers ask at once. The summary's totals must match a full recount after any
+sequence of changes, and wake the fleet's sensors only when they move.
+"""
+
+import asyncio
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from flashforge.models import MachineState
+
+from custom_components.flashforge import fleet as fleet_module
+from custom_components.flashforge import sensor as sensor_module
+from custom_components.flashforge.coordinator import FlashForgeDataUpdateCoordinator
+from custom_components.flashforge.fleet import FleetScheduler, FleetSummary
+from custom_components.flashforge.sensor import FLEET_SENSORS, FlashForgeFleetSensor
+
+
+def printers(fleet, count):
+    members = [object() for _ in range(count)]
+    for member in members:
+        fleet.async_register(member)
+    return members
+
+
+@pytest.mark.unit
+def test_printers_are_spread_evenly_across_the_interval():
+    fleet = FleetScheduler()
+    members = printers(fleet, 4)
+
+    slots = [fleet.next_poll(member, 10, 100.0, 100.0) for member in members]
+
+    assert slots == [110.0, 112.5, 115.0, 117.5]
+
+
+@pytest.mark.unit
+def test_a_late_start_keeps_the_printer_on_its_phase():
+    fleet = FleetScheduler()
+    _, second = printers(fleet, 2)
+
+    # Polled 40 ms after its 105 s slot, and took two seconds.
+    slot = fleet.next_poll(second, 10, 105.04, 107.04)
+
+    assert slot == 115.0
+
+
+@pytest.mark.unit
+def test_phases_close_up_when_a_printer_leaves():
+    fleet = FleetScheduler()
+    first, second = printers(fleet, 2)
+
+    fleet.async_unregister(first)
+
+    assert fleet.phase(second) == 0.0
+    assert len(fleet) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrency_cap_holds_across_printers():
+    fleet = FleetScheduler(max_concurrent=2)
+    peak = 0
+
+    async def poll():
+        nonlocal peak
+        async with fleet.async_poll():
+            peak = max(peak, fleet.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(poll() for _ in range(6)))
+
+    assert peak == 2
+    assert fleet.polls == 6
+    assert (fleet.in_flight, fleet.waiting) == (0, 0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_latency_and_failures_are_reported(monkeypatch):
+    fleet = FleetScheduler()
+    now = [0.0]
+    monkeypatch.setattr(fleet_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    for duration in (0.1, 0.2, 0.3, 0.4):
+        async with fleet.async_poll():
+            now[0] += duration
+    with pytest.raises(RuntimeError):
+        async with fleet.async_poll():
+            now[0] += 2.0
+            raise RuntimeError
+
+    assert fleet.as_dict()["failures"] == 1
+    assert fleet.latency() == {"p50": 0.3, "p95": 2.0, "max": 2.0}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_coordinator_schedules_its_next_poll_on_its_phase():
+    hass = Mock()
+    clock = [100.0]
+    hass.loop.time = lambda: clock[0]
+    client = Mock()
+    client.info.get = AsyncMock(return_value=SimpleNamespace(camera_stream_url="url"))
+    fleet = FleetScheduler()
+    other = object()
+    fleet.async_register(other)
+    coordinator = FlashForgeDataUpdateCoordinator(hass, client, "Printer", 10, fleet=fleet)
+    fleet.async_register(coordinator)
+
+    await coordinator._async_update_data()
+    clock[0] = 100.7
+    coordinator._schedule_refresh()
+
+    assert coordinator.update_interval == timedelta(seconds=10)
+    # Home Assistant's own timer is cancelled in favour of the fleet's slot.
+    assert coordinator.next_refresh is None
+    hass.loop.call_at.assert_called_once()
+    assert hass.loop.call_at.call_args.args[0] == pytest.approx(115.0)
+    assert coordinator._unsub_refresh == hass.loop.call_at.return_value.cancel
+    assert fleet.polls == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_a_scheduled_poll_runs_as_the_entry_s_background_task():
+    """Not a tracked task: a fleet nearly always has a poll pending."""
+    hass = Mock()
+    hass.loop.time = lambda: 100.0
+    client = Mock()
+    client.info.get = AsyncMock(return_value=SimpleNamespace(camera_stream_url="url"))
+    fleet = FleetScheduler()
+    coordinator = FlashForgeDataUpdateCoordinator(hass, client, "Printer", 10, fleet=fleet)
+    coordinator.config_entry = Mock(title="Printer")
+    fleet.async_register(coordinator)
+
+    coordinator._schedule_refresh()
+    hass.loop.call_at.call_args.args[1]()
+
+    create = coordinator.config_entry.async_create_background_task
+    create.assert_called_once()
+    assert create.call_args.args[0] is hass
+    assert create.call_args.kwargs["eager_start"] is True
+    hass.async_create_task.assert_not_called()
+    await create.call_args.args[1]
+    client.info.get.assert_awaited_once()
+
+
+@pytest.mark.unit
+def test_coordinator_without_an_interval_is_not_scheduled():
+    hass = Mock()
+    fleet = FleetScheduler()
+    coordinator = FlashForgeDataUpdateCoordinator(hass, Mock(), "Printer", 10, fleet=fleet)
+    fleet.async_register(coordinator)
+    coordinator.update_interval = None
+
+    coordinator._schedule_refresh()
+
+    hass.loop.call_at.assert_not_called()
+
+
+class FakeCoordinator:
+    """Publishes a printer's poll results to its listeners, like the real one."""
+
+    def __init__(self, state=MachineState.READY, **fields):
+        self.data = None
+        self.last_update_success = True
+        self._listeners = []
+        self.publish(state, **fields)
+
+    def async_add_listener(self, listener):
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def publish(self, state, *, est_weight=0, completion_time=None, success=True):
+        self.last_update_success = success
+        self.data = SimpleNamespace(
+            machine_state=state,
+            est_weight=est_weight,
+            estimated_time=3600 if completion_time else 0,
+            completion_time=completion_time,
+        )
+        for listener in list(self._listeners):
+            listener()
+
+
+def totals(summary):
+    return (
+        summary.printers,
+        summary.active_prints,
+        summary.idle,
+        summary.errors,
+        summary.filament_weight,
+    )
+
+
+@pytest.mark.unit
+def test_summary_follows_each_printer_change():
+    summary = FleetSummary()
+    first, second = FakeCoordinator(), FakeCoordinator()
+    summary.async_track("first", first)
+    summary.async_track("second", second)
+
+    first.publish(MachineState.PRINTING, est_weight=12.5)
+    second.publish(MachineState.PAUSED, est_weight=7.5)
+    assert totals(summary) == (2, 2, 0, 0, 20.0)
+
+    first.publish(MachineState.COMPLETED)
+    second.publish(MachineState.ERROR)
+    assert totals(summary) == (2, 0, 1, 1, 0.0)
+
+
+@pytest.mark.unit
+def test_an_unreachable_printer_counts_as_an_error():
+    summary = FleetSummary()
+    printer = FakeCoordinator(MachineState.PRINTING, est_weight=10)
+    summary.async_track("printer", printer)
+
+    printer.publish(MachineState.PRINTING, est_weight=10, success=False)
+
+    assert totals(summary) == (1, 0, 0, 1, 0.0)
+
+
+@pytest.mark.unit
+def test_earliest_completion_follows_the_soonest_print():
+    summary = FleetSummary()
+    soon = datetime(2026, 10, 18, 12, 0, tzinfo=UTC)
+    later = soon + timedelta(hours=2)
+    first = FakeCoordinator(MachineState.PRINTING, completion_time=soon)
+    second = FakeCoordinator(MachineState.PRINTING, completion_time=later)
+    untrack_first = summary.async_track("first", first)
+    summary.async_track("second", second)
+    assert summary.earliest_completion == soon
+
+    untrack_first()
+
+    assert summary.earliest_completion == later
+    assert summary.printers == 1
+
+
+@pytest.mark.unit
+def test_listeners_wake_only_when_a_total_moves():
+    summary = FleetSummary()
+    printer = FakeCoordinator()
+    summary.async_track("printer", printer)
+    wakes = []
+    summary.async_add_listener(lambda: wakes.append(1))
+
+    printer.publish(MachineState.READY)
+    printer.publish(MachineState.PRINTING)
+
+    assert len(wakes) == 1
+
+
+@pytest.mark.unit
+def test_fleet_device_moves_to_the_next_entry():
+    summary = FleetSummary()
+    hosted = []
+    withdraw_first = summary.async_offer_host("first", lambda s: hosted.append("first"))
+    summary.async_offer_host("second", lambda s: hosted.append("second"))
+    assert hosted == ["first"]
+
+    withdraw_first()
+
+    assert hosted == ["first", "second"]
+
+
+class FakeEntityRegistry:
+    """Just enough of the entity registry to see which entry owns an entity."""
+
+    def __init__(self, owners):
+        self.entries = {
+            f"sensor.{unique_id}": SimpleNamespace(unique_id=unique_id, config_entry_id=owner)
+            for unique_id, owner in owners.items()
+        }
+
+    def async_get_entity_id(self, domain, platform, unique_id):
+        return next(
+            (eid for eid, e in self.entries.items() if e.unique_id == unique_id), None
+        )
+
+    def async_get(self, entity_id):
+        return self.entries.get(entity_id)
+
+    def async_update_entity(self, entity_id, *, config_entry_id):
+        self.entries[entity_id].config_entry_id = config_entry_id
+
+
+class FakeDeviceRegistry:
+    """One device; removing its last config entry deletes it, as the real one does."""
+
+    def __init__(self, config_entries):
+        self.device = SimpleNamespace(id="fleet-device", config_entries=set(config_entries))
+
+    def async_get_device(self, identifiers):
+        return self.device
+
+    def async_update_device(
+        self, device_id, *, add_config_entry_id=None, remove_config_entry_id=None
+    ):
+        entries = set(self.device.config_entries)
+        if add_config_entry_id is not None:
+            entries.add(add_config_entry_id)
+        if remove_config_entry_id is not None:
+            entries.discard(remove_config_entry_id)
+        assert entries, "the fleet device would have been deleted"
+        self.device = SimpleNamespace(id=device_id, config_entries=entries)
+
+
+@pytest.mark.unit
+def test_fleet_registry_entries_follow_the_host(monkeypatch):
+    """The new host takes the sensors and device over in the registries first.
+
+    Otherwise removing the old host - usually why it unloaded - would delete
+    the sensors' registry entries along with it.
+    """
+    entities = FakeEntityRegistry(
+        {sensor_module._fleet_unique_id(d): "first" for d in FLEET_SENSORS}
+    )
+    devices = FakeDeviceRegistry({"first"})
+    monkeypatch.setattr(sensor_module.er, "async_get", lambda hass: entities)
+    monkeypatch.setattr(sensor_module.dr, "async_get", lambda hass: devices)
+    hass = Mock()
+    summary = FleetSummary()
+
+    def host(entry_id):
+        return lambda s: sensor_module._async_adopt_fleet_device(hass, entry_id)
+
+    withdraw_first = summary.async_offer_host("first", host("first"))
+    summary.async_offer_host("second", host("second"))
+    assert {e.config_entry_id for e in entities.entries.values()} == {"first"}
+
+    withdraw_first()
+
+    assert {e.config_entry_id for e in entities.entries.values()} == {"second"}
+    assert devices.device.config_entries == {"second"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fleet_sensor_writes_only_when_its_own_value_changes():
+    summary = FleetSummary()
+    printer = FakeCoordinator()
+    summary.async_track("printer", printer)
+    description = next(d for d in FLEET_SENSORS if d.key == "filament_weight")
+    sensor = FlashForgeFleetSensor(summary, description)
+    sensor.async_on_remove = Mock()
+    sensor.async_write_ha_state = Mock()
+    await sensor.async_added_to_hass()
+
+    printer.publish(MachineState.COMPLETED)
+    sensor.async_write_ha_state.assert_not_called()
+
+    printer.publish(MachineState.PRINTING, est_weight=21.3)
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.native_value == 21.3
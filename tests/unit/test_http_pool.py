@@ -0,0 +1,111 @@
+"""Unit tests for the shared HTTP connection pool.
+
+Closing a client's session is what the library and the integration have always
+done on teardown; with the pool, that must release the session without closing
+the connections another printer is using. The connections go with the last hold.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from flashforge import FlashForgeClient
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge.http_pool import (
+    LIMIT_PER_HOST,
+    HttpPool,
+    async_get_http_pool,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_clients_share_one_connector():
+    pool = HttpPool()
+    first = pool.async_acquire()
+    second = pool.async_acquire()
+
+    assert first is not second
+    assert first.connector is second.connector
+    assert first.connector.limit_per_host == LIMIT_PER_HOST
+
+    await first.close()
+    await second.close()
+    await pool.async_close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_closing_one_client_leaves_the_pool_open():
+    pool = HttpPool()
+    first = pool.async_acquire()
+    second = pool.async_acquire()
+
+    connector = second.connector
+
+    await first.close()
+    await pool.async_release()
+
+    assert not connector.closed
+    assert pool.users == 1
+
+    await second.close()
+    await pool.async_release()
+    assert connector.closed
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pool_reopens_after_the_last_entry_left():
+    pool = HttpPool()
+    session = pool.async_acquire()
+    await session.close()
+    await pool.async_release()
+
+    reopened = pool.async_acquire()
+
+    assert not reopened.connector.closed
+    await reopened.close()
+    await pool.async_close()
+
+
+@pytest.mark.unit
+def test_pool_is_shared_and_closed_with_home_assistant():
+    hass = Mock()
+    hass.data = {}
+
+    pool = async_get_http_pool(hass)
+
+    assert async_get_http_pool(hass) is pool
+    hass.bus.async_listen_once.assert_called_once()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_the_library_keeps_the_attached_session():
+    """The pool sets the client's private session; the library must use it.
+
+    The library makes a session of its own when it finds none, or a closed one.
+    If it ever stops reading this attribute, or replaces an open session, the
+    client would quietly leave the pool - this is where that shows.
+    """
+    pool = HttpPool()
+    client = FlashForgeClient("192.168.1.120", "SN123456", "12345678")
+
+    pool.async_attach(client)
+    session = client._http_session
+
+    assert await client.get_http_session() is session
+    assert session.connector_owner is False
+    assert pool.users == 1
+
+    await session.close()
+    await pool.async_release()
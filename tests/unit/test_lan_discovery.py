@@ -0,0 +1,128 @@
+"""Unit tests for the shared background LAN discovery.
+
+Every config flow used to run its own scan and wait for it to time out. What is
+checked here is that a waiting flow is answered shortly after the first printer
+does, not when the scan ends; that flows within the TTL share one scan; and that
+an empty or forced result scans again.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge import lan_discovery
+from custom_components.flashforge.lan_discovery import LanDiscovery
+
+
+class FakeMonitor:
+    """Stands in for the library's DiscoveryMonitor; the test drives its events."""
+
+    def __init__(self) -> None:
+        self.listeners = {"discovered": [], "end": [], "error": []}
+        self.stopped = False
+
+    def on(self, event, callback):
+        self.listeners[event].append(callback)
+        return self
+
+    def emit(self, event, *args):
+        for callback in self.listeners[event]:
+            callback(*args)
+
+    def stop(self):
+        self.stopped = True
+        self.emit("end")
+
+
+@pytest.fixture
+def monitors(monkeypatch):
+    started = []
+
+    def monitor(options):
+        started.append(FakeMonitor())
+        return started[-1]
+
+    monkeypatch.setattr(
+        lan_discovery, "PrinterDiscovery", lambda: SimpleNamespace(monitor=monitor)
+    )
+    monkeypatch.setattr(lan_discovery, "SETTLE_TIME", 0.01)
+    return started
+
+
+def printer(ip):
+    return SimpleNamespace(ip_address=ip, command_port=8899, serial_number=f"SN{ip}")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_flow_is_answered_once_answers_settle_not_when_the_scan_ends(monitors):
+    discovery = LanDiscovery()
+
+    waiting = asyncio.ensure_future(discovery.async_discover())
+    await asyncio.sleep(0)
+    monitors[0].emit("discovered", printer("10.0.0.2"))
+    monitors[0].emit("discovered", printer("10.0.0.3"))
+    found = await asyncio.wait_for(waiting, 1)
+
+    assert [p.ip_address for p in found] == ["10.0.0.2", "10.0.0.3"]
+    assert discovery.scanning
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fresh_results_are_shared_by_later_flows(monitors):
+    discovery = LanDiscovery()
+    discovery.async_scan()
+    monitors[0].emit("discovered", printer("10.0.0.2"))
+    monitors[0].emit("end")
+
+    found = await discovery.async_discover()
+    discovery.async_scan()
+
+    assert len(found) == 1
+    assert discovery.scans == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_forced_or_empty_results_scan_again(monitors):
+    discovery = LanDiscovery()
+    discovery.async_scan()
+    monitors[0].emit("end")
+
+    waiting = asyncio.ensure_future(discovery.async_discover())
+    await asyncio.sleep(0)
+    monitors[1].emit("discovered", printer("10.0.0.2"))
+    monitors[1].emit("end")
+    assert len(await waiting) == 1
+
+    waiting = asyncio.ensure_future(discovery.async_discover(force=True))
+    await asyncio.sleep(0)
+    monitors[2].emit("end")
+
+    assert await waiting == []
+    assert discovery.scans == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scan_error_is_kept_for_the_flow(monitors):
+    discovery = LanDiscovery()
+
+    waiting = asyncio.ensure_future(discovery.async_discover())
+    await asyncio.sleep(0)
+    monitors[0].emit("error", OSError("no interfaces"))
+    monitors[0].emit("end")
+
+    assert await waiting == []
+    assert isinstance(discovery.last_error, OSError)
@@ -0,0 +1,187 @@
+"""Unit tests for the per-request latency and error instrumentation.
+
+Every request the integration makes through a printer's client is timed and
+classified by how it ended. The wrapping must be invisible to callers - the same
+results, the same exceptions - and a request the caller cancelled must not count
+against the printer.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge.request_stats import (
+    LATENCY_WINDOW,
+    NO_RESPONSE,
+    RequestStats,
+    instrument_client,
+)
+from custom_components.flashforge.sensor import REQUEST_SENSORS, FlashForgeRequestSensor
+
+
+def _client(**info):
+    files = Mock()
+    files.get_local_file_list = AsyncMock(return_value=["a.gcode"])
+    files.get_gcode_thumbnail = AsyncMock(return_value=None)
+    return SimpleNamespace(
+        info=SimpleNamespace(get=AsyncMock(**info), machine_state="ready"),
+        files=files,
+        control=SimpleNamespace(set_led_on=AsyncMock(return_value=True)),
+        detect_camera_stream=AsyncMock(return_value="http://printer:8080/?action=stream"),
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_endpoint():
+    stats = RequestStats()
+    client = _client(return_value=Mock())
+    instrument_client(client, stats)
+
+    await client.info.get()
+    await client.info.get()
+    assert await client.files.get_local_file_list() == ["a.gcode"]
+    await client.detect_camera_stream()
+
+    endpoints = stats.as_dict()["endpoints"]
+    assert stats.requests == 4
+    assert stats.failures == 0
+    assert endpoints["info.get"]["requests"] == 2
+    assert endpoints["files.get_local_file_list"]["requests"] == 1
+    assert endpoints["detect_camera_stream"]["requests"] == 1
+    assert sum(endpoints["info.get"]["histogram"].values()) == 2
+    assert "control.set_led_on" not in endpoints
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_timeouts_and_errors_are_recorded_and_reraised():
+    stats = RequestStats()
+    client = _client(side_effect=[TimeoutError(), ConnectionResetError(), Mock()])
+    instrument_client(client, stats)
+
+    with pytest.raises(TimeoutError):
+        await client.info.get()
+    with pytest.raises(ConnectionResetError):
+        await client.info.get()
+    await client.info.get()
+
+    assert stats.requests == 3
+    assert stats.timeouts == 1
+    assert stats.failures == 2
+    assert stats.errors() == {"ConnectionResetError": 1}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_no_status_is_a_failure_but_no_thumbnail_is_not():
+    """The library returns None for a printer that did not answer a status read."""
+    stats = RequestStats()
+    client = _client(return_value=None)
+    instrument_client(client, stats)
+
+    assert await client.info.get() is None
+    assert await client.files.get_gcode_thumbnail("a.gcode") is None
+
+    assert stats.errors() == {NO_RESPONSE: 1}
+    assert stats.as_dict()["endpoints"]["files.get_gcode_thumbnail"]["errors"] == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_a_cancelled_request_is_not_recorded():
+    stats = RequestStats()
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.Event().wait()
+
+    client = _client(side_effect=hang)
+    instrument_client(client, stats)
+
+    task = asyncio.ensure_future(client.info.get())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert stats.requests == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_attributes_pass_through_and_instrumenting_twice_is_harmless():
+    stats = RequestStats()
+    client = _client()
+    instrument_client(client, stats)
+    wrapped = client.info
+    instrument_client(client, stats)
+
+    assert client.info is wrapped
+    await client.detect_camera_stream()
+    assert stats.requests == 1
+    assert client.info.machine_state == "ready"
+    client.info.machine_state = "printing"
+    assert client.info.machine_state == "printing"
+
+
+@pytest.mark.unit
+def test_latency_covers_the_most_recent_requests():
+    stats = RequestStats()
+    assert stats.latency() == {"p50": None, "p95": None, "max": None}
+
+    stats.record("info.get", 30.0, None)  # pushed out of the window below
+    for i in range(1, LATENCY_WINDOW + 1):
+        stats.record("info.get", i / 1000, None)
+
+    assert stats.latency() == {"p50": 0.05, "p95": 0.095, "max": 0.1}
+    histogram = stats.as_dict()["endpoints"]["info.get"]["histogram"]
+    assert histogram["le_0.05"] == 50
+    assert histogram["slower"] == 1  # the histogram counts since setup
+    assert histogram["le_10"] == 0
+    assert stats.requests == LATENCY_WINDOW + 1
+
+
+@pytest.mark.unit
+def test_request_sensors_report_the_totals_even_when_polls_fail():
+    stats = RequestStats()
+    stats.record("info.get", 0.2, None)
+    stats.record("info.get", 0.4, "TimeoutError")
+    stats.record("files.get_local_file_list", 0.1, "ClientConnectorError")
+    coordinator = Mock(last_update_success=False, data=None, device_model="AD5X")
+    sensors = {
+        description.key: FlashForgeRequestSensor(
+            coordinator, stats, description, "Printer", "entry-1"
+        )
+        for description in REQUEST_SENSORS
+    }
+
+    assert all(sensor.available for sensor in sensors.values())
+    assert all(
+        not sensor.entity_description.entity_registry_enabled_default
+        for sensor in sensors.values()
+    )
+    assert sensors["request_latency"].native_value == 400
+    assert sensors["request_latency"].extra_state_attributes == {
+        "p50": 200,
+        "max": 400,
+        "requests": 3,
+    }
+    assert sensors["request_failures"].native_value == 2
+    assert sensors["request_failures"].extra_state_attributes == {
+        "timeouts": 1,
+        "ClientConnectorError": 1,
+    }
+    assert sensors["request_timeouts"].native_value == 1
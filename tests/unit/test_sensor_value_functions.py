@@ -19,7 +19,8 @@ sys.path.insert(0, str(project_root))
 from tests.ha_mocks import mock_homeassistant
 mock_homeassistant()
 
-from custom_components.flashforge.sensor import SENSORS, _completion_time
+from custom_components.flashforge.sensor import SENSORS
+from custom_components.flashforge.util import print_completion_time
 from flashforge.models import MachineState
 
 
@@ -435,7 +436,7 @@ class TestSensorValueFunctions:
         """Naive completion_time gets stamped with HA's default timezone (HA 2026 fix)."""
         self.mock_data.machine_state = MachineState.PRINTING
         self.mock_data.completion_time = datetime(2026, 6, 26, 9, 47, 12)  # naive
-        result = _completion_time(self.mock_data)
+        result = print_completion_time(self.mock_data)
         assert result is not None
         assert result.tzinfo is not None
         assert result == datetime(2026, 6, 26, 9, 47, tzinfo=result.tzinfo)
@@ -444,7 +445,7 @@ class TestSensorValueFunctions:
         """Completion time is None unless actively printing/heating."""
         self.mock_data.machine_state = MachineState.READY
         self.mock_data.completion_time = datetime(2026, 6, 26, 9, 47, 12)
-        assert _completion_time(self.mock_data) is None
+        assert print_completion_time(self.mock_data) is None
 
     def test_print_completion_time_returns_none_unless_printing(self):
         """Only a print that is advancing reports a completion time.
@@ -466,7 +467,7 @@ class TestSensorValueFunctions:
         ):
             self.mock_data.machine_state = state
             self.mock_data.completion_time = datetime(2026, 6, 26, 9, 47, 12)
-            assert _completion_time(self.mock_data) is None, state
+            assert print_completion_time(self.mock_data) is None, state
 
     def test_remaining_time_still_reported_while_paused(self):
         """The duration sensor is unaffected by the pause gate above."""
@@ -481,7 +482,7 @@ class TestSensorValueFunctions:
         self.mock_data.machine_state = MachineState.PRINTING
         aware = datetime(2026, 6, 26, 9, 47, 12, tzinfo=timezone(timedelta(hours=-5)))
         self.mock_data.completion_time = aware
-        result = _completion_time(self.mock_data)
+        result = print_completion_time(self.mock_data)
         assert result is not None
         assert result.tzinfo is aware.tzinfo
 
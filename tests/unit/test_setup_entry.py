@@ -2,6 +2,7 @@
 
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -13,7 +14,8 @@ from tests.ha_mocks import mock_homeassistant
 
 mock_homeassistant()
 
-from custom_components.flashforge import async_setup_entry
+from custom_components.flashforge import async_setup_entry, lan_discovery
+from custom_components.flashforge.http_pool import async_get_http_pool
 from custom_components.flashforge.const import (
     CONF_CHECK_CODE,
     CONF_OVERRIDE_LED_AVAILABILITY,
@@ -23,6 +25,23 @@ from custom_components.flashforge.const import (
     DOMAIN,
 )
 from homeassistant.const import CONF_IP_ADDRESS, CONF_NAME
+from homeassistant.exceptions import ConfigEntryNotReady
+
+
+@pytest.fixture(autouse=True)
+def scans(monkeypatch):
+    """Keep setup's background LAN scan off the network; count the scans started."""
+    started = []
+
+    def monitor(options):
+        started.append(Mock())
+        started[-1].on.return_value = started[-1]
+        return started[-1]
+
+    monkeypatch.setattr(
+        lan_discovery, "PrinterDiscovery", lambda: SimpleNamespace(monitor=monitor)
+    )
+    return started
 
 
 async def _run_setup(entry_options: dict):
@@ -50,10 +69,12 @@ async def _run_setup(entry_options: dict):
     client = Mock()
     client.info.get = AsyncMock(return_value=machine_info)
     client.cache_details = Mock(return_value=True)
-    client.send_product_command = AsyncMock(return_value=True)
+    # Kept aside: setup wraps the client's methods to time its requests.
+    send_product_command = client.send_product_command = AsyncMock(return_value=True)
 
     coordinator = Mock()
     coordinator.async_config_entry_first_refresh = AsyncMock()
+    coordinator.async_set_initial_data = AsyncMock()
 
     options_sentinel = object()
 
@@ -68,6 +89,7 @@ async def _run_setup(entry_options: dict):
         "hass": hass,
         "entry": entry,
         "client": client,
+        "send_product_command": send_product_command,
         "client_cls": client_cls,
         "options_cls": options_cls,
         "options_sentinel": options_sentinel,
@@ -100,10 +122,15 @@ async def test_async_setup_entry_forces_led_capability_when_the_user_asks():
         options=mocks["options_sentinel"],
     )
     mocks["client"].cache_details.assert_called_once_with(mocks["machine_info"])
-    mocks["client"].send_product_command.assert_awaited_once()
-    mocks["coordinator"].async_config_entry_first_refresh.assert_awaited_once()
+    mocks["send_product_command"].assert_awaited_once()
+    # Seeded with setup's own /detail read rather than polling again.
+    mocks["coordinator"].async_set_initial_data.assert_awaited_once()
+    assert mocks["coordinator"].async_set_initial_data.await_args.args[0] is mocks["machine_info"]
+    mocks["coordinator"].async_config_entry_first_refresh.assert_not_awaited()
     mocks["hass"].config_entries.async_forward_entry_setups.assert_awaited_once()
-    mocks["entry"].async_on_unload.assert_called_once()
+    # The options update listener, the connection pool hold, the fleet slot
+    # and the fleet summary.
+    assert mocks["entry"].async_on_unload.call_count == 4
     assert mocks["hass"].data[DOMAIN][mocks["entry"].entry_id]["client"] is mocks["client"]
 
 
@@ -137,3 +164,77 @@ async def test_async_setup_entry_does_not_override_led_capability_when_off(optio
 
     assert result is True, case
     mocks["options_cls"].assert_called_once_with(led_control_override=None)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_setup_entry_puts_the_client_on_the_shared_pool():
+    """The client's session rides the pool's connector and gives it back on unload."""
+    result, mocks = await _run_setup({CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL})
+    pool = async_get_http_pool(mocks["hass"])
+    session = mocks["client"]._http_session
+
+    assert result is True
+    assert pool.users == 1
+    assert session.connector_owner is False
+    mocks["entry"].async_on_unload.assert_any_call(pool.async_release)
+
+    connector = session.connector
+    await session.close()
+    await pool.async_release()
+    assert connector.closed
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_setup_entry_times_requests_from_the_first_one():
+    """Setup's own status read and credential check are already recorded."""
+    result, mocks = await _run_setup({CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL})
+    stats = mocks["hass"].data[DOMAIN]["entry-1"]["request_stats"]
+
+    assert result is True
+    assert stats.requests == 2
+    assert set(stats.as_dict()["endpoints"]) == {"info.get", "send_product_command"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_setup_entry_starts_a_lan_scan(scans):
+    """Loading the integration looks for printers before anyone opens the dialog."""
+    result, mocks = await _run_setup({CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL})
+
+    assert result is True
+    assert len(scans) == 1
+    assert lan_discovery.async_get_lan_discovery(mocks["hass"]).scanning
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_setup_entry_still_rejects_refused_credentials():
+    """The credential check runs alongside the status read, and still gates setup."""
+    hass = Mock()
+    hass.data = {}
+    hass.http.async_register_static_paths = AsyncMock()
+    entry = Mock()
+    entry.data = {
+        CONF_IP_ADDRESS: "192.168.1.100",
+        CONF_SERIAL_NUMBER: "SN123456",
+        CONF_CHECK_CODE: "WRONG",
+    }
+    entry.options = {}
+    client = Mock()
+    client.info.get = AsyncMock(return_value=Mock())
+    client.send_product_command = AsyncMock(return_value=False)
+    client._http_session = None
+    # Setup wraps the client's methods to time its requests; keep the mock.
+    info_get = client.info.get
+
+    with (
+        patch("custom_components.flashforge.FlashForgeClient", return_value=client),
+        patch("custom_components.flashforge.FlashForgeDataUpdateCoordinator") as coordinator_cls,
+        pytest.raises(ConfigEntryNotReady, match="/product"),
+    ):
+        await async_setup_entry(hass, entry)
+
+    info_get.assert_awaited_once()
+    coordinator_cls.assert_not_called()
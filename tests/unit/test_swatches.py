@@ -0,0 +1,153 @@
+"""Unit tests for the shared swatch cache and the SVG swatch mode.
+
+A filament change used to re-render every slot of every printer. What is checked
+here is that slots depicting the same spool share one render, that two slots
+asking at once share one executor job, and that the cache stays bounded. SVG
+swatches skip all of that; they only need to be well-formed whatever the label.
+"""
+
+import asyncio
+import sys
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import Mock
+from xml.etree import ElementTree
+
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge import image
+from custom_components.flashforge.image import (
+    SWATCH_SVG,
+    FlashForgeMaterialStationSlotImage,
+    SwatchCache,
+    render_swatch_bytes,
+    render_swatch_svg,
+)
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    def fake_render(material, hex_color, *, size):
+        calls.append((material, hex_color, size))
+        return f"{material}{hex_color}{size}".encode()
+
+    monkeypatch.setattr(image, "render_swatch_bytes", fake_render)
+    return calls
+
+
+@pytest.fixture
+def hass():
+    hass = Mock()
+
+    async def run(func, *args):
+        await asyncio.sleep(0)
+        return func(*args)
+
+    hass.async_add_executor_job = run
+    return hass
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_same_spool_is_rendered_once(hass, renders):
+    cache = SwatchCache()
+
+    first = await cache.async_get(hass, "PLA", "#ff0000")
+    second = await cache.async_get(hass, "PLA", "#FF0000")
+
+    assert first == second
+    assert renders == [("PLA", "#FF0000", image.SWATCH_SIZE)]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_render(hass, renders):
+    cache = SwatchCache()
+
+    results = await asyncio.gather(
+        *(cache.async_get(hass, "PETG", "#00FF00") for _ in range(4))
+    )
+
+    assert len(set(results)) == 1
+    assert len(renders) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_least_recently_used_swatch_is_evicted(hass, renders):
+    cache = SwatchCache(max_entries=2)
+
+    await cache.async_get(hass, "PLA", "#FF0000")
+    await cache.async_get(hass, "ABS", "#000000")
+    await cache.async_get(hass, "PLA", "#FF0000")
+    await cache.async_get(hass, "TPU", "#FFFFFF")
+    await cache.async_get(hass, "PLA", "#FF0000")
+
+    assert len(cache) == 2
+    assert [call[0] for call in renders] == ["PLA", "ABS", "TPU"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_render_is_not_cached(hass, monkeypatch):
+    cache = SwatchCache()
+    monkeypatch.setattr(image, "render_swatch_bytes", Mock(side_effect=OSError))
+
+    with pytest.raises(OSError):
+        await cache.async_get(hass, "PLA", "#FF0000")
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_render_produces_a_png_of_the_requested_size():
+    data = render_swatch_bytes("PLA", "#FF8800", size=64)
+
+    with Image.open(BytesIO(data)) as img:
+        assert (img.format, img.size) == ("PNG", (64, 64))
+
+
+@pytest.mark.unit
+def test_svg_swatch_escapes_the_label():
+    root = ElementTree.fromstring(render_swatch_svg("PLA & <CF>", "#ff8800"))
+
+    assert root.find(f"{SVG}rect").get("fill") == "#FF8800"
+    assert root.find(f"{SVG}text").text == "PLA & <CF>"
+
+
+@pytest.mark.unit
+def test_svg_swatch_squeezes_a_label_too_long_to_shrink():
+    short = ElementTree.fromstring(render_swatch_svg("PLA", "#FFFFFF"))
+    long = ElementTree.fromstring(render_swatch_svg("PETG-CF-HIGHSPEED", "#FFFFFF"))
+
+    assert short.find(f"{SVG}text").get("textLength") is None
+    assert long.find(f"{SVG}text").get("textLength") == "196"
+    assert int(long.find(f"{SVG}text").get("font-size")) == 24
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_svg_entity_serves_svg_without_rendering(hass, renders):
+    coordinator = Mock()
+    coordinator.data = None
+    entity = FlashForgeMaterialStationSlotImage(
+        hass, coordinator, "Printer", "entry", 1, swatch_format=SWATCH_SVG
+    )
+
+    data = await entity.async_image()
+
+    assert entity._attr_content_type == "image/svg+xml"
+    assert data.startswith(b"<svg")
+    assert renders == []
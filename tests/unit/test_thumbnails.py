@@ -0,0 +1,221 @@
+"""Unit tests for the persistent thumbnail store.
+
+The store is what lets a card opened right after a restart skip the printer
+entirely, so what is checked here is what survives on disk: the size cap and its
+eviction order, blobs the index never heard of, and an entry being removed.
+"""
+
+import sys
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import Store, mock_homeassistant
+
+mock_homeassistant()
+
+from custom_components.flashforge import thumbnails
+from custom_components.flashforge.const import DOMAIN
+from custom_components.flashforge.file_list import FileListCache
+from custom_components.flashforge.image import FlashForgeThumbnailImage
+from custom_components.flashforge.thumbnails import (
+    ThumbnailStore,
+    resize_thumbnail,
+    thumbnail_content_type,
+)
+
+
+async def _run_in_executor(func, *args):
+    return func(*args)
+
+
+@pytest.fixture
+def hass():
+    Store.reset()
+    hass = Mock()
+    hass.async_add_executor_job = _run_in_executor
+    return hass
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_past_the_size_cap(hass, tmp_path):
+    store = ThumbnailStore(hass, tmp_path, max_bytes=250)
+
+    await store.async_set("entry", "a.gcode", b"a" * 100)
+    await store.async_set("entry", "b.gcode", b"b" * 100)
+    # Reading `a` makes `b` the oldest.
+    assert await store.async_get("entry", "a.gcode") == b"a" * 100
+    await store.async_set("entry", "c.gcode", b"c" * 100)
+
+    assert await store.async_get("entry", "b.gcode") is None
+    assert await store.async_get("entry", "a.gcode") is not None
+    assert await store.async_get("entry", "c.gcode") is not None
+    assert store.total_bytes == 200
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unindexed_blobs_are_deleted_on_load(hass, tmp_path):
+    """A blob written just before a crash, with no index saved, is never reachable."""
+    (tmp_path / f"{'0' * 64}.thumb").write_bytes(b"orphan")
+    store = ThumbnailStore(hass, tmp_path)
+
+    assert await store.async_get("entry", "a.gcode") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_removing_an_entry_deletes_only_its_thumbnails(hass, tmp_path):
+    store = ThumbnailStore(hass, tmp_path)
+    await store.async_set("gone", "a.gcode", b"a")
+    await store.async_set("kept", "a.gcode", b"b")
+
+    await store.async_remove_entry("gone")
+
+    reloaded = ThumbnailStore(hass, tmp_path)
+    assert await reloaded.async_get("gone", "a.gcode") is None
+    assert await reloaded.async_get("kept", "a.gcode") == b"b"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_missing_thumbnails_are_not_persisted(hass, tmp_path):
+    """A failed fetch may be transient; a restart should try the printer again."""
+    store = ThumbnailStore(hass, tmp_path)
+    await store.async_set("entry", "a.gcode", None)
+
+    assert store.is_missing("entry", "a.gcode")
+    assert not ThumbnailStore(hass, tmp_path).is_missing("entry", "a.gcode")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_variants_go_with_their_file(hass, tmp_path):
+    """Re-slicing a file must not leave its downscaled copies behind."""
+    store = ThumbnailStore(hass, tmp_path)
+    listing = [{"file_name": "a.gcode", "printing_time": 60, "total_filament_weight": 1}]
+    await store.async_reconcile("entry", listing)
+    await store.async_set("entry", "a.gcode", b"original")
+    await store.async_set("entry", "a.gcode", b"small", "64px")
+
+    listing[0]["printing_time"] = 90
+    await store.async_reconcile("entry", listing)
+
+    assert await store.async_get("entry", "a.gcode", "64px") is None
+    assert len(store) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_evicting_an_original_takes_its_variants(hass, tmp_path):
+    store = ThumbnailStore(hass, tmp_path, max_bytes=250)
+    await store.async_set("entry", "a.gcode", b"a" * 100)
+    await store.async_set("entry", "a.gcode", b"s" * 20, "64px")
+    await store.async_set("entry", "b.gcode", b"b" * 100)
+    # Reading the variant leaves `a` itself the oldest.
+    assert await store.async_get("entry", "a.gcode", "64px") is not None
+
+    await store.async_set("entry", "c.gcode", b"c" * 100)
+
+    assert await store.async_get("entry", "a.gcode", "64px") is None
+    assert len(store) == 2
+    assert store.total_bytes == 200
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_a_variant_does_not_evict_its_own_original(hass, tmp_path):
+    store = ThumbnailStore(hass, tmp_path, max_bytes=110)
+    await store.async_set("entry", "a.gcode", b"a" * 100)
+    await store.async_set("entry", "a.gcode", b"s" * 20, "64px")
+
+    assert await store.async_get("entry", "a.gcode") == b"a" * 100
+    assert await store.async_get("entry", "a.gcode", "64px") == b"s" * 20
+
+
+def _thumbnail_entity(hass, tmp_path, thumbnail, files):
+    """The Current File Thumbnail entity of a printer printing ``a.gcode``."""
+    client = Mock()
+    client.files.get_gcode_thumbnail = AsyncMock(return_value=thumbnail)
+    client.files.get_recent_file_list = AsyncMock(return_value=files)
+    coordinator = Mock(
+        client=client,
+        data=SimpleNamespace(print_file_name="a.gcode"),
+        device_model="AD5X",
+    )
+    hass.data = {
+        thumbnails._DATA_KEY: ThumbnailStore(hass, tmp_path),
+        DOMAIN: {"entry": {"file_list": FileListCache(client)}},
+    }
+    return FlashForgeThumbnailImage(hass, coordinator, "Printer", "entry"), client
+
+
+def _listed(printing_time):
+    return SimpleNamespace(
+        gcode_file_name="a.gcode",
+        printing_time=printing_time,
+        total_filament_weight=12.5,
+        gcode_tool_cnt=1,
+        use_matl_station=False,
+        gcode_tool_datas=None,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_entity_drops_a_thumbnail_cached_before_the_file_was_resliced(hass, tmp_path):
+    """The entity honours the listing's fingerprint, as the job card does."""
+    store = ThumbnailStore(hass, tmp_path)
+    await store.async_reconcile(
+        "entry", [{"file_name": "a.gcode", "printing_time": 60, "total_filament_weight": 12.5}]
+    )
+    await store.async_set("entry", "a.gcode", b"stale")
+
+    entity, client = _thumbnail_entity(hass, tmp_path, b"fresh", [_listed(90)])
+
+    assert await entity.async_image() == b"fresh"
+    client.files.get_gcode_thumbnail.assert_awaited_once_with("a.gcode")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_entity_asks_for_a_file_without_a_thumbnail_once(hass, tmp_path):
+    entity, client = _thumbnail_entity(hass, tmp_path, None, [_listed(60)])
+
+    assert await entity.async_image() is None
+    assert await entity.async_image() is None
+
+    client.files.get_gcode_thumbnail.assert_awaited_once()
+    client.files.get_recent_file_list.assert_awaited_once()
+
+
+def _png(size):
+    buf = BytesIO()
+    Image.effect_noise((size, size), 64).convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.mark.unit
+def test_resize_fits_the_requested_box():
+    resized = resize_thumbnail(_png(300), 64)
+
+    assert resized is not None
+    with Image.open(BytesIO(resized)) as img:
+        assert max(img.size) == 64
+    assert thumbnail_content_type(resized) in ("image/webp", "image/png")
+
+
+@pytest.mark.unit
+def test_resize_leaves_small_thumbnails_alone():
+    assert resize_thumbnail(_png(48), 64) is None
@@ -0,0 +1,187 @@
+"""Unit tests for timelapse recording.
+
+A recorder is judged by what ends up on disk: one frame per layer (not per
+poll), nothing outside a print, and a playable AVI once the print completes -
+with the camera feed it already holds supplying every frame.
+"""
+
+import asyncio
+import struct
+import sys
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from flashforge.models import MachineState
+
+from custom_components.flashforge.timelapse import (
+    FORMAT_IMAGES,
+    FORMAT_VIDEO,
+    TIMELAPSE_LAYER,
+    TimelapseRecorder,
+    assemble_video,
+)
+
+
+def jpeg(color="orange"):
+    buf = BytesIO()
+    Image.new("RGB", (64, 48), color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+class FakeFeed:
+    """A camera feed whose last frame is always fresh."""
+
+    def __init__(self):
+        self.last_frame = jpeg()
+        self.subscribers = 0
+
+    def frame_age(self):
+        return 0.0
+
+    def subscribe(self):
+        self.subscribers += 1
+        return asyncio.Queue()
+
+    def unsubscribe(self, queue, linger=True):
+        self.subscribers -= 1
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.data = SimpleNamespace(
+            machine_state=MachineState.READY,
+            print_file_name="benchy.3mf",
+            current_print_layer=0,
+        )
+        self.listeners = []
+
+    def async_add_listener(self, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    def update(self, **fields):
+        for key, value in fields.items():
+            setattr(self.data, key, value)
+        for listener in list(self.listeners):
+            listener()
+
+
+async def _run_in_executor(func, *args):
+    return func(*args)
+
+
+@pytest.fixture
+def hass():
+    hass = Mock()
+    hass.async_add_executor_job = _run_in_executor
+    hass.async_create_background_task = lambda coro, name: asyncio.ensure_future(coro)
+    return hass
+
+
+def make_recorder(hass, tmp_path, output_format=FORMAT_VIDEO):
+    coordinator = FakeCoordinator()
+    feed = FakeFeed()
+    recorder = TimelapseRecorder(
+        hass,
+        coordinator,
+        feed,
+        tmp_path,
+        mode=TIMELAPSE_LAYER,
+        interval=30,
+        output_format=output_format,
+    )
+    recorder.async_start()
+    return recorder, coordinator, feed
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_records_one_frame_per_layer_and_assembles(hass, tmp_path):
+    recorder, coordinator, feed = make_recorder(hass, tmp_path)
+
+    coordinator.update(machine_state=MachineState.PRINTING, current_print_layer=1)
+    await settle()
+    assert feed.subscribers == 1
+    for layer in (1, 2, 2, 3):
+        coordinator.update(current_print_layer=layer)
+        await settle()
+    assert recorder.frames == 3
+
+    coordinator.update(machine_state=MachineState.COMPLETED)
+    await settle()
+
+    assert feed.subscribers == 0
+    (video,) = tmp_path.glob("*_benchy.avi")
+    assert not any(path.is_dir() for path in tmp_path.iterdir())
+    assert video.read_bytes().count(b"00dc") == 6  # three chunks, three index entries
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_nothing_is_recorded_outside_a_print(hass, tmp_path):
+    _, coordinator, feed = make_recorder(hass, tmp_path)
+
+    coordinator.update(machine_state=MachineState.HEATING, current_print_layer=5)
+    await settle()
+
+    assert feed.subscribers == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_image_sequences_are_left_as_frames(hass, tmp_path):
+    _, coordinator, _ = make_recorder(hass, tmp_path, FORMAT_IMAGES)
+
+    coordinator.update(machine_state=MachineState.PRINTING, current_print_layer=1)
+    await settle()
+    coordinator.update(machine_state=MachineState.CANCELLED)
+    await settle()
+
+    (session,) = tmp_path.iterdir()
+    assert [path.name for path in session.iterdir()] == ["frame_00001.jpg"]
+
+
+@pytest.mark.unit
+def test_assembled_avi_is_well_formed(tmp_path):
+    session = tmp_path / "print"
+    session.mkdir()
+    frames = [jpeg("red"), jpeg("green") + b"\0", jpeg("blue")]
+    for index, frame in enumerate(frames, 1):
+        (session / f"frame_{index:05d}.jpg").write_bytes(frame)
+
+    data = assemble_video(session).read_bytes()
+
+    assert data[:4] == b"RIFF" and data[8:12] == b"AVI "
+    assert struct.unpack("<I", data[4:8])[0] == len(data) - 8
+    # avih: microseconds per frame, ..., total frames, ..., width, height.
+    avih = data.index(b"avih") + 8
+    assert struct.unpack("<I", data[avih + 16 : avih + 20])[0] == 3
+    assert struct.unpack("<II", data[avih + 32 : avih + 40]) == (64, 48)
+    # Every index entry points at its chunk, relative to the "movi" fourcc.
+    movi = data.index(b"movi")
+    idx1 = data.index(b"idx1") + 8
+    for entry in range(3):
+        fourcc, _, offset, size = struct.unpack(
+            "<4sIII", data[idx1 + 16 * entry : idx1 + 16 * entry + 16]
+        )
+        assert fourcc == data[movi + offset : movi + offset + 4] == b"00dc"
+        assert data[movi + offset + 8 : movi + offset + 8 + size] == frames[entry]
+    assert not session.exists()
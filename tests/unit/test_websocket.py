@@ -6,33 +6,87 @@ behaviour around the schema: entry resolution, thumbnail caching, and - the one
 that matters - that a client which skips the matching dialog cannot start a
 multi-material print anyway.
 """
+import asyncio
+import base64
+import gc
+import os
 import sys
+from io import BytesIO
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from PIL import Image
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # Mock Home Assistant modules before importing integration code
-from tests.ha_mocks import mock_homeassistant
+from tests.ha_mocks import Store, mock_homeassistant
 mock_homeassistant()
 
 from flashforge.models import FFGcodeFileEntry, FFGcodeToolData
 
+from custom_components.flashforge import file_list
 from custom_components.flashforge.const import DOMAIN
+from custom_components.flashforge.file_list import (
+    FILE_LIST_TTL,
+    START_MAX_AGE,
+    FileListCache,
+)
+from custom_components.flashforge.thumbnails import resize_thumbnail
 from custom_components.flashforge.websocket import (
     ws_file_thumbnail,
+    ws_file_thumbnails,
     ws_list_entries,
     ws_list_files,
     ws_prepare_job,
     ws_start_job,
+    ws_subscribe_files,
 )
 
 ENTRY_ID = "entry-1"
 
+_config_dir: Path | None = None
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path):
+    """Give every test its own config directory, for the thumbnail store."""
+    global _config_dir
+    Store.reset()
+    _config_dir = tmp_path
+    yield tmp_path
+    _config_dir = None
+
+
+class FakeClock:
+    """A monotonic clock the test moves by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the file-list cache's notion of time."""
+    fake = FakeClock()
+    # The module's clock only: the event loop keeps the real one.
+    monkeypatch.setattr(file_list, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+async def _run_in_executor(func, *args):
+    return func(*args)
+
 
 def make_machine_info(
     slots=((1, "PLA", "#FF0000"), (2, "PETG", "#000000")),
@@ -77,6 +131,25 @@ def make_file_entry(tools=((0, "PLA", "#FF0000", 1),)):
     )
 
 
+def png_bytes(size):
+    """Encode a noisy square PNG, the way slicers embed thumbnails."""
+    image = Image.effect_noise((size, size), 64).convert("RGB")
+    buf = BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _track(hass, coro):
+    task = asyncio.ensure_future(coro)
+    hass.background_tasks.append(task)
+    return task
+
+
+async def settle(hass):
+    """Wait for every background task the handlers started."""
+    await asyncio.gather(*hass.background_tasks)
+
+
 def make_hass(*, files=None, machine_info=None, thumbnail=b"png-bytes"):
     """Build a hass mock holding one loaded FlashForge entry."""
     client = Mock()
@@ -97,23 +170,35 @@ def make_hass(*, files=None, machine_info=None, thumbnail=b"png-bytes"):
     coordinator.async_request_refresh = AsyncMock()
 
     hass = Mock()
+    hass.config.path = lambda *parts: os.path.join(_config_dir, *parts)
+    hass.async_add_executor_job = _run_in_executor
+    hass.background_tasks = []
+    hass.async_create_background_task = lambda coro, name: _track(hass, coro)
     hass.data = {
         DOMAIN: {
             ENTRY_ID: {
                 "coordinator": coordinator,
                 "client": client,
                 "name": "Workshop AD5X",
+                "file_list": FileListCache(client),
             }
         }
     }
     return hass, client, coordinator
 
 
+def list_message(msg_id=1, **overrides):
+    """A files/list message as the schema would hand it over."""
+    return {"id": msg_id, "entry_id": ENTRY_ID, "refresh": False, **overrides}
+
+
 def make_connection():
     """A connection mock exposing the last result / error sent."""
     connection = Mock()
     connection.send_result = Mock()
     connection.send_error = Mock()
+    connection.send_message = Mock()
+    connection.subscriptions = {}
     return connection
 
 
@@ -147,7 +232,7 @@ class TestListFiles:
         hass, _, _ = make_hass()
         connection = make_connection()
 
-        await ws_list_files(hass, connection, {"id": 1, "entry_id": ENTRY_ID})
+        await ws_list_files(hass, connection, list_message(1))
 
         payload = result_of(connection)
         assert payload["model"] == "AD5X"
@@ -163,7 +248,7 @@ class TestListFiles:
         hass, _, _ = make_hass(machine_info=machine_info)
         connection = make_connection()
 
-        await ws_list_files(hass, connection, {"id": 1, "entry_id": ENTRY_ID})
+        await ws_list_files(hass, connection, list_message(1))
 
         assert result_of(connection)["is_creator5_series"] is True
 
@@ -174,7 +259,7 @@ class TestListFiles:
         hass, _, _ = make_hass(machine_info=machine_info)
         connection = make_connection()
 
-        await ws_list_files(hass, connection, {"id": 1, "entry_id": ENTRY_ID})
+        await ws_list_files(hass, connection, list_message(1))
 
         assert result_of(connection)["is_creator5_series"] is True
 
@@ -183,7 +268,7 @@ class TestListFiles:
         hass, _, _ = make_hass()
         connection = make_connection()
 
-        await ws_list_files(hass, connection, {"id": 1, "entry_id": "nope"})
+        await ws_list_files(hass, connection, list_message(1, entry_id="nope"))
 
         connection.send_error.assert_called_once()
         assert connection.send_error.call_args.args[1] == "entry_not_found"
@@ -194,7 +279,7 @@ class TestListFiles:
         client.files.get_recent_file_list = AsyncMock(side_effect=OSError("no route"))
         connection = make_connection()
 
-        await ws_list_files(hass, connection, {"id": 1, "entry_id": ENTRY_ID})
+        await ws_list_files(hass, connection, list_message(1))
 
         assert connection.send_error.call_args.args[1] == "printer_error"
 
@@ -218,6 +303,37 @@ class TestThumbnail:
         assert result_of(connection)["image"] == first
         client.files.get_gcode_thumbnail.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_cache_survives_a_restart(self):
+        """A fresh store - as after a restart - is served from disk, not the printer."""
+        hass, _, _ = make_hass()
+        message = {"id": 1, "entry_id": ENTRY_ID, "file_name": "benchy.3mf"}
+        await ws_file_thumbnail(hass, make_connection(), message)
+
+        restarted, client, _ = make_hass()
+        connection = make_connection()
+        await ws_file_thumbnail(restarted, connection, message)
+
+        assert result_of(connection)["image"] is not None
+        client.files.get_gcode_thumbnail.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_listing_drops_thumbnails_of_changed_files(self, clock):
+        """A re-sliced file keeps its name; its new listing must evict the old image."""
+        hass, client, _ = make_hass()
+        message = {"id": 1, "entry_id": ENTRY_ID, "file_name": "benchy.3mf"}
+        await ws_list_files(hass, make_connection(), list_message(1))
+        await ws_file_thumbnail(hass, make_connection(), message)
+
+        resliced = make_file_entry()
+        resliced.printing_time = 9999
+        client.files.get_recent_file_list.return_value = [resliced]
+        clock.advance(FILE_LIST_TTL + 1)
+        await ws_list_files(hass, make_connection(), list_message(2))
+        await ws_file_thumbnail(hass, make_connection(), message)
+
+        assert client.files.get_gcode_thumbnail.await_count == 2
+
     @pytest.mark.asyncio
     async def test_missing_thumbnail_is_not_an_error(self):
         hass, _, _ = make_hass(thumbnail=None)
@@ -227,9 +343,382 @@ class TestThumbnail:
             hass, connection, {"id": 1, "entry_id": ENTRY_ID, "file_name": "benchy.3mf"}
         )
 
-        assert result_of(connection) == {"image": None}
+        assert result_of(connection) == {"image": None, "content_type": None}
         connection.send_error.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_sized_request_is_downscaled_and_cached(self):
+        original = png_bytes(300)
+        hass, client, _ = make_hass(thumbnail=original)
+        message = {"id": 1, "entry_id": ENTRY_ID, "file_name": "benchy.3mf", "size": 64}
+
+        connection = make_connection()
+        await ws_file_thumbnail(hass, connection, message)
+        sized = result_of(connection)
+
+        assert sized["content_type"] in ("image/webp", "image/png")
+        assert len(base64.b64decode(sized["image"])) < len(original)
+
+        # The variant is served from the cache, and the original is still there
+        # for a caller that wants it whole.
+        connection = make_connection()
+        await ws_file_thumbnail(hass, connection, message)
+        assert result_of(connection) == sized
+
+        unsized = {key: value for key, value in message.items() if key != "size"}
+        connection = make_connection()
+        await ws_file_thumbnail(hass, connection, unsized)
+        assert base64.b64decode(result_of(connection)["image"]) == original
+        client.files.get_gcode_thumbnail.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_small_thumbnail_is_served_as_is(self):
+        original = png_bytes(48)
+        hass, _, _ = make_hass(thumbnail=original)
+        connection = make_connection()
+
+        await ws_file_thumbnail(
+            hass,
+            connection,
+            {"id": 1, "entry_id": ENTRY_ID, "file_name": "benchy.3mf", "size": 64},
+        )
+
+        assert base64.b64decode(result_of(connection)["image"]) == original
+        assert result_of(connection)["content_type"] == "image/png"
+
+    @pytest.mark.asyncio
+    async def test_a_thumbnail_that_already_fits_is_not_decoded_again(self):
+        original = png_bytes(48)
+        hass, _, _ = make_hass(thumbnail=original)
+        message = {"id": 1, "entry_id": ENTRY_ID, "file_name": "benchy.3mf", "size": 64}
+        await ws_file_thumbnail(hass, make_connection(), message)
+
+        hass.async_add_executor_job = AsyncMock(side_effect=_run_in_executor)
+        connection = make_connection()
+        await ws_file_thumbnail(hass, connection, message)
+
+        assert base64.b64decode(result_of(connection)["image"]) == original
+        resizes = [
+            call
+            for call in hass.async_add_executor_job.await_args_list
+            if call.args[0] is resize_thumbnail
+        ]
+        assert resizes == []
+
+
+def events_of(connection):
+    """Return the payloads of every subscription event sent."""
+    return [call.args[0]["event"] for call in connection.send_message.call_args_list]
+
+
+async def run_subscription(hass, connection, message):
+    """Start a subscription command and wait for its stream to finish."""
+    await ws_file_thumbnails(hass, connection, message)
+    # The unsubscribe callback is the stream task's own `cancel`.
+    await connection.subscriptions[message["id"]].__self__
+
+
+@pytest.mark.unit
+class TestThumbnailBatch:
+    """Several thumbnails over one subscription, streamed as they resolve."""
+
+    @pytest.mark.asyncio
+    async def test_streams_cache_hits_before_printer_fetches(self):
+        hass, client, _ = make_hass()
+        await ws_file_thumbnail(
+            hass, make_connection(), {"id": 1, "entry_id": ENTRY_ID, "file_name": "cached.3mf"}
+        )
+        client.files.get_gcode_thumbnail.reset_mock()
+
+        connection = make_connection()
+        await run_subscription(
+            hass,
+            connection,
+            {
+                "id": 2,
+                "entry_id": ENTRY_ID,
+                "file_names": ["fresh.3mf", "cached.3mf", "fresh.3mf"],
+            },
+        )
+
+        connection.send_result.assert_called_once_with(2)
+        events = events_of(connection)
+        assert [event.get("file_name") for event in events] == [
+            "cached.3mf",
+            "fresh.3mf",
+            None,
+        ]
+        assert events[-1] == {"done": True}
+        client.files.get_gcode_thumbnail.assert_awaited_once_with("fresh.3mf")
+
+    @pytest.mark.asyncio
+    async def test_result_is_sent_before_any_event(self):
+        """Even when the stream runs to completion as soon as it is created."""
+        hass, _, _ = make_hass(thumbnail=None)
+        await ws_file_thumbnail(
+            hass, make_connection(), {"id": 1, "entry_id": ENTRY_ID, "file_name": "none.3mf"}
+        )
+
+        def run_eagerly(coro, name):
+            with pytest.raises(StopIteration):
+                coro.send(None)
+            return Mock()
+
+        hass.async_create_background_task = run_eagerly
+        connection = make_connection()
+        sent = Mock()
+        sent.attach_mock(connection.send_result, "result")
+        sent.attach_mock(connection.send_message, "event")
+
+        await ws_file_thumbnails(
+            hass, connection, {"id": 2, "entry_id": ENTRY_ID, "file_names": ["none.3mf"]}
+        )
+
+        assert [name for name, _, _ in sent.mock_calls] == ["result", "event", "event"]
+
+    @pytest.mark.asyncio
+    async def test_printer_fetches_are_bounded(self):
+        hass, client, _ = make_hass()
+        in_flight = 0
+        peak = 0
+
+        async def slow_thumbnail(file_name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return b"png"
+
+        client.files.get_gcode_thumbnail = AsyncMock(side_effect=slow_thumbnail)
+        connection = make_connection()
+
+        await run_subscription(
+            hass,
+            connection,
+            {"id": 1, "entry_id": ENTRY_ID, "file_names": [f"{i}.3mf" for i in range(8)]},
+        )
+
+        assert client.files.get_gcode_thumbnail.await_count == 8
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_entry_errors(self):
+        hass, _, _ = make_hass()
+        connection = make_connection()
+
+        await ws_file_thumbnails(
+            hass, connection, {"id": 1, "entry_id": "nope", "file_names": ["a.3mf"]}
+        )
+
+        assert connection.send_error.call_args.args[1] == "entry_not_found"
+        connection.send_message.assert_not_called()
+
+
+@pytest.mark.unit
+class TestFileListCache:
+    """One /gcodeList request serves the card's whole click path."""
+
+    @pytest.mark.asyncio
+    async def test_list_prepare_and_start_share_one_request(self, clock):
+        hass, client, _ = make_hass()
+
+        await ws_list_files(hass, make_connection(), list_message(1))
+        await ws_prepare_job(
+            hass, make_connection(), {"id": 2, "entry_id": ENTRY_ID, "file_name": "benchy.3mf"}
+        )
+        # The user takes a while over the matching dialog.
+        clock.advance(FILE_LIST_TTL + 5)
+        connection = make_connection()
+        await ws_start_job(
+            hass, connection, start_message(material_mappings=[{"tool_id": 0, "slot_id": 1}])
+        )
+
+        assert result_of(connection)["started"] is True
+        client.files.get_recent_file_list.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_listings_are_refetched(self, clock):
+        hass, client, _ = make_hass()
+        await ws_list_files(hass, make_connection(), list_message(1))
+
+        clock.advance(FILE_LIST_TTL + 1)
+        await ws_list_files(hass, make_connection(), list_message(2))
+        clock.advance(START_MAX_AGE + 1)
+        await ws_start_job(
+            hass,
+            make_connection(),
+            start_message(material_mappings=[{"tool_id": 0, "slot_id": 1}]),
+        )
+
+        assert client.files.get_recent_file_list.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_refresh_skips_the_cache(self):
+        hass, client, _ = make_hass()
+
+        await ws_list_files(hass, make_connection(), list_message(1))
+        await ws_list_files(hass, make_connection(), list_message(2, refresh=True))
+
+        assert client.files.get_recent_file_list.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        client = Mock()
+        release = asyncio.Event()
+
+        async def slow_list():
+            await release.wait()
+            return [make_file_entry()]
+
+        client.files.get_recent_file_list = AsyncMock(side_effect=slow_list)
+        cache = FileListCache(client)
+
+        waiters = [asyncio.ensure_future(cache.async_get()) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert client.files.get_recent_file_list.await_count == 1
+        assert results[0] is results[1] is results[2]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        client = Mock()
+        client.files.get_recent_file_list = AsyncMock(
+            side_effect=[OSError("no route"), [make_file_entry()]]
+        )
+        cache = FileListCache(client)
+
+        with pytest.raises(OSError):
+            await cache.async_get()
+
+        assert [f["file_name"] for f in await cache.async_get()] == ["benchy.3mf"]
+
+    @pytest.mark.asyncio
+    async def test_a_failure_nobody_waits_for_is_not_reported_as_unretrieved(self):
+        """The fetch outlives a cancelled waiter; its error must still be consumed."""
+        client = Mock()
+        release = asyncio.Event()
+
+        async def failing_list():
+            await release.wait()
+            raise OSError("no route")
+
+        client.files.get_recent_file_list = AsyncMock(side_effect=failing_list)
+        cache = FileListCache(client)
+        loop = asyncio.get_running_loop()
+        reported = []
+        loop.set_exception_handler(lambda _loop, context: reported.append(context))
+        try:
+            waiter = asyncio.ensure_future(cache.async_get())
+            # Let the fetch reach the printer before its only waiter goes away.
+            for _ in range(2):
+                await asyncio.sleep(0)
+            waiter.cancel()
+            release.set()
+            for _ in range(3):
+                await asyncio.sleep(0)
+            del waiter
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert reported == []
+
+
+def subscribe_message(msg_id=1, **overrides):
+    """A files/subscribe message as the schema would hand it over."""
+    return {"id": msg_id, "entry_id": ENTRY_ID, "refresh": False, **overrides}
+
+
+def capture_listeners(coordinator):
+    """Make the coordinator mock record listeners; return the list and remover."""
+    listeners = []
+    remove = Mock()
+    coordinator.async_add_listener = Mock(
+        side_effect=lambda listener: listeners.append(listener) or remove
+    )
+    return listeners, remove
+
+
+@pytest.mark.unit
+class TestFilesSubscription:
+    """A snapshot, then only what the printer's polls actually changed."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_only_changes(self):
+        hass, _, coordinator = make_hass()
+        listeners, _ = capture_listeners(coordinator)
+        connection = make_connection()
+
+        await ws_subscribe_files(hass, connection, subscribe_message())
+
+        connection.send_result.assert_called_once_with(1)
+        (snapshot,) = events_of(connection)
+        assert snapshot["files"][0]["file_name"] == "benchy.3mf"
+        assert snapshot["machine_state"] == "ready"
+
+        # A poll that moved nothing the card shows sends nothing.
+        listeners[0]()
+        assert len(events_of(connection)) == 1
+
+        coordinator.data.machine_state = Mock(value="printing")
+        listeners[0]()
+        assert events_of(connection)[-1] == {"machine_state": "printing"}
+
+        coordinator.data.matl_station_info.slot_infos[1].material_name = "ABS"
+        listeners[0]()
+        assert list(events_of(connection)[-1]) == ["slots"]
+        assert events_of(connection)[-1]["slots"][1]["material_name"] == "ABS"
+
+    @pytest.mark.asyncio
+    async def test_files_are_relisted_when_disk_space_moves(self):
+        hass, client, coordinator = make_hass()
+        coordinator.data.free_disk_space = 1000.0
+        listeners, _ = capture_listeners(coordinator)
+        connection = make_connection()
+        await ws_subscribe_files(hass, connection, subscribe_message())
+
+        uploaded = make_file_entry()
+        uploaded.gcode_file_name = "cube.3mf"
+        client.files.get_recent_file_list.return_value = [uploaded, make_file_entry()]
+        coordinator.data.free_disk_space = 990.0
+        listeners[0]()
+        await settle(hass)
+
+        files = events_of(connection)[-1]["files"]
+        assert [f["file_name"] for f in files] == ["cube.3mf", "benchy.3mf"]
+        assert client.files.get_recent_file_list.await_count == 2
+
+        # Polls that leave the disk alone do not touch the printer's file list.
+        listeners[0]()
+        await settle(hass)
+        assert client.files.get_recent_file_list.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unsubscribing_removes_the_listener(self):
+        hass, _, coordinator = make_hass()
+        _, remove = capture_listeners(coordinator)
+        connection = make_connection()
+        await ws_subscribe_files(hass, connection, subscribe_message())
+
+        connection.subscriptions[1]()
+
+        remove.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_printer_failure_errors(self):
+        hass, client, coordinator = make_hass()
+        client.files.get_recent_file_list = AsyncMock(side_effect=OSError("no route"))
+        capture_listeners(coordinator)
+        connection = make_connection()
+
+        await ws_subscribe_files(hass, connection, subscribe_message())
+
+        assert connection.send_error.call_args.args[1] == "printer_error"
+        coordinator.async_add_listener.assert_not_called()
+
 
 @pytest.mark.unit
 class TestPrepareJob:
@@ -0,0 +1,127 @@
+"""Unit tests for skipping state writes that would change nothing.
+
+A printing machine changes some field on every poll, so the coordinator wakes
+every entity every time. Each entity is expected to compare what it would write
+with what it last wrote and stay quiet when the two match - and, just as
+importantly, to still write when only its availability moved.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ha_mocks import mock_homeassistant
+
+mock_homeassistant()
+
+from flashforge.api.controls.info import MachineInfoParser
+from flashforge.models import DetailResponse, MachineState
+
+from custom_components.flashforge.binary_sensor import (
+    BINARY_SENSORS,
+    FlashForgeBinarySensor,
+)
+from custom_components.flashforge.coordinator import FlashForgeDataUpdateCoordinator
+from custom_components.flashforge.sensor import SENSORS, FlashForgeSensor
+
+
+def _description(descriptions, key):
+    return next(d for d in descriptions if d.key == key)
+
+
+def _coordinator(**fields):
+    return SimpleNamespace(
+        data=SimpleNamespace(**fields),
+        last_update_success=True,
+        device_model="Adventurer 5M",
+    )
+
+
+def _sensor(coordinator, key):
+    sensor = FlashForgeSensor(coordinator, _description(SENSORS, key), "Printer", "entry")
+    sensor.async_write_ha_state = Mock()
+    return sensor
+
+
+@pytest.mark.unit
+def test_sensor_writes_only_when_its_value_changes():
+    coordinator = _coordinator(current_print_layer=3, extruder=SimpleNamespace(current=200.0))
+    sensor = _sensor(coordinator, "current_layer")
+
+    sensor._handle_coordinator_update()
+    # Another field moved; this sensor's value did not.
+    coordinator.data.extruder.current = 201.5
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 1
+
+    coordinator.data.current_print_layer = 4
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.unit
+def test_sensor_writes_when_only_availability_changes():
+    """A failed poll keeps the old data; the entity must still go unavailable."""
+    coordinator = _coordinator(current_print_layer=3)
+    sensor = _sensor(coordinator, "current_layer")
+
+    sensor._handle_coordinator_update()
+    coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.unit
+def test_binary_sensor_skips_unchanged_state():
+    coordinator = _coordinator(machine_state=MachineState.PRINTING, progress=10)
+    sensor = FlashForgeBinarySensor(
+        coordinator, _description(BINARY_SENSORS, "is_printing"), "Printer", "entry"
+    )
+    sensor.async_write_ha_state = Mock()
+
+    sensor._handle_coordinator_update()
+    coordinator.data.progress = 11
+    sensor._handle_coordinator_update()
+    coordinator.data.machine_state = MachineState.PAUSED
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_coordinator_skips_listeners_when_the_poll_is_unchanged():
+    """Identical consecutive /detail payloads should wake nothing.
+
+    Two reads of an idle printer parse to separate but equal FFMachineInfo
+    objects; only the first may reach the entities.
+    """
+    detail = DetailResponse(
+        code=0,
+        message="Success",
+        detail={"status": "ready", "pid": 35, "cameraStreamUrl": "http://printer:8080/"},
+    ).detail
+    client = Mock()
+    client.info.get = AsyncMock(
+        side_effect=lambda: MachineInfoParser.from_detail(detail)
+    )
+    coordinator = FlashForgeDataUpdateCoordinator(Mock(), client, "Printer", 10)
+    wakes = Mock()
+    coordinator.async_add_listener(wakes)
+
+    await coordinator.async_refresh()
+    first = coordinator.data
+    await coordinator.async_refresh()
+
+    assert client.info.get.await_count == 2
+    assert coordinator.data is not first
+    wakes.assert_called_once()